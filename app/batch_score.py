@@ -0,0 +1,162 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# --- OFFLINE BATCH SCORING ---
+# Scores a CSV or Parquet file without running the HTTP server:
+#
+#     python -m app.batch_score projects.csv predictions.csv --workers 4
+#
+# The input is read in chunks, each chunk is scored and explained with one
+# vectorized call, and chunks are spread across a pool of worker processes.
+# Results keep the input columns and add the prediction columns; they are
+# written in input order and in the same format as the input file.
+
+FEATURE_COLUMNS = ["pitch_strength_score", "identity_model_score", "momentum_tracker_score"]
+RESULT_COLUMNS = ["prediction_score", "prediction_label", "key_driver_1", "key_driver_2"]
+
+
+def score_chunk(chunk: pd.DataFrame, explain: bool = True) -> pd.DataFrame:
+    """
+    Scores one chunk of rows and returns it with the prediction columns added.
+
+    Runs in the worker processes; app.model is imported (and the model loaded)
+    on first use in each worker.
+    """
+    from app.model import predict_and_explain_many
+
+    results = predict_and_explain_many(chunk[FEATURE_COLUMNS].to_dict("records"), explain=explain)
+    drivers = [result["key_drivers"] + [None] * (2 - len(result["key_drivers"])) for result in results]
+
+    scored = chunk.copy()
+    scored["prediction_score"] = [result["prediction_score"] for result in results]
+    scored["prediction_label"] = [result["prediction_label"] for result in results]
+    scored["key_driver_1"] = [first for first, _ in drivers]
+    scored["key_driver_2"] = [second for _, second in drivers]
+    return scored
+
+
+def score_file(input_path: str, output_path: str, chunksize: int = 50_000, workers: int = 1,
+               explain: bool = True, progress=sys.stderr) -> int:
+    """
+    Scores every row of `input_path` and writes the results to `output_path`.
+
+    Args:
+        input_path (str): A .csv or .parquet file with the three feature columns.
+        output_path (str): Where to write the results, in the same format.
+        chunksize (int): Rows per chunk; bounds memory together with `workers`.
+        workers (int): Worker processes. 1 scores in this process.
+        explain (bool): Set to False to skip SHAP; the driver columns are then empty.
+
+    Returns:
+        int: The number of rows scored.
+    """
+    file_format = _file_format(input_path)
+    if _file_format(output_path) != file_format:
+        raise ValueError("The output file must have the same format as the input file")
+
+    chunks = _read_chunks(input_path, file_format, chunksize)
+    writer = _ChunkWriter(output_path, file_format)
+    start_time = time.perf_counter()
+    rows_done = 0
+
+    def write(scored: pd.DataFrame):
+        nonlocal rows_done
+        writer.write(scored)
+        rows_done += len(scored)
+        elapsed = time.perf_counter() - start_time
+        print(f"Scored {rows_done:,} rows ({rows_done / elapsed:,.0f} rows/sec)", file=progress)
+
+    try:
+        if workers <= 1:
+            for chunk in chunks:
+                write(score_chunk(chunk, explain))
+        else:
+            # Keep at most two chunks per worker in flight, and write results in
+            # input order, so memory stays bounded and the output lines up with
+            # the input. "spawn" avoids forking XGBoost's OpenMP runtime.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                in_flight = deque()
+                for chunk in chunks:
+                    in_flight.append(pool.submit(score_chunk, chunk, explain))
+                    if len(in_flight) >= 2 * workers:
+                        write(in_flight.popleft().result())
+                while in_flight:
+                    write(in_flight.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Done: {rows_done:,} rows in {elapsed:.1f} s ({rows_done / max(elapsed, 1e-9):,.0f} rows/sec) "
+          f"-> {output_path}", file=progress)
+    return rows_done
+
+
+def _file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    raise ValueError(f"Unsupported file type {extension!r}: expected .csv or .parquet")
+
+
+def _read_chunks(path: str, file_format: str, chunksize: int):
+    if file_format == "csv":
+        yield from pd.read_csv(path, chunksize=chunksize)
+    else:
+        pq = _import_pyarrow_parquet()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+
+
+class _ChunkWriter:
+    # Appends scored chunks to one CSV or Parquet file.
+
+    def __init__(self, path: str, file_format: str):
+        self.path = path
+        self.file_format = file_format
+        self.parquet_writer = None
+        self.first_chunk = True
+
+    def write(self, chunk: pd.DataFrame):
+        if self.file_format == "csv":
+            chunk.to_csv(self.path, mode="w" if self.first_chunk else "a", header=self.first_chunk, index=False)
+        else:
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self.parquet_writer is None:
+                self.parquet_writer = _import_pyarrow_parquet().ParquetWriter(self.path, table.schema)
+            self.parquet_writer.write_table(table.cast(self.parquet_writer.schema))
+        self.first_chunk = False
+
+    def close(self):
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+
+
+def _import_pyarrow_parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet files need the optional 'pyarrow' package: pip install pyarrow")
+    return pq
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file with the fundraise prediction model.")
+    parser.add_argument("input", help="Input .csv or .parquet file with the three agent score columns.")
+    parser.add_argument("output", help="Output file, in the same format as the input.")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="Rows per chunk (default 50,000).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: one per CPU).")
+    parser.add_argument("--no-explain", action="store_true", help="Skip SHAP key drivers.")
+    args = parser.parse_args()
+    score_file(args.input, args.output, args.chunksize, args.workers, explain=not args.no_explain)
@@ -0,0 +1,158 @@
+import asyncio
+import inspect
+
+from app.executor import Overloaded
+
+# --- MICRO-BATCHING FOR SINGLE-ROW REQUESTS ---
+# Most of the cost of one prediction is fixed overhead (building the input
+# matrix, calling into XGBoost and SHAP), not per-row work. When many /predict
+# calls arrive at the same time, it is much cheaper to score them together.
+# The MicroBatcher collects concurrent requests for a short window, scores them
+# as one batch and hands each caller back its own result.
+#
+# The window only opens when there is something to wait for. A request that
+# arrives to an empty queue with no batch being scored is dispatched at once,
+# so light traffic pays no extra latency. Requests that arrive while a batch is
+# being scored, or together with others, are collected into the next batch.
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row requests and scores them as one batch.
+
+    Args:
+        score_batch (callable): Takes a list of input dicts and returns a list of
+            results in the same order, e.g. `predict_and_explain_many`. It may
+            also be a coroutine function, e.g. one that runs the model in an
+            InferenceExecutor.
+        max_wait_ms (float): How long the first request in a batch may wait for
+            others to join it. A lone request is not held back when no other
+            batch is being scored.
+        max_batch_size (int): A batch is scored as soon as it reaches this size.
+        max_queue_depth (int): Requests beyond this many waiting rows are
+            rejected with `Overloaded` instead of being queued.
+    """
+
+    def __init__(self, score_batch, max_wait_ms: float = 2.0, max_batch_size: int = 64,
+                 max_queue_depth: int = 1024):
+        self.score_batch = score_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.max_queue_depth = max_queue_depth
+
+        # Upper bounds of the batch-size histogram buckets: 1, 2, 4, ... max_batch_size.
+        self.bucket_bounds = []
+        bound = 1
+        while bound < max_batch_size:
+            self.bucket_bounds.append(bound)
+            bound *= 2
+        self.bucket_bounds.append(max_batch_size)
+        self.bucket_counts = [0] * len(self.bucket_bounds)
+
+        self.batches_total = 0
+        self.rows_total = 0
+
+        # The queue and worker task belong to one event loop. They are created
+        # lazily, on the loop that submits the first request.
+        self._loop = None
+        self._queue = None
+        self._worker = None
+        self._in_flight = set()
+
+    async def submit(self, input_data: dict) -> dict:
+        """
+        Queues one input row and waits for its result.
+        """
+        self._ensure_worker()
+        if self._queue.qsize() >= self.max_queue_depth:
+            raise Overloaded(f"{self._queue.qsize()} requests already waiting to be batched")
+
+        future = self._loop.create_future()
+        self._queue.put_nowait((input_data, future))
+        return await future
+
+    def stats(self) -> dict:
+        """
+        Returns the current queue depth and the batch-size histogram.
+        """
+        histogram = {str(bound): count for bound, count in zip(self.bucket_bounds, self.bucket_counts)}
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches_total": self.batches_total,
+            "rows_total": self.rows_total,
+            "mean_batch_size": self.rows_total / self.batches_total if self.batches_total else 0.0,
+            "batch_size_histogram": histogram,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_batch_size": self.max_batch_size,
+        }
+
+    def _ensure_worker(self):
+        # (Re)start the worker if this is the first request or the event loop changed.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            self._record_batch(len(batch))
+            # Score in a separate task so the next batch can be collected (and
+            # dispatched to another worker) while this one is still running.
+            task = self._loop.create_task(self._score(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _collect_batch(self) -> list:
+        # Block until the first request arrives, then keep collecting until the
+        # window closes or the batch is full.
+        batch = [await self._queue.get()]
+        if self._queue.empty() and not self._in_flight:
+            # Nothing else is waiting and the scorer is idle: don't make it wait.
+            return batch
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # Anything that is already queued joins the batch without further waiting.
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        return batch
+
+    async def _score(self, batch: list):
+        # Callers that gave up (e.g. the client disconnected) are skipped.
+        batch = [(row, future) for row, future in batch if not future.done()]
+        if not batch:
+            return
+
+        try:
+            results = self.score_batch([row for row, _ in batch])
+            if inspect.isawaitable(results):
+                results = await results
+        except Exception as e:
+            # A failed batch fails every request in it, each with the same error.
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _record_batch(self, size: int):
+        self.batches_total += 1
+        self.rows_total += size
+        for i, bound in enumerate(self.bucket_bounds):
+            if size <= bound:
+                self.bucket_counts[i] += 1
+                break
@@ -0,0 +1,121 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+# --- PREDICTION CACHE ---
+# Upstream agents send scores on a coarse grid (the demo sliders move in steps
+# of 0.1 and most pipeline agents round to one decimal), so the same input
+# triples come up again and again. The cache remembers the score and key
+# drivers for each grid point it has seen.
+#
+# Only inputs that lie exactly on the grid are cached. Anything else is scored
+# normally, so a cached answer is always the answer the model would give.
+# Keys include the model version, so results from an older model are never
+# returned after the model changes.
+
+
+class PredictionCache:
+    """
+    A bounded, thread-safe LRU cache of predictions keyed on quantized inputs.
+
+    Args:
+        max_entries (int): Most predictions kept; the least recently used go first.
+        ttl_seconds (float): How long an entry stays valid. 0 means no expiry.
+        step (float): Grid spacing of the inputs that are cached.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: float = 0, step: float = 0.1):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.step = step
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, model_version: str, values) -> tuple:
+        """
+        Returns the cache key for one input row, or None if it is not on the grid.
+
+        Missing (NaN) and infinite values are never on the grid.
+        """
+        indices = []
+        for value in values:
+            if not math.isfinite(value):
+                return None
+            index = round(value / self.step)
+            if not math.isclose(index * self.step, value, rel_tol=0, abs_tol=1e-9):
+                return None
+            indices.append(index)
+        return (model_version, *indices)
+
+    def get(self, key: tuple, need_drivers: bool = True):
+        """
+        Returns the cached (score, key_drivers) for a key, or None on a miss.
+
+        An entry stored without key drivers only counts as a hit when the
+        caller does not need them.
+        """
+        if key is None:
+            with self._lock:
+                self.bypassed += 1
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None or (need_drivers and entry[2] is None):
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key: tuple, score: float, key_drivers):
+        """
+        Stores a prediction. Pass key_drivers=None if the row was not explained.
+        """
+        if key is None or self.max_entries <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0
+        with self._lock:
+            existing = self._entries.get(key)
+            # Never replace a full entry with a scoring-only one.
+            if key_drivers is None and existing is not None and existing[2] is not None:
+                key_drivers = existing[2]
+            self._entries[key] = (expires_at, score, key_drivers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "step": self.step,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
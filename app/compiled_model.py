@@ -0,0 +1,255 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+# --- A TINY, DEPENDENCY-FREE TREE ENSEMBLE EVALUATOR ---
+# Our model is 100 trees of depth 3 over 3 features. That is small enough to
+# flatten into a handful of NumPy arrays and evaluate directly, without the
+# XGBoost runtime or SHAP. The serving process then only needs NumPy, which
+# cuts cold-start time and memory, and single-row predictions take microseconds.
+#
+# The model is read from XGBoost's JSON model format, which `app/ml/train.py`
+# writes next to predictor.bst. The XGBoost booster remains the reference
+# implementation: test_compiled_model.py checks that both agree.
+
+# Objectives whose raw margin is passed through a sigmoid to give a probability.
+LOGISTIC_OBJECTIVES = {"binary:logistic", "reg:logistic"}
+# Objectives whose raw margin is returned as-is.
+IDENTITY_OBJECTIVES = {"binary:logitraw", "reg:squarederror"}
+
+# Exact Shapley values enumerate every feature coalition (2^F of them), so
+# this evaluator is meant for models with only a few features.
+MAX_SHAP_FEATURES = 12
+
+
+class CompiledModel:
+    """
+    A tree ensemble flattened into NumPy arrays.
+
+    All trees share one set of node arrays. Node `i` splits on feature
+    `split_feature[i]` and goes left when `x < threshold[i]`. Leaves point to
+    themselves as both children, so every row can take the same number of
+    steps down the trees no matter where its leaf is.
+    """
+
+    def __init__(self, feature_names, split_feature, threshold, left, right, default_left,
+                 value, cover, is_leaf, roots, base_margin, objective):
+        self.feature_names = list(feature_names)
+        self.split_feature = split_feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.cover = cover
+        self.is_leaf = is_leaf
+        self.roots = roots
+        self.base_margin = base_margin
+        self.objective = objective
+
+        # Depth of every node, used to walk the trees one level at a time.
+        depth = np.zeros(len(left), dtype=np.int64)
+        for node in range(len(left)):
+            if not is_leaf[node]:
+                depth[left[node]] = depth[right[node]] = depth[node] + 1
+        self.max_depth = int(depth.max())
+        internal = np.flatnonzero(~is_leaf)
+        self.levels = [internal[depth[internal] == d] for d in range(self.max_depth)]
+        self.leaves = np.flatnonzero(is_leaf)
+
+        # For explanations: the share of a node's training cover that went left/right.
+        safe_cover = np.where(cover > 0, cover, 1.0)
+        self.left_fraction = cover[left] / safe_cover
+        self.right_fraction = cover[right] / safe_cover
+
+    # --- LOADING ---
+
+    @classmethod
+    def from_json(cls, path: str) -> "CompiledModel":
+        """
+        Loads a model saved with `booster.save_model("model.json")`.
+        """
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_booster(cls, booster) -> "CompiledModel":
+        """
+        Flattens an in-memory `xgboost.Booster` (needs XGBoost installed).
+        """
+        return cls.from_dict(json.loads(booster.save_raw(raw_format="json")))
+
+    @classmethod
+    def from_dict(cls, model: dict) -> "CompiledModel":
+        learner = model["learner"]
+        objective = learner["objective"]["name"]
+        if objective not in LOGISTIC_OBJECTIVES | IDENTITY_OBJECTIVES:
+            raise ValueError(f"Unsupported objective for CompiledModel: {objective}")
+
+        params = learner["learner_model_param"]
+        if int(params.get("num_class", "0")) > 1 or int(params.get("num_target", "1")) > 1:
+            raise ValueError("CompiledModel only supports single-output models")
+
+        # Newer XGBoost versions store base_score as a one-element vector, e.g. "[5.2875E-1]".
+        base_score = float(params["base_score"].strip("[]"))
+        if objective in LOGISTIC_OBJECTIVES:
+            base_margin = float(np.log(base_score / (1 - base_score)))
+        else:
+            base_margin = base_score
+
+        num_features = int(params["num_feature"])
+        feature_names = learner.get("feature_names") or [f"f{i}" for i in range(num_features)]
+
+        columns = {name: [] for name in ("split_feature", "threshold", "left", "right",
+                                         "default_left", "value", "cover", "is_leaf")}
+        roots = []
+        offset = 0
+        for tree in learner["gradient_booster"]["model"]["trees"]:
+            if any(tree.get("split_type", [])):
+                raise ValueError("CompiledModel does not support categorical splits")
+
+            left = np.asarray(tree["left_children"], dtype=np.int64)
+            right = np.asarray(tree["right_children"], dtype=np.int64)
+            is_leaf = left == -1
+            node_ids = np.arange(len(left))
+
+            roots.append(offset)
+            columns["split_feature"].append(np.where(is_leaf, 0, tree["split_indices"]))
+            columns["threshold"].append(np.where(is_leaf, 0, tree["split_conditions"]))
+            # Leaves loop back to themselves; internal nodes point to global child ids.
+            columns["left"].append(np.where(is_leaf, node_ids, left) + offset)
+            columns["right"].append(np.where(is_leaf, node_ids, right) + offset)
+            columns["default_left"].append(tree["default_left"])
+            # For leaves, XGBoost stores the leaf value in split_conditions.
+            columns["value"].append(np.where(is_leaf, tree["split_conditions"], 0))
+            columns["cover"].append(tree["sum_hessian"])
+            columns["is_leaf"].append(is_leaf)
+            offset += len(left)
+
+        def concat(name, dtype):
+            return np.ascontiguousarray(np.concatenate(columns[name]).astype(dtype))
+
+        return cls(
+            feature_names=feature_names,
+            split_feature=concat("split_feature", np.int64),
+            threshold=concat("threshold", np.float32),
+            left=concat("left", np.int64),
+            right=concat("right", np.int64),
+            default_left=concat("default_left", bool),
+            value=concat("value", np.float32),
+            cover=concat("cover", np.float64),
+            is_leaf=concat("is_leaf", bool),
+            roots=np.asarray(roots, dtype=np.int64),
+            base_margin=base_margin,
+            objective=objective,
+        )
+
+    # --- PREDICTION ---
+
+    def predict_margin(self, X) -> np.ndarray:
+        """
+        Returns the raw (pre-sigmoid) ensemble output for each row of X.
+        """
+        X = self._as_matrix(X)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+
+        # Every row takes one step down every tree per iteration; rows that have
+        # reached a leaf stay there because leaves are their own children.
+        for _ in range(self.max_depth):
+            x = X[rows, self.split_feature[nodes]]
+            go_left = np.where(np.isnan(x), self.default_left[nodes], x < self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.base_margin + self.value[nodes].sum(axis=1, dtype=np.float32)
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Returns predictions in the same space as `Booster.predict`
+        (probabilities for logistic objectives).
+        """
+        margin = self.predict_margin(X)
+        if self.objective in LOGISTIC_OBJECTIVES:
+            return (1 / (1 + np.exp(-margin))).astype(np.float32)
+        return margin.astype(np.float32)
+
+    # --- EXPLANATION ---
+
+    @property
+    def expected_value(self) -> float:
+        """
+        The explanation baseline: the margin of an "average" input, as in shap.TreeExplainer.
+        """
+        return self.base_margin + float(self._coalition_values(np.zeros((1, len(self.feature_names))), 0)[0])
+
+    def shap_values(self, X, chunk_size: int = 4096) -> np.ndarray:
+        """
+        Exact TreeSHAP values (in margin space) for each row of X.
+
+        Matches `shap.TreeExplainer(booster).shap_values(X)`: the value of a
+        coalition is the tree output with the missing features integrated out
+        using the training cover of each split.
+        """
+        X = self._as_matrix(X)
+        num_features = X.shape[1]
+        if num_features > MAX_SHAP_FEATURES:
+            raise ValueError(f"Exact coalition SHAP supports at most {MAX_SHAP_FEATURES} features")
+
+        # Shapley weight of a coalition of size s: s! (F - s - 1)! / F!
+        factorial = np.cumprod([1.0] + list(range(1, num_features + 1)))
+        weights = [factorial[s] * factorial[num_features - s - 1] / factorial[num_features]
+                   for s in range(num_features)]
+
+        # Chunk rows so the per-node weight matrix stays small for large batches.
+        result = np.zeros(X.shape, dtype=np.float64)
+        for start in range(0, len(X), chunk_size):
+            chunk = X[start:start + chunk_size]
+            values = [self._coalition_values(chunk, mask) for mask in range(2 ** num_features)]
+            for mask, value in enumerate(values):
+                size = bin(mask).count("1")
+                for feature in range(num_features):
+                    if not mask & (1 << feature):
+                        result[start:start + chunk_size, feature] += (
+                            weights[size] * (values[mask | (1 << feature)] - value)
+                        )
+
+        return result
+
+    def _coalition_values(self, X, mask: int) -> np.ndarray:
+        # Push a weight of 1 from each root down to the leaves. At a split on a
+        # feature in the coalition the weight follows the row's own branch; at
+        # any other split it is shared between both children by training cover.
+        in_coalition = (mask >> self.split_feature) & 1 == 1
+        weight = np.zeros((len(X), len(self.left)))
+        weight[:, self.roots] = 1.0
+
+        for nodes in self.levels:
+            x = X[:, self.split_feature[nodes]]
+            go_left = np.where(np.isnan(x), self.default_left[nodes], x < self.threshold[nodes])
+            known = in_coalition[nodes]
+            node_weight = weight[:, nodes]
+            weight[:, self.left[nodes]] = node_weight * np.where(known, go_left, self.left_fraction[nodes])
+            weight[:, self.right[nodes]] = node_weight * np.where(known, ~go_left, self.right_fraction[nodes])
+
+        return weight[:, self.leaves] @ self.value[self.leaves].astype(np.float64)
+
+    def _as_matrix(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        return X
+
+
+if __name__ == "__main__":
+    # Converts a saved booster into the JSON file the compiled engine loads:
+    #   python -m app.compiled_model app/ml/predictor.bst app/ml/predictor.json
+    import xgboost as xgb
+
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "ml", "predictor.bst")
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + ".json"
+    booster = xgb.Booster()
+    booster.load_model(source)
+    booster.save_model(target)
+    print(f"Exported {source} -> {target}")
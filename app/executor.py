@@ -0,0 +1,138 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.metrics import MODEL_STAGES
+
+# --- RUNNING INFERENCE OFF THE EVENT LOOP ---
+# XGBoost and SHAP are CPU-heavy. Calling them directly from an `async def`
+# endpoint blocks uvicorn's event loop, so nothing else (not even the health
+# check) is served until the prediction finishes. The InferenceExecutor runs
+# model calls in a worker pool instead and refuses new work once too much is
+# already waiting, so latency cannot grow without limit.
+#
+# With the "process" pool, app/model.py times its stages in the worker
+# process. Each call sends its stage timings back with its result, and they
+# are added to this process's /metrics. The prediction cache lives in each
+# worker too, so /stats/cache and the cache hit ratio gauge only describe the
+# API process's own, unused cache.
+
+
+class Overloaded(Exception):
+    """
+    Raised when the server already has as much inference work as it accepts.
+    The API turns this into a 503 response so clients can back off and retry.
+    """
+
+
+def _preload_model():
+    # Runs once in every worker process. Loading the booster and explainer up
+    # front means the first request on each worker does not pay for it.
+    from app.model import load_model, start_watching
+    load_model()
+
+    # Each worker holds its own copy of the model, so each one follows the
+    # registry's active version itself.
+    watch_seconds = float(os.environ.get("CHIMERA_MODEL_WATCH_SECONDS", "0"))
+    if watch_seconds > 0:
+        start_watching(watch_seconds)
+
+
+def _run_with_stage_timings(fn, *args):
+    # Runs in a worker process. Returns fn's result along with what the call
+    # added to the model stage histograms. A worker runs one call at a time,
+    # so the difference is this call's alone.
+    before = [stage.snapshot() for stage in MODEL_STAGES]
+    result = fn(*args)
+    timings = []
+    for stage, (counts, total) in zip(MODEL_STAGES, before):
+        after_counts, after_total = stage.snapshot()
+        timings.append(([a - b for a, b in zip(after_counts, counts)], after_total - total))
+    return result, timings
+
+
+class InferenceExecutor:
+    """
+    Runs inference functions in a thread or process pool with bounded concurrency.
+
+    Args:
+        kind (str): "thread" (XGBoost and SHAP release the GIL in native code) or
+            "process" (each worker loads its own copy of the model).
+        max_workers (int): Size of the worker pool.
+        max_pending (int): Most calls allowed to be running or waiting in the pool.
+            Further calls raise `Overloaded` immediately.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_pending: int = 16):
+        if kind == "thread":
+            self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chimera-inference")
+        elif kind == "process":
+            # "spawn" gives every worker a clean interpreter; XGBoost's OpenMP
+            # runtime is not safe to use after a fork.
+            self.pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_preload_model
+            )
+        else:
+            raise ValueError(f"Unknown executor kind: {kind!r} (expected 'thread' or 'process')")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected_total = 0
+        # If set, calls run as call_wrapper(fn, *args) instead, e.g. to profile
+        # them (see app/profiling.py). Thread pools only: it is not pickled.
+        self.call_wrapper = None
+
+    async def run(self, fn, *args):
+        """
+        Runs `fn(*args)` in the pool and waits for the result without blocking the loop.
+        """
+        # The counter is only touched from the event loop thread, so no lock is needed.
+        if self.pending >= self.max_pending:
+            self.rejected_total += 1
+            raise Overloaded(f"{self.pending} inference calls already in progress")
+
+        if self.call_wrapper is not None and self.kind == "thread":
+            fn, args = self.call_wrapper, (fn, *args)
+        elif self.kind == "process":
+            fn, args = _run_with_stage_timings, (fn, *args)
+
+        self.pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        finally:
+            self.pending -= 1
+
+        if self.kind == "process":
+            result, timings = result
+            for stage, (counts, total) in zip(MODEL_STAGES, timings):
+                stage.add(counts, total)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected_total": self.rejected_total,
+        }
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def executor_from_env() -> InferenceExecutor:
+    """
+    Builds the executor from CHIMERA_EXECUTOR* environment variables.
+    """
+    max_workers = int(os.environ.get("CHIMERA_EXECUTOR_WORKERS", min(4, os.cpu_count() or 1)))
+    return InferenceExecutor(
+        kind=os.environ.get("CHIMERA_EXECUTOR", "thread"),
+        max_workers=max_workers,
+        max_pending=int(os.environ.get("CHIMERA_MAX_PENDING", 4 * max_workers))
+    )
@@ -0,0 +1,55 @@
+import threading
+import uuid
+from collections import OrderedDict
+
+# --- DEFERRED EXPLANATIONS ---
+# Callers that want the score right away can ask for the explanation to be
+# computed after the response has been sent. They get an explanation id back
+# and fetch the key drivers later from GET /explanations/{explanation_id}.
+# Explanations are kept in memory only; the oldest are dropped once the store
+# is full, so an id is valid for a limited time.
+
+
+class ExplanationStore:
+    """
+    A bounded, thread-safe map from explanation id to its status and key drivers.
+
+    Args:
+        max_entries (int): How many explanations to keep before evicting the oldest.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self) -> str:
+        """
+        Registers a pending explanation and returns its id.
+        """
+        explanation_id = uuid.uuid4().hex
+        with self._lock:
+            self._entries[explanation_id] = {"status": "pending", "key_drivers": None}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return explanation_id
+
+    def complete(self, explanation_id: str, key_drivers: list[str]):
+        self._update(explanation_id, {"status": "ready", "key_drivers": key_drivers})
+
+    def fail(self, explanation_id: str, error: str):
+        self._update(explanation_id, {"status": "failed", "key_drivers": None, "error": error})
+
+    def get(self, explanation_id: str):
+        """
+        Returns the explanation entry, or None if the id is unknown or was evicted.
+        """
+        with self._lock:
+            entry = self._entries.get(explanation_id)
+            return dict(entry) if entry is not None else None
+
+    def _update(self, explanation_id: str, entry: dict):
+        with self._lock:
+            # Evicted entries are not brought back.
+            if explanation_id in self._entries:
+                self._entries[explanation_id] = entry
@@ -0,0 +1,89 @@
+import json
+import math
+import os
+
+import numpy as np
+
+# --- SERVING FROM A PRECOMPUTED LOOKUP GRID ---
+# `app/ml/build_grid.py` scores every point of a regular grid over the input
+# space ahead of time. Serving is then a memory-mapped array lookup: inputs on
+# the grid get the stored values exactly, and inputs between grid points get a
+# trilinear interpolation of the eight surrounding points. The file is opened
+# read-only, so several worker processes share the same pages in memory.
+
+
+class GridModel:
+    """
+    Predictions and SHAP values looked up from a dense 3-D grid.
+
+    Args:
+        grid (np.ndarray): Array of shape (points, points, points, 4) holding the
+            predicted probability and then one SHAP value per feature.
+        low (float): Input value of the first grid point on every axis.
+        step (float): Spacing between grid points.
+        feature_names (list[str]): Feature order of the grid axes.
+        metadata (dict): Build information, including the measured interpolation error.
+    """
+
+    def __init__(self, grid, low: float, step: float, feature_names, metadata: dict = None):
+        self.grid = grid
+        self.low = low
+        self.step = step
+        self.points = grid.shape[0]
+        self.feature_names = list(feature_names)
+        self.metadata = metadata or {}
+
+    @classmethod
+    def load(cls, grid_path: str) -> "GridModel":
+        """
+        Memory-maps a grid written by app/ml/build_grid.py.
+        """
+        with open(os.path.splitext(grid_path)[0] + ".json") as f:
+            metadata = json.load(f)
+        grid = np.load(grid_path, mmap_mode="r")
+        # Inputs past the last grid point are clamped to it, so the grid must
+        # reach the top of the input range.
+        last = metadata["low"] + metadata["step"] * (grid.shape[0] - 1)
+        if not math.isclose(last, metadata["high"], rel_tol=0, abs_tol=1e-6):
+            raise ValueError(f"The grid in {grid_path} ends at {last}, not at the top of the input range "
+                             f"({metadata['high']}); rebuild it with app/ml/build_grid.py")
+        return cls(grid, metadata["low"], metadata["step"], metadata["feature_names"], metadata)
+
+    @property
+    def max_interpolation_error(self) -> float:
+        """
+        Worst score error of off-grid lookups against the real model, measured at build time.
+        """
+        return self.metadata.get("max_score_interpolation_error", float("nan"))
+
+    def lookup(self, X) -> np.ndarray:
+        """
+        Returns (score, shap_1, shap_2, shap_3) for every row of X.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        # Position of each input in grid units. Values within rounding noise of
+        # a grid point snap to it, so on-grid inputs read one cell exactly.
+        position = np.clip((X - self.low) / self.step, 0, self.points - 1)
+        nearest = np.round(position)
+        position = np.where(np.abs(position - nearest) < 1e-6, nearest, position)
+
+        lower = np.minimum(np.floor(position).astype(np.int64), self.points - 2)
+        fraction = position - lower
+
+        # Blend the eight corners of the surrounding cell.
+        result = np.zeros((len(X), self.grid.shape[-1]))
+        for corner in range(8):
+            offset = [(corner >> axis) & 1 for axis in range(3)]
+            weight = np.prod([fraction[:, axis] if offset[axis] else 1 - fraction[:, axis] for axis in range(3)], axis=0)
+            values = self.grid[lower[:, 0] + offset[0], lower[:, 1] + offset[1], lower[:, 2] + offset[2]]
+            result += weight[:, None] * values
+        return result
+
+    def predict(self, X) -> np.ndarray:
+        return self.lookup(X)[:, 0].astype(np.float32)
+
+    def shap_values(self, X) -> np.ndarray:
+        return self.lookup(X)[:, 1:]
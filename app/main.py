@@ -1,19 +1,229 @@
-from fastapi import FastAPI
-from pydantic import BaseModel, Field
+import time
+
+# Measured so /ready can report how long importing the API took.
+_import_started = time.perf_counter()
+
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import secrets
+from contextlib import asynccontextmanager
+from typing import Literal, Optional
+
+from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field, ValidationError
 
 # --- NEW: IMPORT THE PREDICTION LOGIC ---
 # We are now importing our own custom module.
 # This keeps the API code clean and separates concerns.
-from app.model import predict_and_explain
+# Importing app.model is cheap: the model itself is loaded in the startup stage below.
+from app.model import (explain_many, load_model, load_status, load_version, predict_and_explain,
+                       predict_and_explain_many, predict_items, prediction_cache, registry, reload_model,
+                       start_watching)
+from app.batching import MicroBatcher
+from app.executor import Overloaded, executor_from_env
+from app.explanations import ExplanationStore
+from app import metrics
+from app.prediction_log import PredictionLog
+from app.profiling import MODES as PROFILING_MODES, ProfilingMiddleware, ProfilingSession
+from app.responses import FastJSONResponse
+from app.shadow import ShadowScorer
+
+# The largest number of rows accepted by a single call to /predict/batch.
+# Bigger jobs should be split client-side so one request cannot monopolise the server.
+MAX_BATCH_SIZE = 10_000
+
+# /predict/stream scores its input in chunks of this many rows, so server
+# memory stays bounded however large the upload is. Longer lines are rejected.
+STREAM_CHUNK_SIZE = int(os.environ.get("CHIMERA_STREAM_CHUNK_SIZE", "1024"))
+STREAM_MAX_LINE_BYTES = 64 * 1024
+
+# Whether /predict and /predict/batch check their results against the response
+# model before sending them. Turning it off saves CPU on every request; see
+# app/responses.py.
+RESPONSE_VALIDATION = os.environ.get("CHIMERA_RESPONSE_VALIDATION", "1") == "1"
+
+# Micro-batching settings for /predict. Concurrent single-row requests that
+# arrive within the window are scored together as one batch.
+MICROBATCH_ENABLED = os.environ.get("CHIMERA_MICROBATCH_ENABLED", "1") == "1"
+MICROBATCH_WINDOW_MS = float(os.environ.get("CHIMERA_MICROBATCH_WINDOW_MS", "2"))
+MICROBATCH_MAX_SIZE = int(os.environ.get("CHIMERA_MICROBATCH_MAX_SIZE", "64"))
+MICROBATCH_MAX_QUEUE_DEPTH = int(os.environ.get("CHIMERA_MICROBATCH_MAX_QUEUE_DEPTH", "1024"))
+
+# All model calls run in this pool so the event loop stays free for other requests.
+# See app/executor.py for the CHIMERA_EXECUTOR* settings.
+executor = executor_from_env()
+
+batcher = MicroBatcher(
+    lambda items: executor.run(predict_items, items),
+    max_wait_ms=MICROBATCH_WINDOW_MS,
+    max_batch_size=MICROBATCH_MAX_SIZE,
+    max_queue_depth=MICROBATCH_MAX_QUEUE_DEPTH
+)
+
+# Explanations requested with ?explain=deferred are computed after the
+# response is sent and kept here until the caller fetches them.
+explanations = ExplanationStore(max_entries=int(os.environ.get("CHIMERA_DEFERRED_EXPLANATIONS_MAX", "100000")))
+
+# How a request wants its explanation:
+#   "inline"   - compute the key drivers before responding (the default).
+#   "none"     - skip SHAP entirely; key_drivers is an empty list.
+#   "deferred" - respond with the score now plus an explanation_id, and
+#                compute the key drivers in the background.
+ExplainMode = Literal["inline", "none", "deferred"]
+
+# Admin endpoints (under /admin) need this token in an X-Admin-Token header.
+# They are switched off while it is unset.
+ADMIN_TOKEN = os.environ.get("CHIMERA_ADMIN_TOKEN")
+
+# How often, in seconds, to check the model registry for a newly activated
+# version and switch to it. 0 turns the check off.
+MODEL_WATCH_SECONDS = float(os.environ.get("CHIMERA_MODEL_WATCH_SECONDS", "0"))
+
+# A registry version to shadow-score alongside the live model (see
+# app/shadow.py), and the share of requests to shadow. Can also be started
+# and stopped at runtime through /admin/shadow.
+SHADOW_VERSION = os.environ.get("CHIMERA_SHADOW_VERSION")
+SHADOW_FRACTION = float(os.environ.get("CHIMERA_SHADOW_FRACTION", "0.1"))
+shadow = None
+
+# How many worker processes serve this app. app/serve.py sets it before
+# forking. Deferred explanations, shadow scoring, profiling sessions and
+# /admin/model/reload keep their state in the worker that handled the request,
+# so they are refused while more than one worker is running (see
+# require_single_worker).
+WORKER_PROCESSES = 1
+
+# Where to log predictions and their realized outcomes for retraining (see
+# app/prediction_log.py). Logging and POST /outcomes are off while it is unset.
+PREDICTION_LOG_DIR = os.environ.get("CHIMERA_PREDICTION_LOG_DIR")
+prediction_log = PredictionLog(
+    PREDICTION_LOG_DIR,
+    file_format=os.environ.get("CHIMERA_PREDICTION_LOG_FORMAT", "npz"),
+    flush_rows=int(os.environ.get("CHIMERA_PREDICTION_LOG_FLUSH_ROWS", "10000")),
+    flush_seconds=float(os.environ.get("CHIMERA_PREDICTION_LOG_FLUSH_SECONDS", "60"))
+) if PREDICTION_LOG_DIR else None
 
 # --- 1. DEFINE THE API ---
-# No changes here.
+# The model is loaded in a background thread when the server starts, so
+# uvicorn accepts connections (and answers the liveness check at /) right away.
+# /ready reports when the model and explainer are warm. Predictions that
+# arrive before then wait for the load to finish.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    asyncio.get_running_loop().run_in_executor(None, _load_model_in_background)
+    if MODEL_WATCH_SECONDS > 0:
+        start_watching(MODEL_WATCH_SECONDS)
+    yield
+    if prediction_log is not None:
+        prediction_log.close()
+
+def _load_model_in_background():
+    try:
+        load_model()
+    except Exception as e:
+        # The error is reported by /ready; predictions will retry the load.
+        print(f"Model loading failed: {e}")
+
+    if SHADOW_VERSION:
+        try:
+            _start_shadow(SHADOW_VERSION, SHADOW_FRACTION)
+        except Exception as e:
+            print(f"Could not load shadow model {SHADOW_VERSION}: {e}")
+
+def _start_shadow(version: str, fraction: float) -> ShadowScorer:
+    global shadow
+    previous, shadow = shadow, ShadowScorer(load_version(version), fraction)
+    if previous is not None:
+        previous.shutdown()
+    return shadow
+
 app = FastAPI(
     title="Project Chimera: Fundraise Prediction Agent",
     version="1.0",
-    description="A privacy-preserving AI agent to predict startup fundraising success."
+    description="A privacy-preserving AI agent to predict startup fundraising success.",
+    lifespan=lifespan
 )
 
+# --- METRICS ---
+# Every request is counted and timed by MetricsMiddleware (see app/metrics.py).
+# TimedRoute also splits each request's time into the stages around the
+# endpoint: validation (reading and validating the body, before the endpoint
+# runs) and serialization (validating and encoding the response, after it
+# returns). The model stages in between are timed in app/model.py.
+_request_timing = contextvars.ContextVar("request_timing", default=None)
+
+class TimedRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _record_endpoint_time(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request):
+            # [handler start, endpoint start, endpoint end]
+            timing = [time.perf_counter(), 0.0, 0.0]
+            token = _request_timing.set(timing)
+            try:
+                response = await handler(request)
+            finally:
+                _request_timing.reset(token)
+            if timing[2]:
+                metrics.VALIDATION_STAGE.observe(timing[1] - timing[0])
+                metrics.SERIALIZATION_STAGE.observe(time.perf_counter() - timing[2])
+            return response
+
+        return timed_handler
+
+def _record_endpoint_time(endpoint):
+    # Wraps an endpoint so TimedRoute knows when it started and returned.
+    # functools.wraps keeps the signature FastAPI reads parameters from.
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            timing = _request_timing.get()
+            if timing is not None:
+                timing[1] = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if timing is not None:
+                    timing[2] = time.perf_counter()
+    else:
+        @functools.wraps(endpoint)
+        def timed_endpoint(*args, **kwargs):
+            timing = _request_timing.get()
+            if timing is not None:
+                timing[1] = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                if timing is not None:
+                    timing[2] = time.perf_counter()
+    return timed_endpoint
+
+if metrics.ENABLED:
+    app.router.route_class = TimedRoute
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Counts finished requests for an on-demand profiling session (see /admin/profile).
+profiler = None
+app.add_middleware(ProfilingMiddleware, get_session=lambda: profiler)
+
+# When the inference pool is full we answer straight away with 503 instead of
+# letting requests pile up. Clients should retry after a short pause.
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server is overloaded: {exc}"},
+        headers={"Retry-After": "1"}
+    )
+
 # --- 2. DEFINE THE INPUT DATA MODEL ---
 # No changes here.
 class AgentInput(BaseModel):
@@ -36,19 +246,39 @@ class PredictionOutput(BaseModel):
     prediction_score: float
     prediction_label: str
     key_drivers: list[str]
+    # The model version that produced this prediction.
+    model_version: str
+    # Only set for ?explain=deferred; left out of the response otherwise.
+    explanation_id: Optional[str] = None
+    # Only set while predictions are logged; post the outcome to /outcomes with it.
+    request_id: Optional[str] = None
+
+class ExplanationOutput(BaseModel):
+    explanation_id: str
+    status: Literal["pending", "ready", "failed"]
+    key_drivers: Optional[list[str]] = None
+    error: Optional[str] = None
 
 # --- 4. CREATE THE PREDICTION ENDPOINT ---
 # This is the main change. We are replacing the mock logic with a real model call.
-@app.post("/predict", response_model=PredictionOutput)
-async def predict(input_data: AgentInput):
+@app.post("/predict", response_model=PredictionOutput, response_model_exclude_none=True)
+async def predict(input_data: AgentInput, background_tasks: BackgroundTasks, explain: ExplainMode = "inline",
+                  x_request_id: Optional[str] = Header(None, max_length=128)):
     """
     Accepts scores from other AI agents and returns a fundraise prediction.
 
     - **pitch_strength_score**: The narrative and clarity score of the project's pitch.
     - **identity_model_score**: The trust and reputation score of the founder/team.
     - **momentum_tracker_score**: The traction and community engagement score.
+    - **explain** (query): `inline` (default), `none` to skip the explanation,
+      or `deferred` to get an `explanation_id` to fetch from `/explanations/{id}`.
+    - **X-Request-ID** (header): the request id to log the prediction under,
+      when logging is on. One is generated if it is left out.
     """
 
+    if explain == "deferred":
+        _refuse_with_several_workers("?explain=deferred")
+
     # --- REAL PREDICTION LOGIC ---
     # 1. Convert the Pydantic input model to a dictionary.
     #    The `dict()` method is a convenient way to do this.
@@ -56,13 +286,431 @@ async def predict(input_data: AgentInput):
 
     # 2. Call our imported function to get the prediction and explanation.
     #    All the complex logic is neatly hidden away in model.py.
-    result = predict_and_explain(input_dict)
+    #    With micro-batching on, the row is scored together with any other
+    #    requests that arrive at the same time.
+    explain_now = explain == "inline"
+    if MICROBATCH_ENABLED:
+        result = await batcher.submit((input_dict, explain_now))
+    else:
+        result = await executor.run(predict_and_explain, input_dict, explain_now)
+
+    # 3. If asked to, explain the prediction after the response has been sent.
+    if explain == "deferred":
+        result["explanation_id"] = _defer_explanations([input_dict], background_tasks)[0]
+
+    # 4. If a candidate model is being evaluated, compare it on this request
+    #    once the response has gone out.
+    if shadow is not None and shadow.sample():
+        background_tasks.add_task(shadow.submit, [input_dict], [result])
+
+    # 5. If predictions are logged, record this one. This only appends to a
+    #    buffer; the log is written to disk by a background thread.
+    if prediction_log is not None:
+        result["request_id"] = x_request_id or PredictionLog.new_request_id()
+        prediction_log.record_predictions([result["request_id"]], [input_dict], [result])
+
+    # 6. Return the result. FastAPI will automatically serialize it to JSON.
+    return _respond(result)
+
+# --- 5. CREATE THE BATCH PREDICTION ENDPOINT ---
+# Scores many projects in one call. The model runs once over the whole batch,
+# which is far cheaper than one HTTP request (and one model call) per project.
+@app.post("/predict/batch", response_model=list[PredictionOutput], response_model_exclude_none=True)
+async def predict_batch(input_rows: list[AgentInput], background_tasks: BackgroundTasks,
+                        explain: ExplainMode = "inline", x_request_id: Optional[str] = Header(None, max_length=128)):
+    """
+    Accepts a list of agent score triples and returns one prediction per item.
+
+    Results are returned in the same order as the input list. The `explain`
+    query parameter works as for `/predict`. When predictions are logged, the
+    row at index i gets the request id `<X-Request-ID or a generated id>-<i>`.
+    """
+    if len(input_rows) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(input_rows)} rows exceeds the limit of {MAX_BATCH_SIZE}."
+        )
+
+    if explain == "deferred":
+        _refuse_with_several_workers("?explain=deferred")
+
+    rows = [row.dict() for row in input_rows]
+    results = await executor.run(predict_and_explain_many, rows, explain == "inline")
+
+    if explain == "deferred":
+        for result, explanation_id in zip(results, _defer_explanations(rows, background_tasks)):
+            result["explanation_id"] = explanation_id
+
+    if shadow is not None and shadow.sample():
+        background_tasks.add_task(shadow.submit, rows, results)
+
+    if prediction_log is not None:
+        batch_id = x_request_id or PredictionLog.new_request_id()
+        for i, result in enumerate(results):
+            result["request_id"] = f"{batch_id}-{i}"
+        prediction_log.record_predictions([result["request_id"] for result in results], rows, results)
+
+    return _respond(results)
+
+def _respond(content):
+    # Without response validation the result is encoded here, and FastAPI
+    # skips the response model (which still documents the endpoint).
+    return content if RESPONSE_VALIDATION else FastJSONResponse(content)
+
+# --- 6. CREATE THE STREAMING ENDPOINT FOR BULK SCORING ---
+# For backfills of millions of rows. The request body is newline-delimited
+# JSON (one score object per line) and is read incrementally; results are
+# written back as NDJSON while the upload is still arriving.
+@app.post("/predict/stream")
+async def predict_stream(request: Request, explain: Literal["inline", "none"] = "inline"):
+    """
+    Scores an NDJSON stream of score objects and streams NDJSON results back.
+
+    Every output line carries the `line` number of the input it belongs to and
+    either the prediction fields or an `error`. Malformed lines produce an
+    error line and the stream carries on. Blank lines are ignored.
+    """
+    return _DuplexStreamingResponse(_stream_predictions(request, explain == "inline"), media_type="application/x-ndjson")
+
+class _DuplexStreamingResponse(StreamingResponse):
+    # StreamingResponse normally listens for client disconnects in parallel by
+    # calling `receive()`, which would swallow the request body we are still
+    # reading. Here reading and writing happen in the same coroutine instead;
+    # a disconnect surfaces as an error from `request.stream()`.
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        async for chunk in self.body_iterator:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+async def _stream_predictions(request: Request, explain: bool):
+    # `chunk` holds (line_number, row, error) in input order until it has
+    # STREAM_CHUNK_SIZE lines, valid or not; then the rows are scored in one
+    # call and the whole chunk is written out. Counting error lines too keeps
+    # memory bounded and output flowing on a mostly invalid upload.
+    chunk = []
+    line_number = 0
+    buffer = b""
+    skipping_long_line = False
+
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            line_number += 1
+            if skipping_long_line:
+                # The rest of an over-long line; it was already reported.
+                skipping_long_line = False
+                continue
+            item = _parse_stream_line(line_number, line)
+            if item is not None:
+                chunk.append(item)
+
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield await _score_stream_chunk(chunk, explain)
+                chunk = []
+
+        if len(buffer) > STREAM_MAX_LINE_BYTES and not skipping_long_line:
+            # Never hold more than one maximum-length line in memory.
+            chunk.append((line_number + 1, None, f"Line is longer than {STREAM_MAX_LINE_BYTES} bytes"))
+            buffer = b""
+            skipping_long_line = True
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield await _score_stream_chunk(chunk, explain)
+                chunk = []
+        elif skipping_long_line:
+            buffer = b""
 
-    # 3. Return the result. FastAPI will automatically serialize it to JSON.
+    if buffer and not skipping_long_line:
+        item = _parse_stream_line(line_number + 1, buffer)
+        if item is not None:
+            chunk.append(item)
+
+    if chunk:
+        yield await _score_stream_chunk(chunk, explain)
+
+def _parse_stream_line(line_number: int, line: bytes):
+    # Returns (line_number, row, None) for a valid line, (line_number, None,
+    # error) for an invalid one, and None for a blank line.
+    if not line.strip():
+        return None
+    try:
+        payload = json.loads(line)
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object")
+        return line_number, AgentInput(**payload).dict(), None
+    except ValidationError as e:
+        problems = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+        return line_number, None, f"Invalid input: {problems}"
+    except ValueError as e:
+        return line_number, None, f"Malformed JSON: {e}"
+
+async def _score_stream_chunk(chunk: list, explain: bool) -> bytes:
+    rows = [row for _, row, _ in chunk if row is not None]
+    # A chunk of nothing but error lines needs no model call.
+    results = []
+    while rows:
+        try:
+            results = await executor.run(predict_and_explain_many, rows, explain)
+            break
+        except Overloaded:
+            # The response has already started, so a 503 is no longer possible.
+            # Slow the stream down until the inference pool has room.
+            await asyncio.sleep(0.01)
+
+    results = iter(results)
+    lines = []
+    for line_number, row, error in chunk:
+        if row is None:
+            lines.append(json.dumps({"line": line_number, "error": error}))
+        else:
+            lines.append(json.dumps({"line": line_number, **next(results)}))
+    return ("\n".join(lines) + "\n").encode()
+
+# --- 7. FETCH DEFERRED EXPLANATIONS ---
+@app.get("/explanations/{explanation_id}", response_model=ExplanationOutput, response_model_exclude_none=True)
+def get_explanation(explanation_id: str):
+    """
+    Returns the key drivers for a prediction made with `?explain=deferred`.
+
+    `status` is `pending` until the background computation has finished.
+    """
+    entry = explanations.get(explanation_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired explanation id.")
+    return {"explanation_id": explanation_id, **entry}
+
+def _defer_explanations(rows: list[dict], background_tasks: BackgroundTasks) -> list[str]:
+    # Register one pending explanation per row and compute them all in a
+    # single background call once the response is on its way.
+    explanation_ids = [explanations.create() for _ in rows]
+    background_tasks.add_task(_explain_later, explanation_ids, rows)
+    return explanation_ids
+
+async def _explain_later(explanation_ids: list[str], rows: list[dict]):
+    try:
+        key_drivers = await executor.run(explain_many, rows)
+    except Exception as e:
+        for explanation_id in explanation_ids:
+            explanations.fail(explanation_id, str(e))
+        return
+
+    for explanation_id, drivers in zip(explanation_ids, key_drivers):
+        explanations.complete(explanation_id, drivers)
+
+# --- 8. EXPOSE MICRO-BATCHING STATISTICS ---
+# Queue depth and the batch-size histogram, used to tune the batching window.
+@app.get("/stats/batching")
+def batching_stats():
+    return {"enabled": MICROBATCH_ENABLED, **batcher.stats()}
+
+# Pool size, in-flight calls and how many requests were turned away with 503.
+@app.get("/stats/executor")
+def executor_stats():
+    return executor.stats()
+
+# Hit/miss counters of the prediction cache in this process.
+@app.get("/stats/cache")
+def cache_stats():
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "model_version": load_status()["model_version"], **prediction_cache.stats()}
+
+@app.get("/stats/prediction-log")
+def prediction_log_stats():
+    if prediction_log is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_log.stats()}
+
+# Request counts, error counts and latency histograms in the Prometheus text format.
+@app.get("/metrics")
+def get_metrics():
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+metrics.Gauge("chimera_executor_pending", "Inference calls running or waiting in the pool.",
+              lambda: executor.pending)
+metrics.Gauge("chimera_microbatch_queue_depth", "Rows waiting to be micro-batched.",
+              lambda: batcher.stats()["queue_depth"])
+metrics.Gauge("chimera_cache_hit_ratio", "Share of prediction cache lookups that were hits.",
+              lambda: prediction_cache.stats()["hit_rate"] if prediction_cache is not None else 0)
+
+# --- 9. ADMIN: MODEL REGISTRY ---
+# Lets operators switch model versions on a running server. The new version
+# is loaded and warmed up while the current one keeps serving, then swapped
+# in; requests already in flight finish on the version they started with.
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set CHIMERA_ADMIN_TOKEN")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Missing or invalid X-Admin-Token")
+
+def require_single_worker():
+    _refuse_with_several_workers("This endpoint")
+
+def _refuse_with_several_workers(feature: str):
+    # The state behind these features lives in one worker process. With
+    # several workers, the follow-up request may land on another worker.
+    if WORKER_PROCESSES > 1:
+        raise HTTPException(status_code=409, detail=f"{feature} is not available with {WORKER_PROCESSES} worker "
+                                                    f"processes: its state would only exist in one of them")
+
+class ReloadRequest(BaseModel):
+    # A registry version to switch to. Leave it out to reload the registry's active version.
+    version: Optional[str] = None
+
+@app.get("/admin/model", dependencies=[Depends(require_admin)])
+def get_model_versions():
+    """
+    Reports the version being served, the registry's active version and every published version.
+    """
+    return {
+        "model_version": load_status()["model_version"],
+        "registry_current": registry.current(),
+        "versions": registry.versions(),
+    }
+
+@app.post("/admin/model/reload", dependencies=[Depends(require_admin), Depends(require_single_worker)])
+async def post_model_reload(body: ReloadRequest = ReloadRequest()):
+    """
+    Loads a model version and swaps it in without dropping requests.
+
+    When a version is given it also becomes the registry's active version,
+    so other workers watching the registry follow it.
+    """
+    if body.version is not None and not registry.exists(body.version):
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {body.version}")
+
+    # Loading takes a while, so it runs off the event loop.
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(None, reload_model, body.version)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Could not load the model, the previous version "
+                                                    f"is still serving: {type(e).__name__}: {e}")
+    if body.version is not None:
+        registry.activate(body.version)
     return result
 
-# --- 5. ADD A ROOT ENDPOINT FOR HEALTH CHECKS ---
-# No changes here.
+# Shadow scoring: a candidate version scores a sample of live requests in the
+# background, and the comparison with the live model is reported here.
+class ShadowRequest(BaseModel):
+    version: str
+    fraction: float = Field(0.1, ge=0, le=1, description="Share of requests to shadow")
+
+@app.get("/admin/shadow", dependencies=[Depends(require_admin)])
+def get_shadow_summary():
+    """
+    Reports score deltas, label disagreement and latency of the candidate model.
+    """
+    if shadow is None:
+        return {"enabled": False}
+    return {"enabled": True, **shadow.summary()}
+
+@app.post("/admin/shadow", dependencies=[Depends(require_admin), Depends(require_single_worker)])
+async def post_shadow(body: ShadowRequest):
+    """
+    Starts shadow scoring with a registry version, replacing any running comparison.
+    """
+    if not registry.exists(body.version):
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {body.version}")
+    scorer = await asyncio.get_running_loop().run_in_executor(None, _start_shadow, body.version, body.fraction)
+    return {"enabled": True, **scorer.summary()}
+
+@app.delete("/admin/shadow", dependencies=[Depends(require_admin)])
+def delete_shadow():
+    """
+    Stops shadow scoring and returns the final summary.
+    """
+    global shadow
+    previous, shadow = shadow, None
+    if previous is None:
+        return {"enabled": False}
+    previous.shutdown()
+    return {"enabled": False, **previous.summary()}
+
+# Profiling: records where a live server spends its time for the next N
+# requests or T seconds, and writes cProfile stats or a collapsed-stack file
+# for flame graphs (see app/profiling.py).
+class ProfileRequest(BaseModel):
+    mode: Literal[PROFILING_MODES] = "sampling"
+    requests: Optional[int] = Field(None, gt=0, description="Stop after this many requests")
+    seconds: Optional[float] = Field(None, gt=0, le=3600, description="Stop after this many seconds")
+    interval_ms: float = Field(5.0, ge=0.5, le=1000, description="Time between stack samples")
+
+@app.post("/admin/profile", dependencies=[Depends(require_admin), Depends(require_single_worker)])
+async def post_profile(body: ProfileRequest):
+    """
+    Starts a profiling session. With neither limit given, it runs for 30 seconds.
+    """
+    global profiler
+    if profiler is not None and profiler.active:
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+
+    profiler = ProfilingSession(body.mode, max_requests=body.requests,
+                                max_seconds=body.seconds if body.requests or body.seconds else 30,
+                                interval_ms=body.interval_ms)
+    executor.call_wrapper = profiler.call if body.mode == "cprofile" else None
+    profiler.start()
+    return profiler.status()
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+def get_profile():
+    """
+    Reports the running or most recent profiling session and the files it wrote.
+    """
+    if profiler is None:
+        return {"active": False}
+    return profiler.status()
+
+@app.delete("/admin/profile", dependencies=[Depends(require_admin)])
+async def delete_profile():
+    """
+    Stops the running profiling session early and writes its results.
+    """
+    if profiler is None:
+        return {"active": False}
+    profiler.stop()
+    return profiler.status()
+
+# --- 10. ADD A ROOT ENDPOINT FOR HEALTH CHECKS ---
+# This is the liveness probe: it never touches the model, so it answers as
+# soon as the server is up.
 @app.get("/")
 def read_root():
     return {"status": "ok", "agent": "Project Chimera v1.0"}
+
+# --- 11. ADD A READINESS ENDPOINT ---
+# Returns 200 once the model and explainer are loaded and warm, and 503 while
+# they are still loading (or if loading failed). Also reports how long each
+# startup phase took.
+@app.get("/ready")
+def read_ready():
+    status = load_status()
+    status["startup_phases"] = {"import_app": APP_IMPORT_SECONDS, **status["startup_phases"]}
+    return JSONResponse(status_code=200 if status["status"] == "ready" else 503, content=status)
+
+# --- 12. RECORD REALIZED OUTCOMES ---
+# Once we know whether a project raised its round, the caller posts the
+# outcome for the request id its prediction was given. Outcomes are logged
+# next to the predictions and joined with them at training time, so an
+# outcome can arrive long after the prediction, on any worker.
+class OutcomeInput(BaseModel):
+    request_id: str = Field(..., min_length=1, max_length=160, description="The request id of the prediction")
+    outcome: int = Field(..., ge=0, le=1, description="1 if the project raised its round, 0 if it did not")
+
+@app.post("/outcomes", status_code=202)
+def post_outcomes(outcomes: list[OutcomeInput]):
+    """
+    Records the realized outcomes of earlier predictions, for retraining.
+    """
+    if prediction_log is None:
+        raise HTTPException(status_code=404, detail="Prediction logging is off; set CHIMERA_PREDICTION_LOG_DIR")
+    if len(outcomes) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(outcomes)} outcomes exceeds the limit of {MAX_BATCH_SIZE}."
+        )
+    prediction_log.record_outcomes([o.request_id for o in outcomes], [o.outcome for o in outcomes])
+    return {"recorded": len(outcomes)}
+
+APP_IMPORT_SECONDS = round(time.perf_counter() - _import_started, 4)
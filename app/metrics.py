@@ -0,0 +1,273 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# --- METRICS ---
+# Request counts, error counts and latency histograms, served in the
+# Prometheus text format at GET /metrics. The metrics are cheap enough to
+# leave on in production:
+# - every histogram's buckets are allocated once, up front;
+# - recording a value is one binary search plus two additions under an uncontended lock;
+# - label lookups on the hot path are bound once at import time.
+# Run `python benchmarks/metrics_overhead.py` to measure the cost.
+#
+# CHIMERA_METRICS_ENABLED=0 turns recording off; /metrics then reports nothing.
+
+ENABLED = os.environ.get("CHIMERA_METRICS_ENABLED", "1") != "0"
+
+# Upper bounds, in seconds, of the latency buckets. The model stages take tens
+# of microseconds, whole requests milliseconds, so the buckets span both.
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        # One count per bucket plus one for values above the last bound (+Inf).
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self) -> tuple:
+        with self._lock:
+            return tuple(self.counts), self.sum
+
+    def add(self, counts, total: float):
+        # Merges observations recorded elsewhere, e.g. in an inference worker process.
+        with self._lock:
+            for index, count in enumerate(counts):
+                self.counts[index] += count
+            self.sum += total
+
+
+class _NullChild:
+    # Stands in for every metric when recording is turned off.
+    __slots__ = ()
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def observe(self, value: float):
+        pass
+
+    def snapshot(self) -> tuple:
+        return (), 0.0
+
+    def add(self, counts, total: float):
+        pass
+
+
+_NULL_CHILD = _NullChild()
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def labels(self, *values):
+        """
+        Returns the metric for one combination of label values, creating it on first use.
+
+        Bind the result once where possible; looking it up costs a dict access.
+        """
+        if not ENABLED:
+            return _NULL_CHILD
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_text(self, values, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+
+class Counter(_Metric):
+    """
+    A value that only goes up, such as a number of requests.
+    """
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def _render_child(self, values, child):
+        return [f"{self.name}{self._label_text(values)} {_number(child.value)}"]
+
+
+class Histogram(_Metric):
+    """
+    Counts observations (usually durations in seconds) in fixed, cumulative buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _render_child(self, values, child):
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = 'le="{}"'.format("+Inf" if bound == float("inf") else _number(bound))
+            lines.append(f"{self.name}_bucket{self._label_text(values, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{self._label_text(values)} {_number(total)}")
+        lines.append(f"{self.name}_count{self._label_text(values)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    A value read from a callback each time the metrics are rendered, such as a queue depth.
+    """
+
+    def __init__(self, name: str, documentation: str, read):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+        REGISTRY.register(self)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge",
+                f"{self.name} {_number(self.read())}"]
+
+
+class MetricsRegistry:
+    """
+    Every metric created in this process, rendered together for /metrics.
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+
+    def render(self) -> str:
+        if not ENABLED:
+            return ""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _number(value) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY = MetricsRegistry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# --- METRICS RECORDED BY THE SERVICE ---
+REQUESTS = Counter("chimera_requests_total", "HTTP requests handled.", ["path", "status"])
+REQUEST_ERRORS = Counter("chimera_request_errors_total", "HTTP requests answered with a 4xx or 5xx status.",
+                         ["path", "status"])
+REQUEST_SECONDS = Histogram("chimera_request_duration_seconds", "Time to handle an HTTP request.", ["path"])
+STAGE_SECONDS = Histogram("chimera_stage_duration_seconds",
+                          "Time spent in each stage of the prediction path.", ["stage"])
+
+# The stages, bound once so the hot path does no label lookups. With
+# micro-batching or batch requests, the model stages are timed once per batch.
+VALIDATION_STAGE = STAGE_SECONDS.labels("validation")
+FEATURE_MATRIX_STAGE = STAGE_SECONDS.labels("feature_matrix")
+PREDICT_STAGE = STAGE_SECONDS.labels("predict")
+EXPLAIN_STAGE = STAGE_SECONDS.labels("explain")
+KEY_DRIVERS_STAGE = STAGE_SECONDS.labels("key_drivers")
+SERIALIZATION_STAGE = STAGE_SECONDS.labels("serialization")
+# The stages timed inside app/model.py, wherever the model runs.
+MODEL_STAGES = (FEATURE_MATRIX_STAGE, PREDICT_STAGE, EXPLAIN_STAGE, KEY_DRIVERS_STAGE)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that counts requests and errors and times each request.
+
+    Requests are labelled with the route's path template (for example
+    /explanations/{explanation_id}), so the number of label values stays small.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_and_record_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            REQUEST_SECONDS.labels(path).observe(time.perf_counter() - start)
+            REQUESTS.labels(path, str(status)).inc()
+            if status >= 400:
+                REQUEST_ERRORS.labels(path, str(status)).inc()
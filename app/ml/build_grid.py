@@ -0,0 +1,134 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+
+import numpy as np
+import xgboost as xgb
+
+# --- 1. SETTINGS ---
+# Every input feature is a score between 0 and 10, so the model's whole
+# response surface can be evaluated ahead of time. This script scores every
+# point of a regular grid over [0, 10]^3 and saves the prediction and the SHAP
+# value of each feature to a memory-mappable .npy file. The "grid" serving
+# engine (app/grid_model.py) then answers requests by looking values up.
+MODEL_DIR = os.path.dirname(__file__)
+MODEL_PATH = os.path.join(MODEL_DIR, "predictor.bst")
+GRID_PATH = os.path.join(MODEL_DIR, "predictor_grid.npy")
+LOW, HIGH = 0.0, 10.0
+DEFAULT_STEP = 0.1
+
+
+def build_grid(model_path: str = MODEL_PATH, grid_path: str = GRID_PATH, step: float = DEFAULT_STEP,
+               error_samples: int = 100_000, seed: int = 42) -> dict:
+    """
+    Evaluates the booster and its SHAP values on every grid point and writes them to disk.
+
+    The output array has shape (points, points, points, 1 + num_features): the
+    predicted probability followed by one SHAP value per feature. A JSON file
+    with the grid settings and the measured interpolation error is written
+    next to it.
+
+    Returns:
+        dict: The metadata written next to the grid.
+    """
+    span = HIGH - LOW
+    if step <= 0 or not math.isclose(round(span / step) * step, span, rel_tol=0, abs_tol=1e-9):
+        # Otherwise the last grid point falls short of HIGH, and inputs above
+        # it would be clamped to it instead of interpolated.
+        raise ValueError(f"The step must divide {LOW}-{HIGH} into equal parts; {step} does not")
+
+    start_time = time.perf_counter()
+    booster = xgb.Booster()
+    booster.load_model(model_path)
+    num_features = booster.num_features()
+    feature_names = booster.feature_names or [f"f{i}" for i in range(num_features)]
+    if num_features != 3:
+        raise ValueError(f"The lookup grid is three-dimensional; this model has {num_features} features")
+
+    points = int(round((HIGH - LOW) / step)) + 1
+    axis = LOW + step * np.arange(points)
+    print(f"Building a {points}^3 grid (step {step}) from {model_path}...")
+
+    # --- 2. FILL THE GRID ONE SLAB AT A TIME ---
+    # The output is memory-mapped, so only one slab of points is held in memory.
+    grid = np.lib.format.open_memmap(grid_path, mode="w+", dtype=np.float32,
+                                     shape=(points, points, points, 1 + num_features))
+    j, k = np.meshgrid(axis, axis, indexing="ij")
+    for i, x0 in enumerate(axis):
+        slab = np.column_stack([np.full(j.size, x0), j.ravel(), k.ravel()]).astype(np.float32)
+        grid[i, ..., 0] = _predict(booster, slab).reshape(points, points)
+        grid[i, ..., 1:] = _shap_values(booster, slab).reshape(points, points, num_features)
+    grid.flush()
+    del grid
+
+    # --- 3. MEASURE THE INTERPOLATION ERROR ---
+    # Off-grid inputs are answered by trilinear interpolation. Trees are step
+    # functions, so the error is largest next to split thresholds; report the
+    # worst case over a random sample against the real model.
+    from app.grid_model import GridModel
+
+    lookup = GridModel(np.load(grid_path, mmap_mode="r"), low=LOW, step=step, feature_names=feature_names)
+    rng = np.random.default_rng(seed)
+    sample = rng.uniform(LOW, HIGH, (error_samples, num_features)).astype(np.float32)
+    score_error = np.abs(lookup.predict(sample) - _predict(booster, sample))
+    shap_error = np.abs(lookup.shap_values(sample) - _shap_values(booster, sample))
+
+    with open(model_path, "rb") as f:
+        model_fingerprint = hashlib.sha256(f.read()).hexdigest()[:12]
+
+    metadata = {
+        "low": LOW,
+        "high": HIGH,
+        "step": step,
+        "points": points,
+        "feature_names": feature_names,
+        "source_model": os.path.basename(model_path),
+        "source_model_version": model_fingerprint,
+        "error_samples": error_samples,
+        "max_score_interpolation_error": float(score_error.max()),
+        "mean_score_interpolation_error": float(score_error.mean()),
+        "max_shap_interpolation_error": float(shap_error.max()),
+        "build_seconds": round(time.perf_counter() - start_time, 2),
+    }
+    with open(_metadata_path(grid_path), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    size_mb = os.path.getsize(grid_path) / 1e6
+    print(f"Grid saved to {grid_path} ({size_mb:.1f} MB) in {metadata['build_seconds']} s")
+    print(f"Max score interpolation error: {metadata['max_score_interpolation_error']:.4f} "
+          f"(mean {metadata['mean_score_interpolation_error']:.5f})")
+    print(f"Max SHAP interpolation error: {metadata['max_shap_interpolation_error']:.4f}")
+    return metadata
+
+
+def _predict(booster, X):
+    return booster.inplace_predict(X)
+
+
+def _shap_values(booster, X):
+    # XGBoost's built-in TreeSHAP, the same values shap.TreeExplainer returns.
+    # The last column is the bias term, which is not a feature contribution.
+    return booster.predict(xgb.DMatrix(X, feature_names=booster.feature_names), pred_contribs=True)[:, :-1]
+
+
+def _metadata_path(grid_path: str) -> str:
+    return os.path.splitext(grid_path)[0] + ".json"
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Allow `python app/ml/build_grid.py` from the project root to import app.grid_model.
+    sys.path.insert(0, os.path.abspath(os.path.join(MODEL_DIR, "..", "..")))
+
+    parser = argparse.ArgumentParser(description="Precompute the model's predictions over a dense input grid.")
+    parser.add_argument("--model", default=MODEL_PATH, help="Booster to evaluate.")
+    parser.add_argument("--output", default=GRID_PATH, help="Where to write the .npy grid.")
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP, help="Grid spacing (default 0.1 -> 101^3 points).")
+    parser.add_argument("--error-samples", type=int, default=100_000,
+                        help="Random off-grid points used to measure interpolation error.")
+    args = parser.parse_args()
+    build_grid(args.model, args.output, args.step, args.error_samples)
@@ -2,51 +2,209 @@ import pandas as pd
 import numpy as np
 import xgboost as xgb
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
+from sklearn.metrics import accuracy_score, classification_report, log_loss
+import argparse
+import functools
+import json
+import multiprocessing
 import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # --- 1. SETTINGS ---
 # Define the path where the model will be saved.
 # os.path.join ensures it works on any operating system.
 MODEL_DIR = os.path.dirname(__file__)
 MODEL_PATH = os.path.join(MODEL_DIR, "predictor.bst")
+# The same model in XGBoost's JSON format, loaded by the compiled serving engine.
+COMPILED_MODEL_PATH = os.path.join(MODEL_DIR, "predictor.json")
 NUM_SAMPLES = 1000  # The number of mock data points to generate.
 
-def generate_mock_data(num_samples: int) -> pd.DataFrame:
+# The model's inputs and target.
+FEATURES = ["pitch_strength_score", "identity_model_score", "momentum_tracker_score"]
+TARGET = "will_fund"
+
+# These are standard, robust parameters for XGBoost.
+MODEL_PARAMS = {
+    "objective": "binary:logistic",
+    "eval_metric": "logloss",
+    "n_estimators": 100,
+    "learning_rate": 0.1,
+    "max_depth": 3,
+    "random_state": 42,
+}
+
+# Seed for the mock data, so every run trains on the same rows.
+SEED = 42
+# Defaults for generate_shards: rows per shard file, and rows generated at a time.
+SHARD_ROWS = 1_000_000
+CHUNK_ROWS = 100_000
+MANIFEST_FILE = "manifest.json"
+
+def generate_mock_data(num_samples: int, seed: int = SEED) -> pd.DataFrame:
     """
     Generates a DataFrame with mock data representing startup agent scores.
     The logic is designed to create plausible correlations between scores and success.
+
+    The rows are the first `num_samples` rows of shard 0 from `generate_shards`
+    with the same seed. Pass seed=None for different data on every call.
     """
     print(f"Generating {num_samples} mock data samples...")
 
-    # Generate base scores from a uniform distribution (0-10)
-    data = {
-        "pitch_strength_score": np.random.uniform(1, 10, num_samples),
-        "identity_model_score": np.random.uniform(1, 10, num_samples),
-        "momentum_tracker_score": np.random.uniform(1, 10, num_samples),
-    }
-    df = pd.DataFrame(data)
+    features, labels = _generate_rows(*_shard_rngs(seed, 0), num_samples)
+    df = pd.DataFrame(features, columns=FEATURES)
+    df[TARGET] = labels.astype(int)
+
+    print("Mock data generated. Class distribution:")
+    print(df[TARGET].value_counts(normalize=True))
+
+    return df
+
+def _generate_rows(feature_rng: np.random.Generator, noise_rng: np.random.Generator, num_rows: int):
+    """
+    Returns (features, labels) for `num_rows` mock startups.
+
+    Features and noise come from separate streams, so generating rows in
+    chunks of any size gives the same rows as generating them all at once.
+    """
+    # Generate base scores from a uniform distribution (1-10)
+    features = feature_rng.uniform(1, 10, (num_rows, len(FEATURES)))
 
     # --- Create a plausible "success" condition ---
     # Success is more likely if the *average* score is high, with some randomness.
     # We add noise to make the prediction task non-trivial for the model.
-    # The threshold (6.0) is arbitrary but creates a reasonably balanced dataset.
-    success_probability = df.mean(axis=1) / 10 # Normalize avg score to be between 0 and 1
+    # The threshold (0.65) is arbitrary but creates a reasonably balanced dataset.
+    success_probability = features.mean(axis=1) / 10 # Normalize avg score to be between 0 and 1
 
     # Introduce non-linearity: strong pitches matter more
-    success_probability += (df['pitch_strength_score'] / 10) * 0.2
+    success_probability += (features[:, 0] / 10) * 0.2
 
     # Add random noise to make it realistic
-    noise = np.random.normal(0, 0.1, num_samples)
+    noise = noise_rng.normal(0, 0.1, num_rows)
     final_probability = np.clip(success_probability + noise, 0, 1)
 
     # Create the binary target variable 'will_fund' (1 for success, 0 for failure)
-    df['will_fund'] = (final_probability > 0.65).astype(int)
+    return features, (final_probability > 0.65).astype(np.int8)
 
-    print("Mock data generated. Class distribution:")
-    print(df['will_fund'].value_counts(normalize=True))
+def _shard_rngs(seed, shard: int):
+    # Shard i's streams are children of the seed's i-th spawned child, so every
+    # shard is independent of the others and can be generated anywhere.
+    shard_seed = np.random.SeedSequence(seed, spawn_key=(shard,))
+    return tuple(np.random.default_rng(child) for child in shard_seed.spawn(2))
 
-    return df
+# --- 2. GENERATING DATA AT SCALE ---
+# generate_mock_data builds one DataFrame in memory, which is fine for the
+# default 1,000 rows. To stress-test training and serving, generate_shards
+# writes tens of millions to billions of rows as a directory of shard files:
+#
+#     python app/ml/train.py generate data/ --rows 100000000 --workers 8
+#
+# Each shard has its own random streams derived from the seed, so shards are
+# written in parallel by a process pool. The files depend only on the seed and
+# shard size, not on the number of workers or the chunk size. Each worker
+# holds one chunk of rows in memory at a time. The shards are written under
+# temporary names, and manifest.json is written last, so a directory with a
+# manifest is complete.
+
+def generate_shards(output_dir: str, num_rows: int, shard_rows: int = SHARD_ROWS, chunk_rows: int = CHUNK_ROWS,
+                    seed: int = SEED, workers: int = 1, file_format: str = "npy") -> dict:
+    """
+    Writes `num_rows` rows of mock data to `output_dir` as shard files plus a manifest.
+
+    Args:
+        output_dir (str): Directory for the shards; created if needed.
+        num_rows (int): Total rows across all shards.
+        shard_rows (int): Rows per shard file (the last shard may be smaller).
+        chunk_rows (int): Rows generated and written at a time; bounds each worker's memory.
+        seed (int): Seed for every shard's random streams.
+        workers (int): Worker processes. 1 writes every shard in this process.
+        file_format (str): "npy" - a float32 array with the features and then the
+            target as columns - or "parquet" (needs pyarrow), one row group per chunk.
+
+    Returns:
+        dict: The manifest, also written to <output_dir>/manifest.json.
+    """
+    if file_format not in ("npy", "parquet"):
+        raise ValueError(f"Unknown shard format: {file_format!r} (expected 'npy' or 'parquet')")
+    os.makedirs(output_dir, exist_ok=True)
+
+    shards = [{"file": f"shard-{index:05d}.{file_format}", "rows": min(shard_rows, num_rows - start)}
+              for index, start in enumerate(range(0, num_rows, shard_rows))]
+    jobs = [(os.path.join(output_dir, shard["file"]), index, shard["rows"], seed, chunk_rows, file_format)
+            for index, shard in enumerate(shards)]
+    print(f"Generating {num_rows:,} rows in {len(shards)} shards with {workers} worker(s)...")
+
+    start_time = time.perf_counter()
+    rows_done = 0
+
+    def report(index: int):
+        nonlocal rows_done
+        rows_done += shards[index]["rows"]
+        elapsed = time.perf_counter() - start_time
+        print(f"Wrote {shards[index]['file']} ({rows_done:,}/{num_rows:,} rows, {rows_done / elapsed:,.0f} rows/sec)")
+
+    if workers <= 1:
+        for job in jobs:
+            report(_write_shard(*job))
+    else:
+        # "spawn" keeps the workers clear of any XGBoost state in this process.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for index in pool.map(_write_shard, *zip(*jobs)):
+                report(index)
+
+    manifest = {
+        "seed": seed,
+        "num_rows": num_rows,
+        "shard_rows": shard_rows,
+        "format": file_format,
+        "features": FEATURES,
+        "target": TARGET,
+        "shards": shards,
+    }
+    temporary = os.path.join(output_dir, MANIFEST_FILE + ".tmp")
+    with open(temporary, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temporary, os.path.join(output_dir, MANIFEST_FILE))
+    print(f"Done in {time.perf_counter() - start_time:.1f} s -> {output_dir}")
+    return manifest
+
+def _write_shard(path: str, index: int, num_rows: int, seed: int, chunk_rows: int, file_format: str) -> int:
+    """
+    Generates one shard chunk by chunk and moves it into place when complete. Returns its index.
+    """
+    feature_rng, noise_rng = _shard_rngs(seed, index)
+    chunks = (_generate_rows(feature_rng, noise_rng, min(chunk_rows, num_rows - start))
+              for start in range(0, num_rows, chunk_rows))
+    temporary = path + ".tmp"
+
+    if file_format == "npy":
+        # Write the .npy header, then append each chunk's bytes in row order.
+        with open(temporary, "wb") as f:
+            np.lib.format.write_array_header_1_0(
+                f, {"descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)), "fortran_order": False,
+                    "shape": (num_rows, len(FEATURES) + 1)})
+            for features, labels in chunks:
+                f.write(np.column_stack([features, labels]).astype(np.float32).tobytes())
+    else:
+        pa, pq = _import_pyarrow()
+        schema = pa.schema([(name, pa.float32()) for name in FEATURES] + [(TARGET, pa.int8())])
+        with pq.ParquetWriter(temporary, schema) as writer:
+            for features, labels in chunks:
+                columns = [features[:, i].astype(np.float32) for i in range(len(FEATURES))] + [labels]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+    os.replace(temporary, path)
+    return index
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet shards need the optional 'pyarrow' package: pip install pyarrow")
+    return pa, pq
 
 def train_model():
     """
@@ -56,11 +214,8 @@ def train_model():
     df = generate_mock_data(NUM_SAMPLES)
 
     # Define features (X) and target (y)
-    features = ["pitch_strength_score", "identity_model_score", "momentum_tracker_score"]
-    target = "will_fund"
-
-    X = df[features]
-    y = df[target]
+    X = df[FEATURES]
+    y = df[TARGET]
 
     # Split data into training and testing sets
     X_train, X_test, y_train, y_test = train_test_split(
@@ -68,17 +223,8 @@ def train_model():
     )
 
     # --- Initialize and train the XGBoost Classifier ---
-    # These are standard, robust parameters for XGBoost.
     print("\nTraining XGBoost model...")
-    xgb_classifier = xgb.XGBClassifier(
-        objective='binary:logistic',
-        eval_metric='logloss',
-        n_estimators=100,
-        learning_rate=0.1,
-        max_depth=3,
-        use_label_encoder=False,
-        random_state=42
-    )
+    xgb_classifier = xgb.XGBClassifier(**MODEL_PARAMS)
 
     xgb_classifier.fit(X_train, y_train)
     print("Model training complete.")
@@ -92,11 +238,576 @@ def train_model():
     print(classification_report(y_test, y_pred))
 
     # --- Save the trained model ---
-    print(f"\nSaving model to: {MODEL_PATH}")
-    xgb_classifier.save_model(MODEL_PATH)
+    save_model(xgb_classifier, {"test_accuracy": round(float(accuracy), 4)})
+
+def save_model(model, metadata: dict, model_path: str = MODEL_PATH, compiled_model_path: str = COMPILED_MODEL_PATH,
+               publish: bool = True) -> str:
+    """
+    Saves a trained classifier or booster in both formats and publishes it to the registry.
+
+    Returns:
+        str: The registry version, or None when `publish` is False.
+    """
+    booster = model.get_booster() if isinstance(model, xgb.XGBModel) else model
+    if booster.attr(TRAINING_PARAMS_ATTR) is None:
+        record_training_params(booster)
+
+    print(f"\nSaving model to: {model_path}")
+    model.save_model(model_path)
+    model.save_model(compiled_model_path)
     print("Model saved successfully.")
+    if not publish:
+        return None
+
+    # --- Publish it to the model registry ---
+    # The new version becomes the active one. A running server picks it up
+    # through POST /admin/model/reload, or by itself when
+    # CHIMERA_MODEL_WATCH_SECONDS is set, without a restart.
+    from app.registry import ModelRegistry
+
+    version = ModelRegistry().publish(model_path, compiled_model_path, metadata=metadata, activate=True)
+    print(f"Published model version {version} to the registry.")
+    return version
+
+# A saved booster file keeps its trees but not the parameters they were grown
+# with: loaded back, `save_config()` reports XGBoost's defaults. save_model
+# therefore copies them from the trained booster into a model attribute, so
+# update_model can grow new trees the same way.
+TRAINING_PARAMS_ATTR = "training_params"
+RECORDED_TREE_PARAMS = ("eta", "max_depth", "min_child_weight", "gamma", "subsample", "colsample_bytree",
+                        "lambda", "alpha", "max_bin")
+
+def record_training_params(booster: xgb.Booster):
+    """
+    Stores the objective, metrics, seed and tree parameters of a just-trained booster in its attributes.
+    """
+    config = json.loads(booster.save_config())["learner"]
+    tree_params = config["gradient_booster"]["tree_train_param"]
+    params = {
+        "objective": config["objective"]["name"],
+        "eval_metric": [metric["name"] for metric in config["metrics"]] or MODEL_PARAMS["eval_metric"],
+        "seed": config["generic_param"]["seed"],
+        **{name: tree_params[name] for name in RECORDED_TREE_PARAMS},
+    }
+    booster.set_attr(**{TRAINING_PARAMS_ATTR: json.dumps(params)})
+
+def training_params(booster: xgb.Booster, nthread: int = None) -> dict:
+    """
+    The parameters `booster` was trained with, growing trees with "hist" on `nthread` cores (default: all).
+
+    Models saved before the parameters were recorded fall back to `booster_params`.
+    """
+    recorded = booster.attr(TRAINING_PARAMS_ATTR)
+    if recorded is None:
+        return booster_params(nthread)
+    return {**json.loads(recorded), "tree_method": "hist", "nthread": nthread or os.cpu_count() or 1}
+
+# --- 3. TRAINING OUT OF CORE ---
+# train_model holds the whole dataset in a DataFrame. train_from_shards trains
+# on a directory written by generate_shards without ever loading it whole:
+# ShardIterator hands XGBoost one chunk of a shard at a time, and
+# ExtMemQuantileDMatrix keeps the binned data in cache pages on disk, so the
+# dataset can be larger than RAM. Trees are grown with the "hist" method on
+# every core. The validation set is made of whole shards, so deciding the
+# split reads no data.
+#
+#     python app/ml/train.py --data data/
+
+VALIDATION_FRACTION = 0.1
+
+class ShardIterator(xgb.DataIter):
+    """
+    Feeds shard files to XGBoost one chunk at a time.
+
+    Args:
+        data_dir (str): Directory written by `generate_shards`.
+        shards (list[dict]): The manifest entries of the shards to read.
+        chunk_rows (int): Rows per batch for .npy shards. Parquet shards are read one row group at a time.
+        cache_prefix (str): Where XGBoost writes its external-memory cache pages.
+    """
+
+    def __init__(self, data_dir: str, shards: list[dict], chunk_rows: int = CHUNK_ROWS, cache_prefix: str = None):
+        self.batches = [batch for shard in shards
+                        for batch in _shard_batches(os.path.join(data_dir, shard["file"]), shard["rows"], chunk_rows)]
+        self._next_batch = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._next_batch == len(self.batches):
+            return False
+        features, labels = self.batches[self._next_batch]()
+        input_data(data=features, label=labels, feature_names=FEATURES)
+        self._next_batch += 1
+        return True
+
+    def reset(self):
+        self._next_batch = 0
+
+def _shard_batches(path: str, rows: int, chunk_rows: int) -> list:
+    # Functions that each read one batch of a shard as (features, labels).
+    if path.endswith(".parquet"):
+        _, pq = _import_pyarrow()
+        return [functools.partial(_read_parquet_row_group, path, group)
+                for group in range(pq.ParquetFile(path).num_row_groups)]
+    return [functools.partial(_read_npy_rows, path, start, min(start + chunk_rows, rows))
+            for start in range(0, rows, chunk_rows)]
+
+def _read_npy_rows(path: str, start: int, stop: int):
+    rows = np.load(path, mmap_mode="r")[start:stop]
+    return np.ascontiguousarray(rows[:, :-1]), np.array(rows[:, -1])
+
+def _read_parquet_row_group(path: str, group: int):
+    _, pq = _import_pyarrow()
+    table = pq.ParquetFile(path).read_row_group(group, columns=FEATURES + [TARGET])
+    features = np.column_stack([table.column(name).to_numpy() for name in FEATURES])
+    return features, table.column(TARGET).to_numpy().astype(np.float32)
+
+def read_manifest(data_dir: str) -> dict:
+    with open(os.path.join(data_dir, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+def split_shards(shards: list[dict], validation_fraction: float = VALIDATION_FRACTION, seed: int = SEED):
+    """
+    Sets a seeded random selection of whole shards aside for validation.
+
+    Returns:
+        tuple: (training shards, validation shards), each in manifest order.
+    """
+    if len(shards) < 2:
+        raise ValueError("Training from shards needs at least two shards: one is kept for validation")
+    count = min(len(shards) - 1, max(1, round(len(shards) * validation_fraction)))
+    validation = set(np.random.default_rng(seed).choice(len(shards), count, replace=False).tolist())
+    return ([shard for i, shard in enumerate(shards) if i not in validation],
+            [shard for i, shard in enumerate(shards) if i in validation])
+
+def booster_params(nthread: int = None) -> dict:
+    """
+    MODEL_PARAMS in the form `xgb.train` takes, growing trees with "hist" on `nthread` cores (default: all).
+    """
+    return {
+        "objective": MODEL_PARAMS["objective"],
+        "eval_metric": MODEL_PARAMS["eval_metric"],
+        "learning_rate": MODEL_PARAMS["learning_rate"],
+        "max_depth": MODEL_PARAMS["max_depth"],
+        "seed": MODEL_PARAMS["random_state"],
+        "tree_method": "hist",
+        "nthread": nthread or os.cpu_count() or 1,
+    }
+
+def train_from_shards(data_dir: str, validation_fraction: float = VALIDATION_FRACTION, chunk_rows: int = CHUNK_ROWS,
+                      nthread: int = None, seed: int = SEED, model_path: str = MODEL_PATH,
+                      compiled_model_path: str = COMPILED_MODEL_PATH, publish: bool = True) -> dict:
+    """
+    Trains the model on sharded data without loading it into memory, then saves and publishes it.
+
+    Args:
+        data_dir (str): Directory written by `generate_shards`.
+        validation_fraction (float): Share of the shards kept for validation (at least one).
+        chunk_rows (int): Rows handed to XGBoost at a time.
+        nthread (int): Cores to train on. Defaults to all of them.
+        seed (int): Seed for choosing the validation shards.
+        model_path, compiled_model_path (str): Where to save the booster.
+        publish (bool): Whether to publish the model to the registry and activate it.
+
+    Returns:
+        dict: Row counts, validation metrics, wall-clock seconds, this process's
+        peak RSS in MB and the registry version.
+    """
+    start_time = time.perf_counter()
+    train_shards, validation_shards = split_shards(read_manifest(data_dir)["shards"], validation_fraction, seed)
+    train_rows = sum(shard["rows"] for shard in train_shards)
+    validation_rows = sum(shard["rows"] for shard in validation_shards)
+    print(f"Training on {train_rows:,} rows from {len(train_shards)} shards; "
+          f"validating on {validation_rows:,} rows from {len(validation_shards)} shards.")
+
+    with tempfile.TemporaryDirectory(prefix="chimera-xgb-cache-") as cache_dir:
+        train_iterator = ShardIterator(data_dir, train_shards, chunk_rows, os.path.join(cache_dir, "train"))
+        validation_iterator = ShardIterator(data_dir, validation_shards, chunk_rows,
+                                            os.path.join(cache_dir, "validation"))
+        dtrain = xgb.ExtMemQuantileDMatrix(train_iterator, nthread=nthread)
+        dvalidation = xgb.ExtMemQuantileDMatrix(validation_iterator, ref=dtrain, nthread=nthread)
+
+        print("\nTraining XGBoost model out of core...")
+        evals_result = {}
+        booster = xgb.train(booster_params(nthread), dtrain, num_boost_round=MODEL_PARAMS["n_estimators"],
+                            evals=[(dvalidation, "validation")], evals_result=evals_result, verbose_eval=25)
+        del dtrain, dvalidation
+    print("Model training complete.")
+
+    # Accuracy on the validation shards, one chunk at a time.
+    correct = 0
+    for read_batch in validation_iterator.batches:
+        features, labels = read_batch()
+        correct += int(((booster.inplace_predict(features) > 0.5) == labels.astype(bool)).sum())
+    accuracy = correct / validation_rows
+    print(f"Validation Accuracy: {accuracy * 100:.2f}%")
+
+    summary = {
+        "train_rows": train_rows,
+        "validation_rows": validation_rows,
+        "validation_accuracy": round(accuracy, 4),
+        "validation_logloss": round(evals_result["validation"][MODEL_PARAMS["eval_metric"]][-1], 4),
+        "seconds": round(time.perf_counter() - start_time, 2),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    summary["version"] = save_model(booster, {key: summary[key] for key in
+                                              ("train_rows", "validation_accuracy", "validation_logloss")},
+                                    model_path, compiled_model_path, publish)
+    print(f"Trained in {summary['seconds']} s, peak RSS {summary['peak_rss_mb']} MB.")
+    return summary
+
+def peak_rss_mb():
+    """
+    Peak resident memory of this process so far, in MB, or None where it cannot be measured (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+# --- 4. HYPERPARAMETER SEARCH ---
+# MODEL_PARAMS were picked by hand. tune_model runs a random search over the
+# learning rate and tree depth instead:
+#
+#     python app/ml/train.py tune --rows 1000000 --trials 40 --threads-per-trial 2
+#
+# Trials run in a pool of worker processes, each limited to
+# --threads-per-trial cores, so the pool uses every core without
+# oversubscribing them. Each trial boosts until the validation logloss has not
+# improved for EARLY_STOPPING_ROUNDS rounds, which also picks n_estimators.
+# The data is binned once per worker: the worker builds a QuantileDMatrix when
+# it starts and reuses it for every trial it runs. The arrays reach the
+# workers as memory-mapped .npy files. The first trial always uses
+# MODEL_PARAMS, so the leaderboard shows what tuning gained. The best model is
+# saved and published like a normal training run. The leaderboard is written
+# to LEADERBOARD_PATH, with each trial's parameters, rounds, validation
+# metrics and time.
+
+LEADERBOARD_PATH = os.path.join(MODEL_DIR, "leaderboard.json")
+EARLY_STOPPING_ROUNDS = 20
+MAX_ROUNDS = 1000
+# The search space: learning rates are drawn log-uniformly.
+LEARNING_RATE_RANGE = (0.01, 0.3)
+MAX_DEPTH_RANGE = (2, 8)
+
+# Each worker's binned data: (training matrix, validation matrix, validation labels).
+_trial_data = None
+
+def sample_trials(num_trials: int, seed: int = SEED) -> list[dict]:
+    """
+    Random parameter sets from the search space, starting with MODEL_PARAMS.
+    """
+    rng = np.random.default_rng(seed)
+    trials = [{"learning_rate": MODEL_PARAMS["learning_rate"], "max_depth": MODEL_PARAMS["max_depth"]}]
+    low, high = np.log10(LEARNING_RATE_RANGE[0]), np.log10(LEARNING_RATE_RANGE[1])
+    while len(trials) < num_trials:
+        trials.append({"learning_rate": round(float(10 ** rng.uniform(low, high)), 4),
+                       "max_depth": int(rng.integers(MAX_DEPTH_RANGE[0], MAX_DEPTH_RANGE[1] + 1))})
+    return trials[:num_trials]
+
+def tune_model(num_rows: int = 200_000, num_trials: int = 20, threads_per_trial: int = 1, workers: int = None,
+               data_dir: str = None, seed: int = SEED, leaderboard_path: str = LEADERBOARD_PATH,
+               model_path: str = MODEL_PATH, compiled_model_path: str = COMPILED_MODEL_PATH,
+               publish: bool = True) -> list[dict]:
+    """
+    Runs a random search with early stopping, then saves and publishes the best model.
+
+    Args:
+        num_rows (int): Rows of mock data to tune on, unless `data_dir` is given.
+        num_trials (int): Parameter sets to try.
+        threads_per_trial (int): Cores each trial trains on.
+        workers (int): Trials run at once. Defaults to the cores divided by `threads_per_trial`,
+            and is never more than `num_trials`.
+        data_dir (str): Tune on the shards in this directory (loaded into memory) instead.
+        seed (int): Seed for the data split and the parameter sets.
+        leaderboard_path (str): Where to write the leaderboard as JSON.
+        model_path, compiled_model_path (str): Where to save the best booster.
+        publish (bool): Whether to publish the best model to the registry and activate it.
+
+    Returns:
+        list[dict]: The leaderboard, best trial first.
+    """
+    start_time = time.perf_counter()
+    # Each worker bins the data on start, so never start more than there are trials.
+    workers = min(workers or max(1, (os.cpu_count() or 1) // threads_per_trial), num_trials)
+
+    df = load_shards(data_dir) if data_dir else generate_mock_data(num_rows, seed)
+    data, labels = df[FEATURES].to_numpy(np.float32), df[TARGET].to_numpy(np.float32)
+    X_train, X_validation, y_train, y_validation = train_test_split(
+        data, labels, test_size=0.2, random_state=seed, stratify=labels
+    )
+
+    trials = sample_trials(num_trials, seed)
+    print(f"\nTuning on {len(y_train):,} rows: {num_trials} trials, {workers} at a time, "
+          f"{threads_per_trial} core(s) each...")
+    results = []
+
+    def report(result: dict):
+        results.append(result)
+        print(f"Trial {result['trial']:>3}: learning_rate {result['learning_rate']:<7} "
+              f"max_depth {result['max_depth']}  rounds {result['rounds']:>4}  "
+              f"logloss {result['validation_logloss']:.4f}  accuracy {result['validation_accuracy']:.4f}  "
+              f"({result['seconds']:.1f} s)")
+
+    with tempfile.TemporaryDirectory(prefix="chimera-tune-") as tmp:
+        arrays = {"X_train": X_train, "y_train": y_train, "X_validation": X_validation, "y_validation": y_validation}
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, name + ".npy"), np.ascontiguousarray(array, dtype=np.float32))
+        jobs = [(index, trial) for index, trial in enumerate(trials)]
+
+        if workers <= 1:
+            _start_trial_worker(tmp, threads_per_trial)
+            for job in jobs:
+                report(_run_trial(*job))
+        else:
+            # "spawn" keeps XGBoost's OpenMP runtime out of forked children.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_start_trial_worker, initargs=(tmp, threads_per_trial)) as pool:
+                futures = [pool.submit(_run_trial, *job) for job in jobs]
+                for future in as_completed(futures):
+                    report(future.result())
+
+    leaderboard = sorted(results, key=lambda result: result["validation_logloss"])
+    best = leaderboard[0]
+    booster = xgb.Booster(model_file=bytearray(best.pop("model")))
+    for result in leaderboard[1:]:
+        del result["model"]
+
+    with open(leaderboard_path, "w") as f:
+        json.dump(leaderboard, f, indent=2)
+    print(f"\nTuned in {time.perf_counter() - start_time:.1f} s. Leaderboard written to {leaderboard_path}")
+    print(f"Best: trial {best['trial']}, learning_rate {best['learning_rate']}, max_depth {best['max_depth']}, "
+          f"{best['rounds']} rounds, logloss {best['validation_logloss']:.4f}")
+
+    metadata = {key: best[key] for key in
+                ("learning_rate", "max_depth", "rounds", "validation_logloss", "validation_accuracy")}
+    best["version"] = save_model(booster, metadata, model_path, compiled_model_path, publish)
+    return leaderboard
+
+def _start_trial_worker(data_dir: str, nthread: int):
+    # Bins the training data once; every trial run by this worker reuses it.
+    global _trial_data
+    arrays = {name: np.load(os.path.join(data_dir, name + ".npy"), mmap_mode="r")
+              for name in ("X_train", "y_train", "X_validation", "y_validation")}
+    dtrain = xgb.QuantileDMatrix(arrays["X_train"], arrays["y_train"], feature_names=FEATURES, nthread=nthread)
+    dvalidation = xgb.QuantileDMatrix(arrays["X_validation"], arrays["y_validation"], ref=dtrain,
+                                      feature_names=FEATURES, nthread=nthread)
+    _trial_data = (dtrain, dvalidation, np.asarray(arrays["y_validation"]), nthread)
+
+def _run_trial(index: int, trial: dict) -> dict:
+    dtrain, dvalidation, y_validation, nthread = _trial_data
+    start_time = time.perf_counter()
+    params = {**booster_params(nthread), **trial}
+    booster = xgb.train(params, dtrain, num_boost_round=MAX_ROUNDS, evals=[(dvalidation, "validation")],
+                        early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False)
+
+    # Keep only the trees up to the best round.
+    rounds, logloss = booster.best_iteration + 1, booster.best_score
+    booster = booster[:rounds]
+    record_training_params(booster)  # the config does not survive save_raw
+    predictions = booster.predict(dvalidation)
+    return {
+        "trial": index,
+        **trial,
+        "rounds": rounds,
+        "validation_logloss": round(float(logloss), 6),
+        "validation_accuracy": round(float(((predictions > 0.5) == y_validation.astype(bool)).mean()), 4),
+        "seconds": round(time.perf_counter() - start_time, 2),
+        "model": bytes(booster.save_raw(raw_format="ubj")),
+    }
+
+
+# --- 5. INCREMENTAL TRAINING ---
+# As real outcomes arrive, update_model updates the current model with them
+# instead of retraining from scratch:
+#   "continue" - boosts `rounds` more trees on the new rows, on top of the
+#                existing ones (xgb.train's xgb_model continuation).
+#   "refresh"  - keeps every tree's structure and recomputes its leaf values
+#                from the new rows (XGBoost's "refresh" updater). The model
+#                does not grow.
+# The current model is the registry's active version, or predictor.bst if
+# nothing has been published. A fifth of the new rows is held out to compare
+# the model before and after the update. The result is saved and published
+# as a new version whose metadata names the version it was built from.
+#
+#     python app/ml/train.py update --rows 100000 --seed 7
+#     python app/ml/train.py update --data new_outcomes/ --mode refresh
+#     python app/ml/train.py update --feedback logs/   # the API's prediction log
+#
+# Run `python benchmarks/incremental_training.py` to compare the cost and
+# quality of both modes with a full retrain.
+
+UPDATE_MODES = ("continue", "refresh")
+UPDATE_ROUNDS = 20
+
+def update_model(new_data: pd.DataFrame, mode: str = "continue", rounds: int = UPDATE_ROUNDS,
+                 base_model_path: str = None, nthread: int = None, seed: int = SEED, model_path: str = MODEL_PATH,
+                 compiled_model_path: str = COMPILED_MODEL_PATH, publish: bool = True) -> dict:
+    """
+    Updates the current model with newly labelled rows and publishes the result as a new version.
+
+    Args:
+        new_data (pd.DataFrame): The FEATURES and TARGET columns of the new rows.
+        mode (str): "continue" to add trees, or "refresh" to recompute the leaf values of the existing ones.
+        rounds (int): Trees to add in "continue" mode.
+        base_model_path (str): The booster to update. Defaults to the registry's
+            active version, or predictor.bst if there is none.
+        nthread (int): Cores to train on. Defaults to all of them.
+        seed (int): Seed for choosing the held-out rows.
+        model_path, compiled_model_path (str): Where to save the updated booster.
+        publish (bool): Whether to publish the updated model to the registry and activate it.
+
+    Returns:
+        dict: The base version, row counts, seconds spent updating, held-out
+        metrics before and after, and the new registry version.
+    """
+    if mode not in UPDATE_MODES:
+        raise ValueError(f"Unknown update mode: {mode!r} (expected one of {UPDATE_MODES})")
+    from app.registry import BOOSTER_FILE, ModelRegistry, fingerprint
+
+    if base_model_path is None:
+        registry = ModelRegistry()
+        current = registry.current()
+        base_model_path = registry.path(current, BOOSTER_FILE) if current else MODEL_PATH
+    base_version = fingerprint(base_model_path)
+    base = xgb.Booster(model_file=base_model_path)
+
+    X_update, X_holdout, y_update, y_holdout = train_test_split(
+        new_data[FEATURES].to_numpy(np.float32), new_data[TARGET].to_numpy(np.float32),
+        test_size=0.2, random_state=seed, stratify=new_data[TARGET]
+    )
+    before = evaluate(base, X_holdout, y_holdout)
+    print(f"Updating model {base_version} ({mode}) with {len(y_update):,} new rows...")
+
+    start_time = time.perf_counter()
+    dupdate = xgb.DMatrix(X_update, label=y_update, feature_names=FEATURES, nthread=nthread)
+    params = training_params(base, nthread)
+    if mode == "continue":
+        updated = xgb.train(params, dupdate, num_boost_round=rounds, xgb_model=base)
+    else:
+        params = {**params, "process_type": "update", "updater": "refresh", "refresh_leaf": True}
+        updated = xgb.train(params, dupdate, num_boost_round=base.num_boosted_rounds(), xgb_model=base)
+    seconds = time.perf_counter() - start_time
+    after = evaluate(updated, X_holdout, y_holdout)
+
+    print(f"Updated in {seconds:.2f} s. Held-out logloss {before['logloss']:.4f} -> {after['logloss']:.4f}, "
+          f"accuracy {before['accuracy']:.4f} -> {after['accuracy']:.4f}")
+    summary = {
+        "base_version": base_version,
+        "mode": mode,
+        "update_rows": len(y_update),
+        "holdout_rows": len(y_holdout),
+        "trees": updated.num_boosted_rounds(),
+        "seconds": round(seconds, 3),
+        "holdout_before": before,
+        "holdout_after": after,
+    }
+    metadata = {"base_version": base_version, "update_mode": mode, "update_rows": len(y_update),
+                "holdout_logloss": after["logloss"], "holdout_accuracy": after["accuracy"]}
+    summary["version"] = save_model(updated, metadata, model_path, compiled_model_path, publish)
+    return summary
+
+def evaluate(booster: xgb.Booster, X: np.ndarray, y: np.ndarray) -> dict:
+    """
+    Logloss and accuracy of a booster on labelled rows.
+    """
+    predictions = booster.inplace_predict(X)
+    return {
+        "logloss": round(float(log_loss(y, predictions, labels=[0, 1])), 6),
+        "accuracy": round(float(accuracy_score(y, predictions > 0.5)), 4),
+    }
+
+def load_shards(data_dir: str) -> pd.DataFrame:
+    """
+    Reads every shard written by `generate_shards` into one DataFrame.
+    """
+    batches = [read_batch() for shard in read_manifest(data_dir)["shards"]
+               for read_batch in _shard_batches(os.path.join(data_dir, shard["file"]), shard["rows"], shard["rows"])]
+    df = pd.DataFrame(np.concatenate([features for features, _ in batches]), columns=FEATURES)
+    df[TARGET] = np.concatenate([labels for _, labels in batches]).astype(int)
+    return df
+
+def load_feedback(log_dir: str) -> pd.DataFrame:
+    """
+    Joins the predictions logged by the API with their realized outcomes (see app/prediction_log.py).
+
+    Args:
+        log_dir (str): The API's CHIMERA_PREDICTION_LOG_DIR.
+
+    Returns:
+        pd.DataFrame: One row per prediction with a known outcome: the FEATURES,
+        the outcome as TARGET, and the request_id, model_version and
+        prediction_score that were logged with it.
+    """
+    from app.prediction_log import read_log
+
+    predictions, outcomes = read_log(log_dir, "predictions"), read_log(log_dir, "outcomes")
+    if predictions is None or outcomes is None:
+        raise ValueError(f"No logged predictions with outcomes in {log_dir}")
+
+    # Callers may reuse a request id or correct an outcome; the latest record wins.
+    predictions = predictions.sort_values("timestamp").drop_duplicates("request_id", keep="last")
+    outcomes = outcomes.sort_values("timestamp").drop_duplicates("request_id", keep="last")
+    df = predictions.merge(outcomes[["request_id", "outcome"]], on="request_id")
+    df[TARGET] = df["outcome"].astype(int)
+    print(f"Joined {len(df):,} of {len(predictions):,} logged predictions with their outcomes.")
+    return df[FEATURES + [TARGET, "request_id", "model_version", "prediction_score"]].reset_index(drop=True)
 
 
 if __name__ == "__main__":
+    # Allow `python app/ml/train.py` from the project root to import app.registry.
+    sys.path.insert(0, os.path.abspath(os.path.join(MODEL_DIR, "..", "..")))
+
+    parser = argparse.ArgumentParser(description="Train the fundraise prediction model, or generate mock data.")
+    parser.add_argument("--data", help="Train out of core on the shards in this directory (see 'generate').")
+    parser.add_argument("--threads", type=int, help="Cores to train on with --data (default: all).")
+    commands = parser.add_subparsers(dest="command")
+    generate_parser = commands.add_parser("generate", help="Write sharded mock data for stress tests.")
+    generate_parser.add_argument("output_dir")
+    generate_parser.add_argument("--rows", type=int, required=True, help="Total rows to generate.")
+    generate_parser.add_argument("--shard-rows", type=int, default=SHARD_ROWS, help="Rows per shard file.")
+    generate_parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS,
+                                 help="Rows held in memory at a time by each worker.")
+    generate_parser.add_argument("--seed", type=int, default=SEED)
+    generate_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                                 help="Worker processes (default: one per CPU).")
+    generate_parser.add_argument("--format", choices=["npy", "parquet"], default="npy")
+    tune_parser = commands.add_parser("tune", help="Search for better model parameters and keep the best model.")
+    tune_parser.add_argument("--rows", type=int, default=200_000, help="Rows of mock data to tune on.")
+    tune_parser.add_argument("--data", help="Tune on these shards instead (loaded into memory).")
+    tune_parser.add_argument("--trials", type=int, default=20, help="Parameter sets to try.")
+    tune_parser.add_argument("--threads-per-trial", type=int, default=1, help="Cores per trial.")
+    tune_parser.add_argument("--workers", type=int, help="Trials at once (default: cores / threads per trial).")
+    tune_parser.add_argument("--seed", type=int, default=SEED)
+    tune_parser.add_argument("--leaderboard", default=LEADERBOARD_PATH, help="Where to write the leaderboard.")
+    update_parser = commands.add_parser("update", help="Update the current model with new labelled rows.")
+    update_source = update_parser.add_mutually_exclusive_group(required=True)
+    update_source.add_argument("--data", help="Directory of shards holding the new rows.")
+    update_source.add_argument("--feedback", help="The API's prediction log directory: use logged predictions "
+                                                  "joined with their outcomes.")
+    update_source.add_argument("--rows", type=int, help="Use this many rows of fresh mock data instead.")
+    update_parser.add_argument("--mode", choices=UPDATE_MODES, default="continue")
+    update_parser.add_argument("--rounds", type=int, default=UPDATE_ROUNDS, help="Trees to add in continue mode.")
+    update_parser.add_argument("--seed", type=int, default=SEED + 1, help="Seed for the mock rows and the holdout.")
+    args = parser.parse_args()
+
     # This block ensures the training process runs only when the script is executed directly.
-    train_model()
+    if args.command == "generate":
+        generate_shards(args.output_dir, args.rows, args.shard_rows, args.chunk_rows, args.seed, args.workers,
+                        args.format)
+    elif args.command == "tune":
+        tune_model(args.rows, args.trials, args.threads_per_trial, args.workers, args.data, args.seed,
+                   args.leaderboard)
+    elif args.command == "update":
+        if args.feedback:
+            new_data = load_feedback(args.feedback)
+        else:
+            new_data = load_shards(args.data) if args.data else generate_mock_data(args.rows, args.seed)
+        update_model(new_data, args.mode, args.rounds, seed=args.seed)
+    elif args.data:
+        train_from_shards(args.data, nthread=args.threads)
+    else:
+        train_model()
@@ -1,67 +1,617 @@
-import xgboost as xgb
-import pandas as pd
-import shap
+import numpy as np
 import os
+import threading
+import time
+from typing import Callable, NamedTuple
+
+from app.cache import PredictionCache
+from app.compiled_model import CompiledModel
+from app.metrics import EXPLAIN_STAGE, FEATURE_MATRIX_STAGE, KEY_DRIVERS_STAGE, PREDICT_STAGE
+from app.registry import BOOSTER_FILE, COMPILED_MODEL_FILE, GRID_FILE, ModelRegistry, fingerprint, watch
+
+
+# --- EXACT SHAP VALUES FROM PRECOMPUTED COALITION TABLES ---
+# With only three features there are just 2^3 = 8 coalitions (subsets of
+# features). Every leaf of every tree covers a box of the input space, and the
+# TreeSHAP value of a coalition S is a sum over leaves of
+#
+#     leaf value * (share of training cover reaching the leaf through splits on
+#                   features outside S) * (1 if x is inside the leaf's box on
+#                   every feature in S, else 0)
+#
+# The first two factors do not depend on the input, so they are computed once
+# when the model is loaded. Explaining a batch is then one box test per leaf
+# and one small matrix product per coalition.
+
+class CoalitionExplainer:
+    """
+    Exact TreeSHAP explainer built from precomputed per-leaf coalition tables.
+
+    A drop-in replacement for `shap.TreeExplainer(booster)` with the same
+    `shap_values(X)` and `expected_value`, returning the same numbers to within
+    floating-point tolerance.
+
+    Args:
+        compiled (CompiledModel): The flattened tree ensemble to explain.
+        chunk_size (int): Rows explained per matrix product; bounds memory for big batches.
+    """
+
+    def __init__(self, compiled: CompiledModel, chunk_size: int = 256):
+        self.chunk_size = chunk_size
+        num_features = len(compiled.feature_names)
+
+        # --- 1. DESCRIBE EVERY LEAF ---
+        # lower/upper: the box [lower, upper) of inputs that reach the leaf.
+        # cover_share: per feature, the product of the cover fractions of the
+        #   splits on that feature along the path to the leaf.
+        # nan_reaches: per feature, whether a missing value still reaches the
+        #   leaf (every split on that feature sends missing values this way).
+        lower, upper, cover_share, nan_reaches, leaf_values = [], [], [], [], []
+        for root in compiled.roots:
+            stack = [(root, np.full(num_features, -np.inf), np.full(num_features, np.inf),
+                      np.ones(num_features), np.ones(num_features, dtype=bool))]
+            while stack:
+                node, lo, hi, share, nan_ok = stack.pop()
+                if compiled.is_leaf[node]:
+                    lower.append(lo)
+                    upper.append(hi)
+                    cover_share.append(share)
+                    nan_reaches.append(nan_ok)
+                    leaf_values.append(compiled.value[node])
+                    continue
+
+                f = compiled.split_feature[node]
+                threshold = compiled.threshold[node]
+                for child, fraction, is_left in ((compiled.left[node], compiled.left_fraction[node], True),
+                                                 (compiled.right[node], compiled.right_fraction[node], False)):
+                    child_lo, child_hi, child_share, child_nan = lo.copy(), hi.copy(), share.copy(), nan_ok.copy()
+                    if is_left:
+                        child_hi[f] = min(child_hi[f], threshold)
+                    else:
+                        child_lo[f] = max(child_lo[f], threshold)
+                    child_share[f] *= fraction
+                    child_nan[f] &= compiled.default_left[node] == is_left
+                    stack.append((child, child_lo, child_hi, child_share, child_nan))
+
+        self.lower = np.array(lower, dtype=np.float32)
+        self.upper = np.array(upper, dtype=np.float32)
+        self.nan_reaches = np.array(nan_reaches)
+        cover_share = np.array(cover_share)
+        leaf_values = np.array(leaf_values, dtype=np.float64)
+
+        # --- 2. BUILD THE COALITION TABLES ---
+        # v(S) for a leaf is its value times the cover share of every feature
+        # outside S (features inside S are decided by the box test instead).
+        # The Shapley value of feature i is
+        #     sum over S without i of  w(|S|) * (v(S + i) - v(S))
+        # so each coalition S contributes its v(S) with weight +w(|S| - 1) to
+        # every feature in S and -w(|S|) to every feature outside S. Folding
+        # those weights in gives one (leaves x features) table per coalition.
+        factorial = np.cumprod([1.0] + list(range(1, num_features + 1)))
+        weight = [factorial[s] * factorial[num_features - s - 1] / factorial[num_features]
+                  for s in range(num_features)]
+
+        tables = []
+        for mask in range(2 ** num_features):
+            members = np.array([(mask >> f) & 1 == 1 for f in range(num_features)])
+            size = int(members.sum())
+            coalition_value = leaf_values * np.prod(np.where(members, 1.0, cover_share), axis=1)
+            signs = np.array([weight[size - 1] if members[f] else -weight[size] if size < num_features else 0.0
+                              for f in range(num_features)])
+            tables.append(np.outer(coalition_value, signs))
+            if mask == 0:
+                # The value of the empty coalition is the average model output.
+                self.expected_value = compiled.base_margin + float(coalition_value.sum())
+
+        # Every input is "inside" the empty coalition, so its contribution is
+        # the same for every row. The other tables are stacked so a whole batch
+        # is explained with a single matrix product. float32 keeps that product
+        # fast and stays within about 1e-6 of shap.TreeExplainer.
+        self.num_features = num_features
+        self.constant = tables[0].sum(axis=0)
+        self.stacked_tables = np.concatenate(tables[1:]).astype(np.float32)
+
+    def shap_values(self, X) -> np.ndarray:
+        """
+        Returns one row of SHAP values (in margin space) per row of X.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        result = np.empty(X.shape, dtype=np.float64)
+        for start in range(0, len(X), self.chunk_size):
+            chunk = X[start:start + self.chunk_size]
+
+            # inside[f][row, leaf]: does the row fall in the leaf's box on feature f?
+            inside = []
+            for f in range(self.num_features):
+                x = chunk[:, f, None]
+                box = (x >= self.lower[:, f]) & (x < self.upper[:, f])
+                inside.append(np.where(np.isnan(x), self.nan_reaches[:, f], box) if np.isnan(x).any() else box)
+
+            # A row is inside a leaf for coalition S if it is inside on every
+            # feature in S. Each mask reuses the mask without its lowest feature.
+            in_coalition = [None] * (2 ** self.num_features)
+            for mask in range(1, 2 ** self.num_features):
+                lowest = (mask & -mask).bit_length() - 1
+                rest = mask & (mask - 1)
+                in_coalition[mask] = inside[lowest] if rest == 0 else in_coalition[rest] & inside[lowest]
+
+            indicators = np.concatenate(in_coalition[1:], axis=1).astype(np.float32)
+            result[start:start + self.chunk_size] = self.constant + indicators @ self.stacked_tables
+        return result
+
 
 # --- 1. LOAD THE MODEL AND EXPLAINER ON STARTUP ---
+# Loading is lazy: importing this module is cheap and pulls in neither XGBoost
+# nor the model file. The API calls `load_model()` from its startup stage (in
+# the background, so the server accepts connections straight away), and any
+# prediction made before that loads the model on first use. `model`,
+# `explainer`, `score_matrix` and `MODEL_VERSION` become available once loaded.
+#
+# The loaded model, its explainer and its version live together in one
+# immutable LoadedModel. `reload_model()` builds a new one next to the old and
+# swaps it in with a single assignment. Each prediction reads the current
+# LoadedModel once and uses it throughout, so requests already in flight finish
+# on the version they started with.
 
 # Define the path to the model file.
 # This makes the code robust to where you run it from.
 MODEL_DIR = os.path.join(os.path.dirname(__file__), "ml")
 MODEL_PATH = os.path.join(MODEL_DIR, "predictor.bst")
+# The same model in XGBoost's JSON format, used by the compiled engine.
+COMPILED_MODEL_PATH = os.path.join(MODEL_DIR, "predictor.json")
+# A dense grid of precomputed predictions, used by the grid engine.
+# Build it with `python app/ml/build_grid.py`.
+GRID_PATH = os.path.join(MODEL_DIR, "predictor_grid.npy")
+
+# Which implementation scores and explains requests:
+#   "xgboost"  - the XGBoost booster (the reference).
+#   "compiled" - app/compiled_model.py, which only needs NumPy. XGBoost is never
+#                imported, so the server starts faster and uses less memory.
+#   "grid"     - app/grid_model.py, which looks answers up in the precomputed
+#                grid and interpolates between grid points.
+ENGINE = os.environ.get("CHIMERA_ENGINE", "xgboost")
+
+# Once a version has been activated in the model registry (app/registry.py),
+# the server loads that version instead of the files above.
+registry = ModelRegistry()
+
+# How long each startup phase took, in seconds, in the order they ran.
+STARTUP_PHASES = {}
+
+
+class LoadedModel(NamedTuple):
+    version: str
+    model: object
+    explainer: object
+    score_matrix: Callable
+
+    def score(self, input_rows: list[dict]) -> np.ndarray:
+        """
+        Scores input dictionaries with this model, without explaining or caching.
+        """
+        return self.score_matrix(_feature_matrix(input_rows))
+
+
+_LAZY_ATTRIBUTES = ("model", "explainer", "score_matrix", "MODEL_VERSION")
+# Held while a model is built and swapped in, by both the first load and
+# reloads, so a slow startup load can never overwrite a newer reload.
+_load_lock = threading.Lock()
+_watcher_lock = threading.Lock()
+_current = None
+_load_error = None
+_watcher = None
+
+
+def load_model():
+    """
+    Loads the model and builds the explainer for the configured ENGINE.
+
+    Safe to call from several threads; only the first call does any work.
+    Each phase is timed and recorded in STARTUP_PHASES.
+    """
+    global _current, _load_error
+
+    with _load_lock:
+        if _current is not None:
+            return
+
+        phases = {}
+        try:
+            loaded = _build(registry.current(), phases)
+        except Exception as e:
+            _load_error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            STARTUP_PHASES.update(phases)
+
+        _current = loaded
+        _load_error = None
+
+
+def reload_model(version: str = None) -> dict:
+    """
+    Loads a model version and swaps it in without interrupting predictions.
+
+    The new model is built and warmed up while the old one keeps serving. If
+    anything fails, the old model stays in place and the error is raised.
+
+    Args:
+        version (str): A registry version. Defaults to the registry's active
+            version, or the model files in app/ml if there is none.
+
+    Returns:
+        dict: The previous and new versions and how long the load took.
+    """
+    global _current
+
+    with _load_lock:
+        if version is None:
+            version = registry.current()
+        start = time.perf_counter()
+        loaded = _build(version, {})
+        previous = _current
+
+        _current = loaded
+        # Cache keys include the version, so old entries could never be
+        # returned; clearing them just frees the memory straight away.
+        if prediction_cache is not None and previous is not None and previous.version != loaded.version:
+            prediction_cache.clear()
+
+    print(f"Now serving model version {loaded.version}.")
+    return {
+        "previous_version": previous.version if previous else None,
+        "model_version": loaded.version,
+        "load_seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def load_version(version: str = None) -> LoadedModel:
+    """
+    Loads a model version without serving it, e.g. to compare it with the live one.
+    """
+    return _build(version, {})
+
+
+def start_watching(interval: float):
+    """
+    Reloads the model whenever the registry's active version changes.
+
+    Checks every `interval` seconds in a background thread. Calling it again does nothing.
+    """
+    global _watcher
+
+    def on_change(version):
+        if _current is None or _current.version != version:
+            reload_model(version)
+
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = watch(registry, on_change, interval)
+
+
+def _build(version, phases: dict) -> LoadedModel:
+    """
+    Loads one model version for the configured ENGINE, timing each phase into `phases`.
+    """
+    def timed(phase, fn):
+        start = time.perf_counter()
+        value = fn()
+        phases[phase] = round(time.perf_counter() - start, 4)
+        return value
+
+    if version is not None:
+        if not registry.exists(version):
+            raise KeyError(f"Unknown model version: {version!r}")
+        model_path = registry.path(version, BOOSTER_FILE)
+        compiled_model_path = registry.path(version, COMPILED_MODEL_FILE)
+        grid_path = registry.path(version, GRID_FILE)
+    else:
+        model_path, compiled_model_path, grid_path = MODEL_PATH, COMPILED_MODEL_PATH, GRID_PATH
+
+    if ENGINE == "compiled":
+        print(f"Loading compiled model from: {compiled_model_path}")
+        loaded_model = timed("load_model", lambda: CompiledModel.from_json(compiled_model_path))
+        print("Compiled model loaded successfully.")
+        loaded_score = loaded_model.predict
+
+        # Create a SHAP explainer object.
+        # This is used to understand the "why" behind each prediction.
+        # Like the model, it's built once for efficiency: all the per-tree
+        # work is done here, so explaining a request is just a few array operations.
+        loaded_explainer = timed("build_explainer", lambda: CoalitionExplainer(loaded_model))
+
+    elif ENGINE == "xgboost":
+        xgb = timed("import_xgboost", lambda: __import__("xgboost"))
+
+        # Load the XGBoost model from the file.
+        # This is done once when the application starts, making predictions faster.
+        print(f"Loading model from: {model_path}")
+
+        def load_booster():
+            booster = xgb.Booster()
+            booster.load_model(model_path)
+            return booster
+
+        loaded_model = timed("load_model", load_booster)
+        print("Model loaded successfully.")
+
+        # `inplace_predict` scores a NumPy array directly, without building a DMatrix.
+        loaded_score = loaded_model.inplace_predict
+
+        # The explainer works on the flattened trees (see the compiled engine above).
+        loaded_explainer = timed("build_explainer",
+                                 lambda: CoalitionExplainer(CompiledModel.from_booster(loaded_model)))
+
+    elif ENGINE == "grid":
+        from app.grid_model import GridModel
+
+        print(f"Loading lookup grid from: {grid_path}")
+        loaded_model = timed("load_model", lambda: GridModel.load(grid_path))
+        print(f"Lookup grid loaded (max interpolation error {loaded_model.max_interpolation_error:.4f}).")
 
-# Load the XGBoost model from the file.
-# This is done once when the application starts, making predictions faster.
-print(f"Loading model from: {MODEL_PATH}")
-model = xgb.Booster()
-model.load_model(MODEL_PATH)
-print("Model loaded successfully.")
+        # The grid stores SHAP values next to the scores, so it is its own explainer.
+        loaded_score = loaded_model.predict
+        loaded_explainer = loaded_model
 
-# Create a SHAP explainer object.
-# This is used to understand the "why" behind each prediction.
-# Like the model, it's loaded once for efficiency.
-explainer = shap.TreeExplainer(model)
-print("SHAP explainer created.")
+    else:
+        raise ValueError(f"Unknown CHIMERA_ENGINE: {ENGINE!r} (expected 'xgboost', 'compiled' or 'grid')")
+
+    print("SHAP explainer created.")
+
+    # Registry versions are named by fingerprint already. For the plain model
+    # files, use the same fingerprint of the booster file, whichever engine
+    # serves it, so responses, cache keys, shadow comparisons and the
+    # prediction log agree on the version. The grid records the fingerprint of
+    # the booster it was built from. Cached predictions are keyed on the
+    # version, so a different model never sees another model's cached results.
+    if version is None:
+        if ENGINE == "grid":
+            version = loaded_model.metadata["source_model_version"]
+        else:
+            version = timed("fingerprint", lambda: fingerprint(model_path))
+
+    # Score and explain one row so the first real request does not pay
+    # for any one-off initialisation inside the model libraries.
+    warmup_row = np.full((1, len(feature_names)), 5.0, dtype=np.float32)
+    timed("warmup", lambda: (loaded_score(warmup_row), loaded_explainer.shap_values(warmup_row)))
+
+    return LoadedModel(version, loaded_model, loaded_explainer, loaded_score)
+
+
+def is_loaded() -> bool:
+    return _current is not None
+
+
+def load_status() -> dict:
+    """
+    Describes the loading state, for the readiness endpoint.
+    """
+    loaded = _current
+    status = "ready" if loaded else "failed" if _load_error else "loading"
+    return {
+        "status": status,
+        "engine": ENGINE,
+        "model_version": loaded.version if loaded else None,
+        "startup_phases": dict(STARTUP_PHASES),
+        "startup_seconds": round(sum(STARTUP_PHASES.values()), 4),
+        "error": _load_error,
+    }
+
+
+def current_model() -> LoadedModel:
+    """
+    Returns the model currently being served, loading it first if needed.
+    """
+    loaded = _current
+    if loaded is None:
+        load_model()
+        loaded = _current
+    return loaded
+
+
+def __getattr__(name):
+    # Reading app.model.model (or explainer, ...) returns the part of the
+    # model currently being served, loading it first if needed, so
+    # `from app.model import model` keeps working.
+    if name in _LAZY_ATTRIBUTES:
+        loaded = current_model()
+        return loaded.version if name == "MODEL_VERSION" else getattr(loaded, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Define the feature names in the exact order the model was trained on.
 # This is CRITICAL for both prediction and explanation.
 feature_names = ["pitch_strength_score", "identity_model_score", "momentum_tracker_score"]
 
+# Remember predictions for inputs on the 0.1 grid the upstream agents use.
+# CHIMERA_CACHE_SIZE=0 turns the cache off.
+CACHE_SIZE = int(os.environ.get("CHIMERA_CACHE_SIZE", "100000"))
+prediction_cache = PredictionCache(
+    max_entries=CACHE_SIZE,
+    ttl_seconds=float(os.environ.get("CHIMERA_CACHE_TTL_SECONDS", "0")),
+    step=float(os.environ.get("CHIMERA_CACHE_STEP", "0.1"))
+) if CACHE_SIZE > 0 else None
 
-def predict_and_explain(input_data: dict) -> dict:
+
+def predict_and_explain(input_data: dict, explain: bool = True) -> dict:
     """
     Takes a dictionary of input scores, makes a prediction, and explains it.
 
     Args:
         input_data (dict): A dictionary with keys matching the feature_names.
+        explain (bool): Set to False to skip the SHAP explanation; `key_drivers`
+            is then an empty list.
 
     Returns:
         dict: A dictionary containing the prediction, label, and key drivers.
     """
+    # The whole request uses this one model, even if a new version is swapped in meanwhile.
+    loaded = current_model()
+
+    # --- 0. CHECK THE CACHE ---
+    # Inputs on the grid that we have already scored are answered from memory.
+    cache_key = _cache_key(loaded, input_data)
+    if prediction_cache is not None:
+        cached = prediction_cache.get(cache_key, need_drivers=explain)
+        if cached is not None:
+            score, key_drivers = cached
+            return _format_result(score, list(key_drivers) if explain else [], loaded.version)
+
     # --- 1. PREPARE THE INPUT ---
-    # Convert the input dictionary to a pandas DataFrame.
-    # The model expects a 2D array, so we wrap it in a list.
-    # Ensure the columns are in the same order as during training.
-    input_df = pd.DataFrame([input_data])[feature_names]
+    # Build a 1x3 float32 NumPy row straight from the input dictionary, with the
+    # features in the same order as during training. This skips the pandas
+    # DataFrame and XGBoost DMatrix we used to build for every request.
+    # Each stage is timed for the /metrics endpoint.
+    started = time.perf_counter()
+    input_matrix = _feature_matrix([input_data])
+    matrix_built = time.perf_counter()
+    FEATURE_MATRIX_STAGE.observe(matrix_built - started)
 
     # --- 2. MAKE PREDICTION ---
-    # Convert the DataFrame to a DMatrix, XGBoost's internal data structure.
-    dmatrix = xgb.DMatrix(input_df)
-
-    # Use the model to predict the probability of success (funding).
+    # The NumPy array is scored directly, without a DMatrix.
     # The output is a probability score between 0 and 1.
-    prediction_score = model.predict(dmatrix)[0]
-
-    # Convert the numerical score to a human-readable label.
-    prediction_label = "Likely to Fund" if prediction_score > 0.5 else "Unlikely to Fund"
+    prediction_score = loaded.score_matrix(input_matrix)[0]
+    scored = time.perf_counter()
+    PREDICT_STAGE.observe(scored - matrix_built)
 
     # --- 3. EXPLAIN THE PREDICTION ---
     # Use the SHAP explainer to calculate Shapley values for this specific prediction.
     # Shapley values show the contribution of each feature to the final prediction.
-    shap_values = explainer.shap_values(input_df)
+    key_drivers = []
+    if explain:
+        row_shap_values = loaded.explainer.shap_values(input_matrix)[0]
+        explained = time.perf_counter()
+        EXPLAIN_STAGE.observe(explained - scored)
+        key_drivers = _key_drivers(row_shap_values)
+        KEY_DRIVERS_STAGE.observe(time.perf_counter() - explained)
+
+    if prediction_cache is not None:
+        prediction_cache.put(cache_key, float(prediction_score), key_drivers if explain else None)
+
+    # --- 4. FORMAT THE OUTPUT ---
+    # Bundle everything into a structured dictionary for the API to return.
+    return _format_result(prediction_score, key_drivers, loaded.version)
+
+
+def predict_and_explain_many(input_rows: list[dict], explain=True) -> list[dict]:
+    """
+    Vectorized version of `predict_and_explain` for a list of input scores.
+
+    The whole batch goes through a single input matrix, a single model call and a
+    single `explainer.shap_values` call, so the fixed per-call overhead is paid
+    once per batch instead of once per row.
+
+    Args:
+        input_rows (list[dict]): Dictionaries with keys matching the feature_names.
+        explain (bool or list[bool]): Whether to explain every row, or a flag per
+            row. Rows that are not explained get an empty `key_drivers` list.
+
+    Returns:
+        list[dict]: One result per input row, in the same order as the input.
+    """
+    # An empty batch needs no model work at all.
+    if not input_rows:
+        return []
+
+    loaded = current_model()
+    explain_flags = np.broadcast_to(np.asarray(explain, dtype=bool), len(input_rows))
 
+    # --- 0. CHECK THE CACHE ---
+    # Rows already in the cache are answered from memory; only the rest go
+    # through the model below.
+    results = [None] * len(input_rows)
+    cache_keys = [_cache_key(loaded, row) for row in input_rows]
+    for i, cache_key in enumerate(cache_keys):
+        if prediction_cache is not None:
+            cached = prediction_cache.get(cache_key, need_drivers=explain_flags[i])
+            if cached is not None:
+                results[i] = _format_result(cached[0], list(cached[1]) if explain_flags[i] else [], loaded.version)
+
+    todo = [i for i, result in enumerate(results) if result is None]
+    if not todo:
+        return results
+
+    # --- 1. PREPARE THE INPUT ---
+    # One float32 matrix for the rows we still need, with columns in training order.
+    started = time.perf_counter()
+    input_matrix = _feature_matrix([input_rows[i] for i in todo])
+    matrix_built = time.perf_counter()
+    FEATURE_MATRIX_STAGE.observe(matrix_built - started)
+
+    # --- 2. MAKE PREDICTIONS ---
+    prediction_scores = loaded.score_matrix(input_matrix)
+    scored = time.perf_counter()
+    PREDICT_STAGE.observe(scored - matrix_built)
+
+    # --- 3. EXPLAIN THE PREDICTIONS ---
+    # SHAP runs once, over just the rows that asked for an explanation.
+    explain_rows = np.flatnonzero(explain_flags[todo])
+    key_drivers = [None] * len(todo)
+    if len(explain_rows):
+        shap_values = loaded.explainer.shap_values(input_matrix[explain_rows])
+        explained = time.perf_counter()
+        EXPLAIN_STAGE.observe(explained - scored)
+        for j, row_shap_values in zip(explain_rows, shap_values):
+            key_drivers[j] = _key_drivers(row_shap_values)
+        KEY_DRIVERS_STAGE.observe(time.perf_counter() - explained)
+
+    # --- 4. FORMAT THE OUTPUT ---
+    # Results are returned in input order so callers can zip them with their rows.
+    for j, i in enumerate(todo):
+        if prediction_cache is not None:
+            prediction_cache.put(cache_keys[i], float(prediction_scores[j]), key_drivers[j])
+        results[i] = _format_result(prediction_scores[j], key_drivers[j] or [], loaded.version)
+
+    return results
+
+
+def predict_items(items: list[tuple[dict, bool]]) -> list[dict]:
+    """
+    Scores a micro-batch of (input_dict, explain) items with one model call.
+
+    Defined here rather than in app/main.py because the process pool pickles it
+    by reference, and workers should only import this module, not the API.
+    SHAP only runs for the items that asked for it.
+    """
+    rows, explain = zip(*items)
+    return predict_and_explain_many(list(rows), explain=list(explain))
+
+
+def explain_many(input_rows: list[dict]) -> list[list[str]]:
+    """
+    Computes only the key drivers for a list of inputs, without scoring them.
+
+    Used to fill in explanations that were deferred when the score was returned.
+    """
+    if not input_rows:
+        return []
+    shap_values = current_model().explainer.shap_values(_feature_matrix(input_rows))
+    return [_key_drivers(row_shap_values) for row_shap_values in shap_values]
+
+
+def _feature_matrix(input_rows: list[dict]) -> np.ndarray:
+    """
+    Builds a contiguous float32 matrix (one row per input, columns in feature_names order).
+
+    XGBoost works in float32 internally, so this gives exactly the same predictions
+    as the DataFrame -> DMatrix conversion. A fresh array is built per call rather
+    than reusing a buffer, because calls run concurrently in the inference pool.
+    """
+    return np.array([[row[name] for name in feature_names] for row in input_rows], dtype=np.float32)
+
+
+def _cache_key(loaded: LoadedModel, input_data: dict):
+    # None when caching is off or the input is not on the cache grid.
+    if prediction_cache is None:
+        return None
+    return prediction_cache.key(loaded.version, [input_data[name] for name in feature_names])
+
+
+def _key_drivers(row_shap_values) -> list[str]:
+    """
+    Names the two features with the largest SHAP impact on one prediction.
+    """
     # Associate feature names with their SHAP values.
-    feature_impact = dict(zip(feature_names, shap_values[0]))
+    feature_impact = dict(zip(feature_names, row_shap_values))
 
     # Sort features by the absolute magnitude of their impact.
     # This tells us which features were most influential.
@@ -69,14 +619,19 @@ def predict_and_explain(input_data: dict) -> dict:
 
     # Format the key drivers for a clean API response.
     # We'll just take the top 2 most influential features.
-    key_drivers = [f"Impact of {name.replace('_', ' ').title()}" for name, impact in sorted_drivers[:2]]
+    return [f"Impact of {name.replace('_', ' ').title()}" for name, impact in sorted_drivers[:2]]
 
-    # --- 4. FORMAT THE OUTPUT ---
-    # Bundle everything into a structured dictionary for the API to return.
-    result = {
+
+def _format_result(prediction_score, key_drivers: list[str], model_version: str) -> dict:
+    """
+    Turns a raw model score and its key drivers into the API result dictionary.
+    """
+    # Convert the numerical score to a human-readable label.
+    prediction_label = "Likely to Fund" if prediction_score > 0.5 else "Unlikely to Fund"
+
+    return {
         "prediction_score": float(prediction_score),
         "prediction_label": prediction_label,
-        "key_drivers": key_drivers
+        "key_drivers": key_drivers,
+        "model_version": model_version
     }
-
-    return result
@@ -0,0 +1,209 @@
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+
+# --- PREDICTION AND OUTCOME LOG ---
+# To retrain on real traffic we need to know what was predicted for each
+# request and what actually happened. With CHIMERA_PREDICTION_LOG_DIR set,
+# /predict and /predict/batch give every prediction a request id and record
+# its inputs, score and model version here. POST /outcomes records whether a
+# project really raised its round, by request id. train.py's
+# `load_feedback` joins the two, giving labelled rows for training.
+#
+# Recording only appends to in-memory buffers, so requests never wait for
+# disk. A background thread writes the buffers out as a new columnar file
+# every `flush_rows` rows or `flush_seconds` seconds, whichever comes first.
+# Existing files are never appended to:
+#
+#     predictions-<time_ns>-<pid>.npz    request_id, timestamp, the three scores,
+#                                        prediction_score, model_version
+#     outcomes-<time_ns>-<pid>.npz       request_id, timestamp, outcome
+#
+# The process id in the name lets several workers share one directory.
+# Files are written under a temporary name and renamed, so readers never see
+# half a file. With format "parquet" (needs pyarrow) the same columns are
+# written as Parquet. If the writer falls behind, new rows beyond
+# `max_pending_rows` are dropped and counted rather than held in memory.
+
+FORMATS = ("npz", "parquet")
+FEATURE_COLUMNS = ["pitch_strength_score", "identity_model_score", "momentum_tracker_score"]
+
+
+class PredictionLog:
+    """
+    Buffers predictions and outcomes in memory and writes them to rotating columnar files.
+
+    Args:
+        directory (str): Where to write the files. Created if missing.
+        file_format (str): "npz" or "parquet".
+        flush_rows (int): Write a file once this many rows of either kind are buffered.
+        flush_seconds (float): Write buffered rows at least this often.
+        max_pending_rows (int): Most rows held in memory; further rows are dropped.
+    """
+
+    def __init__(self, directory: str, file_format: str = "npz", flush_rows: int = 10_000,
+                 flush_seconds: float = 60.0, max_pending_rows: int = 1_000_000):
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown prediction log format: {file_format!r} (expected one of {FORMATS})")
+        if file_format == "parquet":
+            import pyarrow  # noqa: F401  (fail now rather than in the writer thread)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.file_format = file_format
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.max_pending_rows = max_pending_rows
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+        self._predictions = []
+        self._outcomes = []
+
+        self.predictions_logged = 0
+        self.outcomes_logged = 0
+        self.rows_dropped = 0
+        self.files_written = 0
+        self.write_errors = 0
+
+    @staticmethod
+    def new_request_id() -> str:
+        return uuid.uuid4().hex
+
+    def record_predictions(self, request_ids: list[str], input_rows: list[dict], results: list[dict]):
+        """
+        Buffers one row per prediction. Never blocks on I/O.
+        """
+        now = time.time()
+        rows = [(request_id, now, *(row[name] for name in FEATURE_COLUMNS),
+                 result["prediction_score"], result["model_version"])
+                for request_id, row, result in zip(request_ids, input_rows, results)]
+        self._append(self._predictions, rows)
+
+    def record_outcomes(self, request_ids: list[str], outcomes: list[int]):
+        """
+        Buffers the realized outcome (1 = raised, 0 = did not) of earlier predictions.
+        """
+        now = time.time()
+        self._append(self._outcomes, [(request_id, now, outcome)
+                                      for request_id, outcome in zip(request_ids, outcomes)])
+
+    def _append(self, buffer: list, rows: list):
+        with self._lock:
+            if self._closed or len(self._predictions) + len(self._outcomes) + len(rows) > self.max_pending_rows:
+                self.rows_dropped += len(rows)
+                return
+            buffer.extend(rows)
+            if self._thread is None:
+                # Started on first use rather than in __init__, so a log created
+                # before app/serve.py forks its workers gets a writer in each worker.
+                self._thread = threading.Thread(target=self._run, name="chimera-prediction-log", daemon=True)
+                self._thread.start()
+            if len(buffer) >= self.flush_rows:
+                self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Writes everything buffered so far to new files. Safe to call from any thread.
+        """
+        with self._flush_lock:
+            with self._lock:
+                predictions, self._predictions = self._predictions, []
+                outcomes, self._outcomes = self._outcomes, []
+            try:
+                if predictions:
+                    request_ids, timestamps, *features, scores, versions = zip(*predictions)
+                    columns = {"request_id": np.array(request_ids), "timestamp": np.array(timestamps)}
+                    columns.update({name: np.array(values, dtype=np.float32)
+                                    for name, values in zip(FEATURE_COLUMNS, features)})
+                    columns["prediction_score"] = np.array(scores, dtype=np.float32)
+                    columns["model_version"] = np.array(versions)
+                    self._write("predictions", columns)
+                    self.predictions_logged += len(predictions)
+                if outcomes:
+                    request_ids, timestamps, values = zip(*outcomes)
+                    self._write("outcomes", {"request_id": np.array(request_ids), "timestamp": np.array(timestamps),
+                                             "outcome": np.array(values, dtype=np.int8)})
+                    self.outcomes_logged += len(outcomes)
+            except Exception as e:
+                self.write_errors += 1
+                print(f"Writing the prediction log failed: {e}")
+
+    def _write(self, kind: str, columns: dict):
+        path = os.path.join(self.directory, f"{kind}-{time.time_ns()}-{os.getpid()}.{self.file_format}")
+        temporary = path + ".tmp"
+        if self.file_format == "npz":
+            with open(temporary, "wb") as f:
+                np.savez(f, **columns)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            pq.write_table(pa.table(columns), temporary)
+        os.replace(temporary, path)
+        self.files_written += 1
+
+    def close(self):
+        """
+        Stops the writer thread and writes whatever is still buffered.
+
+        Recording again afterwards starts a new writer thread.
+        """
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        self._wake.set()
+        if thread is not None:
+            thread.join()
+        self.flush()
+        with self._lock:
+            self._closed = False
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = {"pending_predictions": len(self._predictions), "pending_outcomes": len(self._outcomes)}
+        return {
+            "directory": self.directory,
+            "format": self.file_format,
+            "predictions_logged": self.predictions_logged,
+            "outcomes_logged": self.outcomes_logged,
+            **pending,
+            "rows_dropped": self.rows_dropped,
+            "files_written": self.files_written,
+            "write_errors": self.write_errors,
+        }
+
+
+def read_log(directory: str, kind: str):
+    """
+    Reads every `kind` ("predictions" or "outcomes") file in a log directory into one DataFrame.
+
+    Returns None if there are no such files yet.
+    """
+    import pandas as pd
+
+    frames = []
+    for name in sorted(os.listdir(directory)):
+        if not name.startswith(f"{kind}-") or name.endswith(".tmp"):
+            continue
+        path = os.path.join(directory, name)
+        if name.endswith(".npz"):
+            with np.load(path) as data:
+                frames.append(pd.DataFrame({column: data[column] for column in data.files}))
+        elif name.endswith(".parquet"):
+            frames.append(pd.read_parquet(path))
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
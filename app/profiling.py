@@ -0,0 +1,247 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+# --- ON-DEMAND PROFILING OF A RUNNING SERVER ---
+# When latency spikes we want to see whether pydantic, the model or the
+# explainer is responsible without restarting the server under a profiler. A
+# ProfilingSession is started from POST /admin/profile and stops by itself
+# after a number of requests or seconds. It writes its results to a local
+# directory:
+#
+#   "sampling" - a background thread records the stack of every thread (the
+#                event loop and the inference pool) every few milliseconds.
+#                Low overhead. Writes <name>.collapsed, one "frame;frame;... count"
+#                line per stack, which flamegraph.pl, speedscope and inferno
+#                read directly, plus <name>.txt with the hottest functions.
+#   "cprofile" - deterministic profiling with cProfile of the event loop thread
+#                and of every inference call in the thread pool. Exact call
+#                counts, but slows requests down noticeably. Writes <name>.prof
+#                (open it with pstats or snakeviz) plus <name>.txt.
+#
+# With CHIMERA_EXECUTOR=process the model runs in other processes, which
+# neither mode can see; only the API's own work is profiled.
+#
+# From Python 3.12, cProfile is built on sys.monitoring, which allows one
+# profiler per interpreter. That profiler sees every thread, so the event
+# loop's profile also covers the inference pool, and `call` skips its own
+# per-call profile. If another profiler is already running, a "cprofile"
+# session falls back to "sampling" and says so in its status.
+
+PROFILE_DIR = os.environ.get("CHIMERA_PROFILE_DIR", "profiles")
+MODES = ("sampling", "cprofile")
+
+
+class ProfilingSession:
+    """
+    One profiling run, limited by a number of requests and/or a duration.
+
+    Args:
+        mode (str): "sampling" or "cprofile".
+        output_dir (str): Where the result files are written. Defaults to CHIMERA_PROFILE_DIR.
+        max_requests (int): Stop after this many requests have finished. None means no limit.
+        max_seconds (float): Stop after this long. None means no limit.
+        interval_ms (float): Time between stack samples in "sampling" mode.
+    """
+
+    def __init__(self, mode: str = "sampling", output_dir: str = None, max_requests: int = None,
+                 max_seconds: float = None, interval_ms: float = 5.0):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {mode!r} (expected one of {MODES})")
+        if max_requests is None and max_seconds is None:
+            raise ValueError("Give max_requests or max_seconds, or the session would never stop")
+
+        self.mode = mode
+        self.output_dir = output_dir or PROFILE_DIR
+        self.max_requests = max_requests
+        self.max_seconds = max_seconds
+        self.interval = interval_ms / 1000
+        self.name = time.strftime("%Y%m%d-%H%M%S") + f"-{mode}"
+
+        self.active = False
+        self.fallback = None
+        self.requests_seen = 0
+        self.started_at = None
+        self.stopped_at = None
+        self.files = []
+
+        self._lock = threading.Lock()
+        self._loop_profile = None
+        self._call_profiles = []
+        self._samples = Counter()
+        self._sample_count = 0
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+        self._timer = None
+
+    def start(self):
+        """
+        Starts profiling. Must be called from the event loop thread.
+        """
+        self.active = True
+        self.started_at = time.time()
+        if self.mode == "cprofile":
+            # cProfile only sees the thread that enables it: this one runs the
+            # event loop, so it covers routing, validation and serialization.
+            self._loop_profile = cProfile.Profile()
+            try:
+                self._loop_profile.enable()
+            except ValueError as e:
+                # "Another profiling tool is already active" (Python 3.12+).
+                self.mode, self.fallback = "sampling", f"cProfile unavailable: {e}"
+                self.name = self.name.replace("-cprofile", "-sampling")
+        if self.mode == "sampling":
+            self._sampler = threading.Thread(target=self._sample, name="chimera-profiler", daemon=True)
+            self._sampler.start()
+        if self.max_seconds is not None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_seconds, self.stop)
+
+    def call(self, fn, *args):
+        """
+        Runs fn(*args), profiling it in "cprofile" mode. Used by the inference pool's threads.
+        """
+        if not self.active or self.mode != "cprofile":
+            return fn(*args)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: the event loop's profile is the only one allowed,
+            # and it already records this thread.
+            return fn(*args)
+        try:
+            return fn(*args)
+        finally:
+            profile.disable()
+            with self._lock:
+                if self.active:
+                    self._call_profiles.append(profile)
+
+    def request_finished(self):
+        """
+        Counts a finished request and stops the session once the limit is reached.
+        """
+        if not self.active:
+            return
+        self.requests_seen += 1
+        if self.max_requests is not None and self.requests_seen >= self.max_requests:
+            self.stop()
+
+    def stop(self) -> list[str]:
+        """
+        Stops profiling and writes the results. Must be called from the event loop thread.
+
+        Returns:
+            list[str]: The files written. Calling it again returns the same files.
+        """
+        with self._lock:
+            if not self.active:
+                return self.files
+            self.active = False
+        self.stopped_at = time.time()
+        if self._timer is not None:
+            self._timer.cancel()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, self.name)
+        if self.mode == "cprofile":
+            self._loop_profile.disable()
+            stats = pstats.Stats(self._loop_profile)
+            for profile in self._call_profiles:
+                stats.add(profile)
+            stats.dump_stats(base + ".prof")
+            self.files = [base + ".prof", base + ".txt"]
+            summary = io.StringIO()
+            pstats.Stats(base + ".prof", stream=summary).sort_stats("cumulative").print_stats(40)
+            _write(base + ".txt", summary.getvalue())
+        else:
+            self._stop_sampling.set()
+            self._sampler.join()
+            with open(base + ".collapsed", "w") as f:
+                for stack, count in self._samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            self.files = [base + ".collapsed", base + ".txt"]
+            _write(base + ".txt", self._hottest_functions())
+
+        print(f"Profile written to {', '.join(self.files)}")
+        return self.files
+
+    def status(self) -> dict:
+        return {
+            "mode": self.mode,
+            "fallback": self.fallback,
+            "active": self.active,
+            "requests_seen": self.requests_seen,
+            "max_requests": self.max_requests,
+            "max_seconds": self.max_seconds,
+            "seconds": round((self.stopped_at or time.time()) - self.started_at, 3) if self.started_at else 0.0,
+            "samples": self._sample_count,
+            "files": self.files,
+        }
+
+    def _sample(self):
+        own_thread = threading.get_ident()
+        while not self._stop_sampling.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                # Root each stack at its thread, so the event loop and the
+                # inference pool show up as separate towers in the flame graph.
+                stack.append(names.get(thread_id, str(thread_id)))
+                self._samples[";".join(reversed(stack))] += 1
+            self._sample_count += 1
+
+    def _hottest_functions(self, limit: int = 40) -> str:
+        # Samples by the function at the top of the stack (self time) and by
+        # every function on the stack (total time).
+        self_counts, total_counts = Counter(), Counter()
+        for stack, count in self._samples.items():
+            frames = stack.split(";")[1:]
+            if frames:
+                self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+
+        lines = [f"{self._sample_count} samples every {self.interval * 1000:g} ms", "",
+                 f"{'self':>8} {'total':>8}  function"]
+        for frame, count in self_counts.most_common(limit):
+            lines.append(f"{count:>8} {total_counts[frame]:>8}  {frame}")
+        return "\n".join(lines) + "\n"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that reports finished requests to the active profiling session.
+
+    Requests to /admin are not counted, so checking on a session does not use it up.
+    """
+
+    def __init__(self, app, get_session):
+        self.app = app
+        self.get_session = get_session
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session = self.get_session()
+            if session is not None and session.active and scope["type"] == "http" \
+                    and not scope["path"].startswith("/admin"):
+                session.request_finished()
+
+
+def _write(path: str, text: str):
+    with open(path, "w") as f:
+        f.write(text)
@@ -0,0 +1,198 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+# --- LOCAL MODEL REGISTRY ---
+# Every trained model is kept in its own directory, named after a fingerprint
+# of the booster file, together with a metadata file:
+#
+#     app/ml/registry/
+#         CURRENT                 <- name of the version the server should serve
+#         3f9a1c2b7d4e/
+#             predictor.bst       <- XGBoost booster (the "xgboost" engine)
+#             predictor.json      <- the same model as JSON (the "compiled" engine)
+#             predictor_grid.npy  <- optional lookup grid (the "grid" engine)
+#             predictor_grid.json
+#             metadata.json
+#
+# Versions are never modified after they are published. Switching versions
+# only rewrites CURRENT, which is done atomically, so a server that reads it
+# always sees either the old or the new version.
+#
+#     python -m app.registry list
+#     python -m app.registry publish app/ml/predictor.bst --activate
+#     python -m app.registry activate 3f9a1c2b7d4e
+
+REGISTRY_DIR = os.environ.get("CHIMERA_REGISTRY_DIR", os.path.join(os.path.dirname(__file__), "ml", "registry"))
+
+BOOSTER_FILE = "predictor.bst"
+COMPILED_MODEL_FILE = "predictor.json"
+GRID_FILE = "predictor_grid.npy"
+METADATA_FILE = "metadata.json"
+CURRENT_FILE = "CURRENT"
+
+
+def fingerprint(path: str) -> str:
+    """
+    A short, stable fingerprint of a file's contents.
+    """
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+class ModelRegistry:
+    """
+    A directory of immutable, versioned model artifacts plus a pointer to the active one.
+
+    Args:
+        root (str): The registry directory. It is created on first publish.
+    """
+
+    def __init__(self, root: str = REGISTRY_DIR):
+        self.root = root
+
+    def current(self):
+        """
+        Returns the active version, or None if nothing has been activated yet.
+        """
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def path(self, version: str, artifact: str = BOOSTER_FILE) -> str:
+        return os.path.join(self.root, version, artifact)
+
+    def exists(self, version: str) -> bool:
+        return os.path.isfile(self.path(version, METADATA_FILE))
+
+    def metadata(self, version: str) -> dict:
+        with open(self.path(version, METADATA_FILE)) as f:
+            return json.load(f)
+
+    def versions(self) -> list[dict]:
+        """
+        Returns the metadata of every published version, oldest first.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        found = [self.metadata(name) for name in os.listdir(self.root) if self.exists(name)]
+        return sorted(found, key=lambda metadata: metadata["created_at"])
+
+    def publish(self, model_path: str, compiled_model_path: str = None, grid_path: str = None,
+                metadata: dict = None, activate: bool = False) -> str:
+        """
+        Copies a trained model into the registry as a new version.
+
+        Args:
+            model_path (str): The XGBoost booster file.
+            compiled_model_path (str): The same model saved as JSON. Defaults to a
+                .json file next to `model_path`, if there is one.
+            grid_path (str): An optional lookup grid built from this model
+                (its .json sidecar is copied too).
+            metadata (dict): Extra information to store, e.g. training metrics.
+            activate (bool): Also make this the active version.
+
+        Returns:
+            str: The version name. Publishing the same booster twice returns the
+                existing version.
+        """
+        version = fingerprint(model_path)
+        if compiled_model_path is None:
+            candidate = os.path.splitext(model_path)[0] + ".json"
+            compiled_model_path = candidate if os.path.isfile(candidate) else None
+
+        if not self.exists(version):
+            # Build the version in a temporary directory and rename it into
+            # place, so a half-copied version is never visible.
+            staging = os.path.join(self.root, f".{version}.{os.getpid()}.tmp")
+            os.makedirs(staging)
+            try:
+                shutil.copyfile(model_path, os.path.join(staging, BOOSTER_FILE))
+                if compiled_model_path:
+                    shutil.copyfile(compiled_model_path, os.path.join(staging, COMPILED_MODEL_FILE))
+                if grid_path:
+                    shutil.copyfile(grid_path, os.path.join(staging, GRID_FILE))
+                    shutil.copyfile(os.path.splitext(grid_path)[0] + ".json",
+                                    os.path.join(staging, os.path.splitext(GRID_FILE)[0] + ".json"))
+                with open(os.path.join(staging, METADATA_FILE), "w") as f:
+                    json.dump({
+                        "version": version,
+                        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                        "source": os.path.abspath(model_path),
+                        **(metadata or {}),
+                    }, f, indent=2)
+                os.rename(staging, os.path.join(self.root, version))
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str):
+        """
+        Points CURRENT at an existing version.
+        """
+        if not self.exists(version):
+            raise KeyError(f"Unknown model version: {version!r}")
+        temporary = os.path.join(self.root, f".{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(temporary, "w") as f:
+            f.write(version + "\n")
+        os.replace(temporary, os.path.join(self.root, CURRENT_FILE))
+
+
+def watch(registry: ModelRegistry, on_change, interval: float = 2.0) -> threading.Thread:
+    """
+    Polls the registry's CURRENT pointer and calls `on_change(version)` when it moves.
+
+    Runs in a daemon thread. Errors raised by `on_change` are printed and the
+    watch carries on, so a bad version cannot stop later ones from loading.
+    """
+    def poll():
+        last_seen = registry.current()
+        while True:
+            time.sleep(interval)
+            version = registry.current()
+            if version and version != last_seen:
+                last_seen = version
+                try:
+                    on_change(version)
+                except Exception as e:
+                    print(f"Could not switch to model version {version}: {e}")
+
+    thread = threading.Thread(target=poll, name="chimera-model-watch", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the local model registry.")
+    parser.add_argument("--root", default=REGISTRY_DIR, help="Registry directory.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List published versions.")
+    publish_parser = commands.add_parser("publish", help="Publish a trained booster as a new version.")
+    publish_parser.add_argument("model", help="The .bst file to publish.")
+    publish_parser.add_argument("--grid", help="A lookup grid built from this model.")
+    publish_parser.add_argument("--activate", action="store_true", help="Also make it the active version.")
+    activate_parser = commands.add_parser("activate", help="Make a published version the active one.")
+    activate_parser.add_argument("version")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == "list":
+        current = registry.current()
+        for metadata in registry.versions():
+            marker = "*" if metadata["version"] == current else " "
+            print(f"{marker} {metadata['version']}  {metadata['created_at']}  {metadata.get('source', '')}")
+    elif args.command == "publish":
+        print(registry.publish(args.model, grid_path=args.grid, activate=args.activate))
+    else:
+        registry.activate(args.version)
+        print(f"Active version: {args.version}")
@@ -0,0 +1,42 @@
+import json
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# --- FAST JSON RESPONSES ---
+# Our responses are tiny (a score, a label and three strings), so most of the
+# time spent building one goes on validating it against the response model.
+# With CHIMERA_RESPONSE_VALIDATION=0 the prediction endpoints return a
+# FastJSONResponse themselves and skip that validation, which is redundant
+# because model.py always builds results of the same shape.
+#
+# orjson is optional. Without it, the standard library's json encodes the
+# same compact output (numbers may be formatted slightly differently).
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    A JSON response encoded with orjson when it is installed, and with json otherwise.
+
+    NumPy scalars and arrays are encoded as plain JSON numbers and lists.
+    """
+
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                          default=_encode_numpy).encode("utf-8")
+
+
+def _encode_numpy(value):
+    # Called by json.dumps for values it cannot encode itself.
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
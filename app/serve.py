@@ -0,0 +1,188 @@
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+# --- PRE-FORK MULTI-WORKER SERVING ---
+# `uvicorn --workers N` starts N fresh interpreters. Each one imports the app,
+# NumPy and the model libraries and loads its own model, so memory grows by a
+# full copy per worker. This launcher does all of that once, in a parent
+# process, and then forks the workers. The workers start with the parent's
+# memory and share its pages through copy-on-write. Everything that is never
+# written after the fork stays shared: library code, imported modules and the
+# model's arrays. They also share one listening socket, so the kernel spreads
+# connections between them.
+#
+#   python -m app.serve --workers 4 --host 0.0.0.0 --port 8000
+#
+# What is loaded before the fork depends on CHIMERA_ENGINE:
+#   "compiled" and "grid" - the model and explainer are loaded in the parent.
+#                           The grid is memory-mapped read-only, so its pages
+#                           sit in the OS page cache once, whatever the
+#                           number of workers.
+#   "xgboost"             - XGBoost's OpenMP runtime is not safe to use after a
+#                           fork (see app/executor.py). The library is
+#                           imported in the parent, but each worker loads its
+#                           own booster once it has started.
+#
+# Each worker keeps its own prediction cache, micro-batcher and metrics, so
+# /metrics and the /stats endpoints describe whichever worker answers.
+# Deferred explanations, shadow scoring, profiling sessions and
+# /admin/model/reload would also live in a single worker: a follow-up request
+# on another worker would not find them. With more than one worker, the API
+# refuses them with 409. To roll out a new model version, activate it in the
+# registry and set CHIMERA_MODEL_WATCH_SECONDS, so every worker switches to it.
+# Workers that exit unexpectedly are restarted. SIGTERM or SIGINT stops them
+# all. Needs os.fork, so it only runs on Linux and macOS.
+
+WORKERS = int(os.environ.get("CHIMERA_WORKERS", str(os.cpu_count() or 1)))
+
+
+def preload(engine: str, workers: int = 1):
+    """
+    Imports the app and, where it is fork-safe, loads the model. Runs in the parent.
+    """
+    from app import main
+    from app.main import app
+    from app.model import load_model
+
+    main.WORKER_PROCESSES = workers
+
+    if engine == "xgboost":
+        import xgboost  # noqa: F401  (the library is shared; the booster is loaded per worker)
+    else:
+        load_model()
+
+    # Move everything allocated so far out of the garbage collector's view.
+    # Otherwise each worker's first collection writes to every object's
+    # header and copies the pages they live on.
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, workers: int = WORKERS, log_level: str = "info"):
+    """
+    Loads the app once, forks `workers` uvicorn workers on one shared socket and supervises them.
+
+    Returns when every worker has stopped after a SIGTERM or SIGINT.
+    """
+    import uvicorn
+
+    from app.model import ENGINE
+
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    started = time.perf_counter()
+    app = preload(ENGINE, workers)
+    print(f"Preloaded the app ({ENGINE} engine) in {time.perf_counter() - started:.2f} s; "
+          f"starting {workers} workers on http://{host}:{sock.getsockname()[1]}")
+
+    children = set()
+    stopping = False
+
+    def start_worker():
+        pid = os.fork()
+        if pid == 0:
+            # The worker. uvicorn installs its own SIGTERM/SIGINT handling.
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            status = 0
+            try:
+                uvicorn.Server(uvicorn.Config(app, log_level=log_level)).run(sockets=[sock])
+            except BaseException as e:
+                print(f"Worker {os.getpid()} failed: {e}", file=sys.stderr)
+                status = 1
+            finally:
+                os._exit(status)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        start_worker()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; starting a new one",
+                  file=sys.stderr)
+            time.sleep(1)  # Do not spin if workers keep failing on startup.
+            start_worker()
+    sock.close()
+
+
+def memory_usage(pid: int) -> dict:
+    """
+    Resident (RSS), proportional (PSS) and shared memory of a process, in MB. Linux only.
+
+    PSS divides every shared page between the processes sharing it, so the PSS
+    of all workers adds up to the memory they really use together.
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_mb": round(fields["Rss"] / 1024, 1),
+        "pss_mb": round(fields["Pss"] / 1024, 1),
+        "shared_mb": round((fields["Shared_Clean"] + fields["Shared_Dirty"]) / 1024, 1),
+    }
+
+
+def descendants(pid: int) -> list[int]:
+    """
+    The process IDs of every process started by `pid`, directly or indirectly. Linux only.
+    """
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name in brackets can contain spaces; the parent
+                # PID is the second field after it.
+                parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+
+    found, frontier = [], [pid]
+    while frontier:
+        parent = frontier.pop()
+        children = [child for child, ppid in parents.items() if ppid == parent]
+        found.extend(children)
+        frontier.extend(children)
+    return sorted(found)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the API from several pre-forked worker processes.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="Worker processes (default: CHIMERA_WORKERS, or one per CPU).")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.log_level)
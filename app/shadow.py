@@ -0,0 +1,120 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# --- SHADOW SCORING OF A CANDIDATE MODEL ---
+# Before promoting a retrained model we want to see how it behaves on real
+# traffic. With shadow scoring on, a random fraction of requests is also
+# scored by a candidate model after the response has been sent. The candidate
+# runs on its own small thread pool, and samples are dropped rather than
+# queued when that pool falls behind, so callers never wait for it.
+# Its answers are never returned; only the comparison with the live model is
+# recorded.
+
+
+class ShadowScorer:
+    """
+    Scores a sample of requests with a candidate model and compares it with the live one.
+
+    Args:
+        candidate (LoadedModel): The candidate model (see app.model.load_version).
+        fraction (float): Share of requests to shadow, between 0 and 1.
+        max_pending (int): Most shadow calls allowed to wait; further samples are skipped.
+        latency_window (int): How many recent candidate latencies the percentiles cover.
+    """
+
+    def __init__(self, candidate, fraction: float = 0.1, max_pending: int = 64, latency_window: int = 10_000):
+        if not 0 <= fraction <= 1:
+            raise ValueError(f"fraction must be between 0 and 1, got {fraction}")
+        self.candidate = candidate
+        self.fraction = fraction
+        self.max_pending = max_pending
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chimera-shadow")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        self.requests_sampled = 0
+        self.requests_skipped = 0
+        self.errors = 0
+        self.rows_compared = 0
+        self.label_disagreements = 0
+        self.score_delta_sum = 0.0
+        self.abs_score_delta_sum = 0.0
+        self.max_abs_score_delta = 0.0
+        self.primary_versions = set()
+        self._latencies_ms = deque(maxlen=latency_window)
+
+    def sample(self) -> bool:
+        """
+        Decides whether the current request should be shadowed.
+        """
+        return self.fraction > 0 and random.random() < self.fraction
+
+    def submit(self, input_rows: list[dict], primary_results: list[dict]):
+        """
+        Queues a comparison of the candidate with the live model's results. Never blocks.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.requests_skipped += 1
+                return
+            self._pending += 1
+        self.pool.submit(self._compare, input_rows, primary_results)
+
+    def _compare(self, input_rows: list[dict], primary_results: list[dict]):
+        try:
+            start = time.perf_counter()
+            candidate_scores = self.candidate.score(input_rows)
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            primary_scores = np.array([result["prediction_score"] for result in primary_results])
+            deltas = candidate_scores.astype(np.float64) - primary_scores
+            disagreements = int(np.count_nonzero((candidate_scores > 0.5) != (primary_scores > 0.5)))
+
+            with self._lock:
+                self.requests_sampled += 1
+                self.rows_compared += len(deltas)
+                self.label_disagreements += disagreements
+                self.score_delta_sum += float(deltas.sum())
+                self.abs_score_delta_sum += float(np.abs(deltas).sum())
+                self.max_abs_score_delta = max(self.max_abs_score_delta, float(np.abs(deltas).max()))
+                self.primary_versions.update(result["model_version"] for result in primary_results)
+                self._latencies_ms.append(latency_ms)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"Shadow scoring failed: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            rows = self.rows_compared
+            latencies = np.array(self._latencies_ms)
+            return {
+                "candidate_version": self.candidate.version,
+                "primary_versions": sorted(self.primary_versions),
+                "fraction": self.fraction,
+                "requests_sampled": self.requests_sampled,
+                "requests_skipped": self.requests_skipped,
+                "errors": self.errors,
+                "rows_compared": rows,
+                "label_disagreement_rate": self.label_disagreements / rows if rows else 0.0,
+                "mean_score_delta": self.score_delta_sum / rows if rows else 0.0,
+                "mean_abs_score_delta": self.abs_score_delta_sum / rows if rows else 0.0,
+                "max_abs_score_delta": self.max_abs_score_delta,
+                "candidate_latency_ms": {
+                    "mean": float(latencies.mean()) if len(latencies) else None,
+                    "p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                    "p95": float(np.percentile(latencies, 95)) if len(latencies) else None,
+                    "p99": float(np.percentile(latencies, 99)) if len(latencies) else None,
+                },
+            }
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
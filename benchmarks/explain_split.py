@@ -0,0 +1,57 @@
+"""
+Benchmark: how prediction latency splits between scoring and explaining.
+
+Run from the project root:
+    python benchmarks/explain_split.py
+    CHIMERA_ENGINE=compiled python benchmarks/explain_split.py
+
+Shows, per batch size, the time spent building the input matrix, scoring it,
+and computing SHAP key drivers, so the saving from ?explain=none (or
+?explain=deferred) can be read straight off the table.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import model  # noqa: E402
+
+BATCH_SIZES = [1, 100, 10_000]
+
+
+def time_call(fn, repeats: int) -> float:
+    """Returns the median wall time of fn() in microseconds."""
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"Engine: {model.ENGINE}")
+    print(f"{'rows':>7} {'matrix µs':>11} {'score µs':>11} {'explain µs':>11} {'score-only µs':>14} {'full µs':>11}")
+
+    for batch_size in BATCH_SIZES:
+        rows = [dict(zip(model.feature_names, map(float, r))) for r in np.round(rng.uniform(0, 10, (batch_size, 3)), 1)]
+        matrix = model._feature_matrix(rows)
+        repeats = max(5, 2000 // batch_size)
+
+        build = time_call(lambda: model._feature_matrix(rows), repeats)
+        score = time_call(lambda: model.score_matrix(matrix), repeats)
+        explain = time_call(lambda: model.explain_many(rows), repeats)
+        score_only = time_call(lambda: model.predict_and_explain_many(rows, explain=False), repeats)
+        full = time_call(lambda: model.predict_and_explain_many(rows), repeats)
+
+        print(f"{batch_size:>7} {build:>11.1f} {score:>11.1f} {explain:>11.1f} {score_only:>14.1f} {full:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
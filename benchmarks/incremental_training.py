@@ -0,0 +1,101 @@
+"""
+Benchmark: incremental model updates against a full retrain.
+
+Run from the project root:
+    python benchmarks/incremental_training.py
+    python benchmarks/incremental_training.py --base-rows 2000000 --new-rows 200000 --output incremental.json
+
+Trains a base model on --base-rows rows of mock data, then brings it up to
+date with --new-rows new rows in three ways:
+    full_retrain  - a new model trained from scratch on the old and new rows
+                    together, as train_model does.
+    continue      - update_model(mode="continue"): new trees boosted on the new rows.
+    refresh       - update_model(mode="refresh"): leaf values recomputed from the new rows.
+update_model holds out a fifth of the new rows, so the updates see slightly
+fewer of them than the full retrain. Every model is scored on the same
+separate evaluation rows. Reports the seconds each update takes, its speedup
+over the full retrain, and evaluation logloss and accuracy.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import xgboost as xgb  # noqa: E402
+
+from app.ml.train import (  # noqa: E402
+    FEATURES, MODEL_PARAMS, SEED, TARGET, UPDATE_MODES, UPDATE_ROUNDS, evaluate, generate_mock_data, update_model
+)
+
+
+def fit(df: pd.DataFrame) -> tuple[xgb.Booster, float]:
+    """
+    Trains a model from scratch as train_model does. Returns the booster and the seconds it took.
+    """
+    start_time = time.perf_counter()
+    classifier = xgb.XGBClassifier(**MODEL_PARAMS, tree_method="hist", n_jobs=os.cpu_count())
+    classifier.fit(df[FEATURES], df[TARGET])
+    return classifier.get_booster(), time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare incremental model updates with a full retrain.")
+    parser.add_argument("--base-rows", type=int, default=1_000_000, help="Rows the base model is trained on.")
+    parser.add_argument("--new-rows", type=int, default=100_000, help="New rows to update it with.")
+    parser.add_argument("--eval-rows", type=int, default=100_000, help="Rows every model is scored on.")
+    parser.add_argument("--rounds", type=int, default=UPDATE_ROUNDS, help="Trees added in continue mode.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    base_df = generate_mock_data(args.base_rows, SEED)
+    new_df = generate_mock_data(args.new_rows, SEED + 1)
+    eval_df = generate_mock_data(args.eval_rows, SEED + 2)
+    X_eval, y_eval = eval_df[FEATURES].to_numpy("float32"), eval_df[TARGET].to_numpy("float32")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = os.path.join(tmp, "base.bst")
+        base, _ = fit(base_df)
+        base.save_model(base_path)
+        results = {"base": {"seconds": None, **evaluate(base, X_eval, y_eval)}}
+
+        print("\nRetraining from scratch...")
+        retrained, seconds = fit(pd.concat([base_df, new_df], ignore_index=True))
+        results["full_retrain"] = {"seconds": round(seconds, 3), **evaluate(retrained, X_eval, y_eval)}
+
+        for mode in UPDATE_MODES:
+            print()
+            model_path = os.path.join(tmp, f"{mode}.bst")
+            summary = update_model(new_df, mode, args.rounds, base_model_path=base_path, model_path=model_path,
+                                   compiled_model_path=os.path.join(tmp, f"{mode}.json"), publish=False)
+            results[mode] = {"seconds": summary["seconds"],
+                             **evaluate(xgb.Booster(model_file=model_path), X_eval, y_eval)}
+
+    full_seconds = results["full_retrain"]["seconds"]
+    print(f"\n{args.base_rows:,} base rows, {args.new_rows:,} new rows, {os.cpu_count()} CPU(s)")
+    print(f"{'model':<13} {'seconds':>8} {'speedup':>8} {'logloss':>8} {'accuracy':>9}")
+    for name, result in results.items():
+        if result["seconds"] is None:
+            timing = f"{'-':>8} {'-':>8}"
+        else:
+            result["speedup"] = round(full_seconds / result["seconds"], 1)
+            timing = f"{result['seconds']:>8.2f} {result['speedup']:>7.1f}x"
+        print(f"{name:<13} {timing} {result['logloss']:>8.4f} {result['accuracy']:>9.4f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": {"base_rows": args.base_rows, "new_rows": args.new_rows,
+                                "eval_rows": args.eval_rows, "rounds": args.rounds, "cpu_count": os.cpu_count()},
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Load test: throughput and tail latency of the prediction API.
+
+Run from the project root:
+    python benchmarks/load_test.py                               # in-process, no network
+    python benchmarks/load_test.py --spawn                       # uvicorn on a free localhost port
+    python benchmarks/load_test.py --url http://127.0.0.1:8000   # a server that is already running
+
+    python benchmarks/load_test.py --spawn --output results.json
+    python benchmarks/load_test.py --spawn --baseline results.json   # flag regressions
+
+Each scenario drives one endpoint with --concurrency clients. Each client
+sends its next request as soon as the last one returns, for --duration
+seconds after a --warmup period. Inputs come from a seeded generator, so runs
+are repeatable; --grid-fraction controls how many of them fall on the 0.1
+grid the prediction cache stores.
+
+Reports throughput (requests/sec and rows/sec) and p50/p95/p99/p999 latency
+per scenario. With --baseline, the run is compared with a saved result. The
+script exits with status 1 if throughput dropped or p50/p99 latency rose by
+more than --tolerance, or if the error rate rose by more than a percentage
+point. Throughput and latency count successful requests only.
+
+In-process mode runs the client and the app on the same event loop and CPU,
+so it measures the server's per-request cost rather than its real capacity.
+For capacity numbers use --spawn or --url, ideally from another machine.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+# How long a client waits after an error (e.g. a 503) before its next request.
+ERROR_BACKOFF_SECONDS = 0.01
+
+FEATURES = ["pitch_strength_score", "identity_model_score", "momentum_tracker_score"]
+
+# name -> (path, whether the body is a list of rows)
+SCENARIOS = {
+    "predict": ("/predict", False),
+    "predict_no_explain": ("/predict?explain=none", False),
+    "batch": ("/predict/batch", True),
+}
+
+
+def make_rows(count: int, seed: int = 0, grid_fraction: float = 0.0) -> list[dict]:
+    """
+    Random agent scores. A `grid_fraction` share is rounded to the 0.1 grid.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0, 10, (count, len(FEATURES)))
+    on_grid = rng.random(count) < grid_fraction
+    values[on_grid] = np.round(values[on_grid], 1)
+    return [dict(zip(FEATURES, map(float, row))) for row in values]
+
+
+def summarize(latencies: list[float], statuses: dict, elapsed: float, rows_per_request: int) -> dict:
+    """
+    Throughput and latency percentiles (in milliseconds) for one scenario.
+
+    Only successful requests count towards throughput and latency; quick
+    rejections (such as 503s under overload) are reported as errors instead.
+    """
+    latencies_ms = np.array(latencies) * 1000
+    ok = len(latencies)
+    total = sum(statuses.values())
+    return {
+        "requests": total,
+        "errors": total - ok,
+        "error_rate": round((total - ok) / total, 4) if total else 0.0,
+        "status_counts": statuses,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(ok / elapsed, 1) if elapsed else 0.0,
+        "rows_per_second": round(ok * rows_per_request / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(float(latencies_ms.mean()), 3) if ok else None,
+            **{name: round(float(np.percentile(latencies_ms, q)), 3) if ok else None
+               for name, q in (("p50", 50), ("p95", 95), ("p99", 99), ("p999", 99.9))},
+            "max": round(float(latencies_ms.max()), 3) if ok else None,
+        },
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: str, rows: list[dict], concurrency: int,
+                       duration: float, warmup: float, batch_size: int) -> dict:
+    """
+    Drives one scenario and returns its summary.
+    """
+    path, is_batch = SCENARIOS[scenario]
+    if is_batch:
+        payloads = [rows[i:i + batch_size] for i in range(0, len(rows) - batch_size + 1, batch_size)]
+    else:
+        payloads = rows
+    next_payload = 0
+
+    async def drive(until: float, latencies: list, statuses: dict):
+        nonlocal next_payload
+        while time.perf_counter() < until:
+            payload = payloads[next_payload % len(payloads)]
+            next_payload += 1
+            start = time.perf_counter()
+            try:
+                status = str((await client.post(path, json=payload)).status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            if status == "200":
+                latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status != "200":
+                # Back off briefly, as a real client would, instead of
+                # hammering an overloaded server with instant retries.
+                await asyncio.sleep(ERROR_BACKOFF_SECONDS)
+
+    # Warm up (connections, caches, lazy initialisation), then measure.
+    await asyncio.gather(*(drive(time.perf_counter() + warmup, [], {}) for _ in range(concurrency)))
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(start + duration, latencies, statuses) for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - start, batch_size if is_batch else 1)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Lists the regressions of `results` against `baseline`, and prints the comparison.
+    """
+    regressions = []
+    print(f"\nAgainst baseline ({baseline['meta'].get('timestamp', 'unknown date')}), tolerance {tolerance:.0%}:")
+    for scenario, current in results["scenarios"].items():
+        previous = baseline["scenarios"].get(scenario)
+        if previous is None:
+            print(f"  {scenario}: not in the baseline")
+            continue
+        checks = [
+            ("requests_per_second", current["requests_per_second"], previous["requests_per_second"], -1),
+            ("p50", current["latency_ms"]["p50"], previous["latency_ms"]["p50"], 1),
+            ("p99", current["latency_ms"]["p99"], previous["latency_ms"]["p99"], 1),
+        ]
+        for name, now, before, worse_direction in checks:
+            if not before or now is None:
+                continue
+            change = (now - before) / before
+            flag = change * worse_direction > tolerance
+            print(f"  {scenario:<20} {name:<20} {before:>10.2f} -> {now:>10.2f} ({change:+.1%})"
+                  f"{'  REGRESSION' if flag else ''}")
+            if flag:
+                regressions.append(f"{scenario} {name} {change:+.1%}")
+
+        # More than one extra failed request in a hundred is a regression too.
+        if current["error_rate"] > previous.get("error_rate", 0.0) + 0.01:
+            print(f"  {scenario:<20} {'error_rate':<20} {previous.get('error_rate', 0.0):>10.2%} -> "
+                  f"{current['error_rate']:>10.2%}  REGRESSION")
+            regressions.append(f"{scenario} error_rate {current['error_rate']:.2%}")
+    return regressions
+
+
+@contextlib.contextmanager
+def spawn_server(extra_env: dict = None, workers: int = 1, launcher: str = "uvicorn"):
+    """
+    Starts the API on a free localhost port and yields its URL once /ready answers.
+
+    `launcher` is "uvicorn" (`uvicorn --workers`) or "prefork" (app/serve.py).
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    if launcher == "prefork":
+        command = [sys.executable, "-m", "app.serve", "--workers", str(workers)]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--workers", str(workers)]
+    server = subprocess.Popen(
+        command + ["--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env={**os.environ, **(extra_env or {})}
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("The server exited before it was ready")
+            try:
+                if httpx.get(url + "/ready", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("The server did not become ready within 60 s")
+            time.sleep(0.2)
+        yield url
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+async def run_load_test(scenarios: list[str], url: str = None, concurrency: int = 8, duration: float = 10.0,
+                        warmup: float = 2.0, batch_size: int = 100, grid_fraction: float = 0.0,
+                        seed: int = 0) -> dict:
+    """
+    Runs the scenarios against `url`, or against the app in-process if no URL is given.
+
+    Returns:
+        dict: {"meta": run settings, "scenarios": {name: summary}}.
+    """
+    rows = make_rows(max(10_000, batch_size * 50), seed, grid_fraction)
+    if url is None:
+        from app.main import app
+        from app.model import load_model
+
+        load_model()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load-test")
+    else:
+        client = httpx.AsyncClient(base_url=url, timeout=30,
+                                   limits=httpx.Limits(max_connections=concurrency,
+                                                       max_keepalive_connections=concurrency))
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "target": url or "in-process",
+            "concurrency": concurrency,
+            "duration_seconds": duration,
+            "warmup_seconds": warmup,
+            "batch_size": batch_size,
+            "grid_fraction": grid_fraction,
+            "seed": seed,
+            "engine": os.environ.get("CHIMERA_ENGINE", "xgboost"),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "scenarios": {},
+    }
+    async with client:
+        for scenario in scenarios:
+            summary = await run_scenario(client, scenario, rows, concurrency, duration, warmup, batch_size)
+            results["scenarios"][scenario] = summary
+            latency = summary["latency_ms"]
+            print(f"{scenario:<20} {summary['requests_per_second']:>9.1f} req/s {summary['rows_per_second']:>10.1f} "
+                  f"rows/s  p50 {latency['p50']:>8.2f}  p95 {latency['p95']:>8.2f}  p99 {latency['p99']:>8.2f}  "
+                  f"p999 {latency['p999']:>8.2f} ms  errors {summary['errors']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the prediction API.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Base URL of a running server. Default: serve the app in-process.")
+    target.add_argument("--spawn", action="store_true", help="Start uvicorn on a free localhost port.")
+    parser.add_argument("--scenarios", default="predict,predict_no_explain,batch",
+                        help=f"Comma-separated, from: {', '.join(SCENARIOS)}.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients (default 8).")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario.")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each scenario.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows per /predict/batch request.")
+    parser.add_argument("--grid-fraction", type=float, default=0.0,
+                        help="Share of inputs on the cache grid (default 0: every request runs the model).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare with the results in this JSON file.")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed relative slowdown before a regression is flagged (default 0.10).")
+    args = parser.parse_args()
+
+    scenarios = args.scenarios.split(",")
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    def run(url):
+        return asyncio.run(run_load_test(scenarios, url, args.concurrency, args.duration, args.warmup,
+                                         args.batch_size, args.grid_fraction, args.seed))
+
+    if args.spawn:
+        with spawn_server() as url:
+            results = run(url)
+    else:
+        results = run(args.url)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {'; '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
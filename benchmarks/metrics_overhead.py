@@ -0,0 +1,104 @@
+"""
+Benchmark: what the /metrics instrumentation costs.
+
+Run from the project root:
+    python benchmarks/metrics_overhead.py
+
+Reports the cost of a single histogram observation and counter increment,
+then the time per POST /predict with metrics turned on and off. Requests are
+served in-process through httpx's ASGI transport, with the prediction cache
+off so every request runs the model. Each setting runs in its own
+interpreter, because CHIMERA_METRICS_ENABLED is read at import time, and the
+two settings are alternated over several rounds.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+REQUESTS = 2000
+ROUNDS = 3
+OPERATIONS = 1_000_000
+
+
+def primitive_costs() -> dict:
+    """Nanoseconds per histogram observation and counter increment."""
+    from app import metrics
+
+    histogram = metrics.Histogram("benchmark_seconds", "Benchmark histogram.", ["stage"]).labels("x")
+    counter = metrics.Counter("benchmark_total", "Benchmark counter.", ["path"]).labels("x")
+    costs = {}
+    for name, fn in [("histogram_observe", lambda: histogram.observe(0.0003)),
+                     ("counter_inc", counter.inc),
+                     ("perf_counter", time.perf_counter)]:
+        start = time.perf_counter()
+        for _ in range(OPERATIONS):
+            fn()
+        costs[name] = (time.perf_counter() - start) / OPERATIONS * 1e9
+    return costs
+
+
+def request_cost() -> float:
+    """Median microseconds per /predict request, with the current environment."""
+    import asyncio
+
+    import httpx
+
+    from app.main import app
+    from app.model import load_model
+
+    load_model()
+    rng = np.random.default_rng(0)
+    rows = [dict(zip(["pitch_strength_score", "identity_model_score", "momentum_tracker_score"], map(float, r)))
+            for r in rng.uniform(0, 10, (REQUESTS, 3))]
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for row in rows[:100]:  # warm-up
+                await client.post("/predict", json=row)
+            timings = []
+            for row in rows:
+                start = time.perf_counter()
+                await client.post("/predict", json=row)
+                timings.append(time.perf_counter() - start)
+            return timings
+
+    return float(np.median(asyncio.run(run()))) * 1e6
+
+
+def main():
+    print("Cost of one call (ns):")
+    for name, cost in primitive_costs().items():
+        print(f"  {name:<18} {cost:8.0f}")
+
+    # Alternate the two settings and keep the best run of each, so drift in
+    # machine load does not show up as overhead.
+    results = {"1": [], "0": []}
+    for _ in range(ROUNDS):
+        for enabled in results:
+            env = {**os.environ, "CHIMERA_METRICS_ENABLED": enabled, "CHIMERA_CACHE_SIZE": "0",
+                   "CHIMERA_MICROBATCH_ENABLED": "0"}
+            output = subprocess.run([sys.executable, __file__, "--child"], env=env, cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout
+            results[enabled].append(json.loads(output.strip().splitlines()[-1]))
+
+    on, off = min(results["1"]), min(results["0"])
+    print(f"\nMedian POST /predict, in-process, {REQUESTS} requests, best of {ROUNDS} runs:")
+    print(f"  metrics on   {on:8.1f} µs")
+    print(f"  metrics off  {off:8.1f} µs")
+    print(f"  overhead     {on - off:8.1f} µs ({(on - off) / off * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        print(json.dumps(request_cost()))
+    else:
+        main()
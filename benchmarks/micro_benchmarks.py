@@ -0,0 +1,194 @@
+"""
+Micro-benchmarks: every step of predict_and_explain, timed on its own.
+
+Run from the project root:
+    python benchmarks/micro_benchmarks.py
+    python benchmarks/micro_benchmarks.py --sizes 1,10 --components inplace_predict,coalition_shap
+    python benchmarks/micro_benchmarks.py --output micro.json
+
+Each component runs at batch sizes 1, 10, 1,000 and 100,000. It repeats
+until --min-time has passed (at least --min-repeats times), and the median
+is reported. The model is trained with app/ml/train.py's data generator and
+parameters under a fixed seed, so every machine benchmarks the same trees.
+Results are printed as a table and can be written as JSON, one record per
+component and batch size.
+
+Components, in the order a request goes through them:
+    dataframe            pd.DataFrame(rows)[features]  (the original input path)
+    feature_matrix       app.model._feature_matrix     (the current input path)
+    dmatrix              xgb.DMatrix(dataframe)
+    booster_predict      Booster.predict(dmatrix)
+    inplace_predict      Booster.inplace_predict(matrix)
+    compiled_predict     CompiledModel.predict(matrix)
+    tree_explainer       shap.TreeExplainer.shap_values(dataframe)  (needs shap)
+    coalition_shap       CoalitionExplainer.shap_values(matrix)
+    key_drivers          app.model._key_drivers for every row
+    predict_and_explain  app.model.predict_and_explain_many, cache off
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+BATCH_SIZES = [1, 10, 1_000, 100_000]
+SEED = 42
+
+
+def train_benchmark_model(path: str, seed: int = SEED):
+    """
+    Trains the model the way app/ml/train.py does, with every random draw seeded.
+    """
+    import xgboost as xgb
+
+    from app.ml.train import FEATURES, MODEL_PARAMS, NUM_SAMPLES, TARGET, generate_mock_data
+
+    df = generate_mock_data(NUM_SAMPLES, seed)
+    classifier = xgb.XGBClassifier(**{**MODEL_PARAMS, "random_state": seed})
+    classifier.fit(df[FEATURES], df[TARGET])
+    classifier.save_model(path)
+
+
+def make_components(model_path: str) -> dict:
+    """
+    Returns {name: (prepare(rows) -> input, run(input))}.
+
+    `prepare` builds the component's input outside the timed region, so each
+    component is timed on its own.
+    """
+    import pandas as pd
+    import xgboost as xgb
+
+    from app import model
+    from app.compiled_model import CompiledModel
+    from app.registry import ModelRegistry
+
+    booster = xgb.Booster()
+    booster.load_model(model_path)
+    compiled = CompiledModel.from_booster(booster)
+    coalition_explainer = model.CoalitionExplainer(compiled)
+    features = model.feature_names
+
+    # Serve the benchmark model from predict_and_explain_many, without the cache.
+    model.MODEL_PATH = model_path
+    model.registry = ModelRegistry(tempfile.mkdtemp())
+    model.prediction_cache = None
+    model.load_model()
+
+    def dataframe(rows):
+        return pd.DataFrame(rows)[features]
+
+    components = {
+        "dataframe": (lambda rows: rows, dataframe),
+        "feature_matrix": (lambda rows: rows, model._feature_matrix),
+        "dmatrix": (dataframe, xgb.DMatrix),
+        "booster_predict": (lambda rows: xgb.DMatrix(dataframe(rows)), booster.predict),
+        "inplace_predict": (model._feature_matrix, booster.inplace_predict),
+        "compiled_predict": (model._feature_matrix, compiled.predict),
+    }
+    try:
+        import shap
+
+        tree_explainer = shap.TreeExplainer(booster)
+        components["tree_explainer"] = (dataframe, tree_explainer.shap_values)
+    except ImportError:
+        print("shap is not installed; skipping tree_explainer")
+    components.update({
+        "coalition_shap": (model._feature_matrix, coalition_explainer.shap_values),
+        "key_drivers": (lambda rows: coalition_explainer.shap_values(model._feature_matrix(rows)),
+                        lambda shap_values: [model._key_drivers(row) for row in shap_values]),
+        "predict_and_explain": (lambda rows: rows, model.predict_and_explain_many),
+    })
+    return components
+
+
+def time_component(prepare, run, rows, min_time: float, min_repeats: int) -> dict:
+    """
+    Times run(prepare(rows)) repeatedly and summarizes the timings.
+    """
+    data = prepare(rows)
+    run(data)  # warm-up
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_repeats or time.perf_counter() - started < min_time:
+        start = time.perf_counter()
+        run(data)
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "repeats": len(timings),
+        "median_seconds": median,
+        "min_seconds": min(timings),
+        "mean_seconds": statistics.fmean(timings),
+        "ns_per_row": median / len(rows) * 1e9,
+        "rows_per_second": len(rows) / median,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each step of the prediction path.")
+    parser.add_argument("--sizes", default=",".join(map(str, BATCH_SIZES)), help="Comma-separated batch sizes.")
+    parser.add_argument("--components", help="Comma-separated components (default: all).")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to keep repeating each case.")
+    parser.add_argument("--min-repeats", type=int, default=3, help="Fewest repeats per case.")
+    parser.add_argument("--seed", type=int, default=SEED, help="Seed for the model and the inputs.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    model_dir = tempfile.mkdtemp()
+    model_path = os.path.join(model_dir, "benchmark.bst")
+    train_benchmark_model(model_path, args.seed)
+    components = make_components(model_path)
+    if args.components:
+        unknown = set(args.components.split(",")) - set(components)
+        if unknown:
+            parser.error(f"Unknown components: {', '.join(sorted(unknown))}")
+        components = {name: components[name] for name in args.components.split(",")}
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    rng = np.random.default_rng(args.seed)
+    from app.model import feature_names
+
+    records = []
+    print(f"\n{'component':<20} {'rows':>8} {'median µs':>12} {'ns/row':>10} {'rows/sec':>14}")
+    for name, (prepare, run) in components.items():
+        for size in sizes:
+            rows = [dict(zip(feature_names, map(float, row))) for row in rng.uniform(0, 10, (size, 3))]
+            result = {"component": name, "batch_size": size,
+                      **time_component(prepare, run, rows, args.min_time, args.min_repeats)}
+            records.append(result)
+            print(f"{name:<20} {size:>8} {result['median_seconds'] * 1e6:>12.1f} {result['ns_per_row']:>10.0f} "
+                  f"{result['rows_per_second']:>14,.0f}")
+
+    if args.output:
+        import xgboost
+
+        from app.registry import fingerprint
+
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "seed": args.seed,
+            "model_version": fingerprint(model_path),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "xgboost": xgboost.__version__,
+            "cpu_count": os.cpu_count(),
+            "machine": platform.machine(),
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": records}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: memory and throughput as the number of worker processes grows.
+
+Run from the project root (Linux only: memory is read from /proc):
+    python benchmarks/multi_worker.py
+    python benchmarks/multi_worker.py --workers 1,2,4,8 --engine compiled --output workers.json
+
+For each worker count, the API is started twice on a free localhost port:
+    uvicorn  - `uvicorn --workers N`: every worker imports the app and loads the model itself.
+    prefork  - `python -m app.serve --workers N`: the app is loaded once and the workers are forked.
+Each server is driven by benchmarks/load_test.py's /predict scenario. The
+benchmark then reads the memory of every server process:
+    rss_per_worker_mb - mean resident memory of one worker, shared pages included.
+    pss_per_worker_mb - mean proportional memory of one worker; shared pages are
+                        divided between the processes that share them.
+    total_pss_mb      - what the whole server really uses, parent process included.
+
+Throughput only scales with workers while there are idle cores. On a machine
+with fewer cores than workers, the extra workers share the same cores.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from load_test import run_load_test, spawn_server  # noqa: E402
+
+from app.serve import descendants, memory_usage  # noqa: E402
+
+LAUNCHERS = ("uvicorn", "prefork")
+
+
+def server_memory() -> dict:
+    """
+    Memory of the server started by this process.
+
+    Workers are the processes with no children of their own, apart from
+    multiprocessing's resource tracker, which `uvicorn --workers` starts.
+    """
+    processes = descendants(os.getpid())
+    usage = {}
+    for pid in processes:
+        try:
+            usage[pid] = memory_usage(pid)
+        except (OSError, KeyError):
+            continue  # The process exited, or has no memory map.
+    with_children = {parent for parent in processes if any(child in processes for child in descendants(parent))}
+    workers = [usage[pid] for pid in usage if pid not in with_children and not _is_resource_tracker(pid)]
+    return {
+        "processes": len(usage),
+        "workers": len(workers),
+        "rss_per_worker_mb": round(sum(w["rss_mb"] for w in workers) / len(workers), 1),
+        "pss_per_worker_mb": round(sum(w["pss_mb"] for w in workers) / len(workers), 1),
+        "total_pss_mb": round(sum(u["pss_mb"] for u in usage.values()), 1),
+    }
+
+
+def _is_resource_tracker(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return b"resource_tracker" in f.read()
+    except OSError:
+        return False
+
+
+def measure(launcher: str, workers: int, engine: str, concurrency: int, duration: float, warmup: float,
+            settle: float) -> dict:
+    """
+    Starts one server, loads it, and returns its throughput, latency and memory.
+    """
+    env = {"CHIMERA_ENGINE": engine, "CHIMERA_CACHE_SIZE": "0"}
+    with spawn_server(env, workers, launcher) as url:
+        # /ready answers as soon as one worker is up; give the others time to load.
+        time.sleep(settle)
+        results = asyncio.run(run_load_test(["predict"], url, concurrency, duration, warmup))
+        summary = results["scenarios"]["predict"]
+        return {
+            "launcher": launcher,
+            "workers": workers,
+            "requests_per_second": summary["requests_per_second"],
+            "p50_ms": summary["latency_ms"]["p50"],
+            "p99_ms": summary["latency_ms"]["p99"],
+            "error_rate": summary["error_rate"],
+            **server_memory(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare worker launchers as the number of workers grows.")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts.")
+    parser.add_argument("--launchers", default=",".join(LAUNCHERS), help=f"From: {', '.join(LAUNCHERS)}.")
+    parser.add_argument("--engine", default=os.environ.get("CHIMERA_ENGINE", "xgboost"),
+                        help="CHIMERA_ENGINE for the servers.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="Measured seconds per server.")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--settle", type=float, default=3.0,
+                        help="Seconds to wait after /ready for every worker to load.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    records = []
+    for launcher in args.launchers.split(","):
+        for workers in map(int, args.workers.split(",")):
+            print(f"\n{launcher}, {workers} worker(s):")
+            records.append(measure(launcher, workers, args.engine, args.concurrency, args.duration,
+                                   args.warmup, args.settle))
+
+    print(f"\n{args.engine} engine, {os.cpu_count()} CPU(s)")
+    print(f"{'launcher':<9} {'workers':>7} {'req/s':>9} {'p99 ms':>8} {'RSS/worker':>11} "
+          f"{'PSS/worker':>11} {'total PSS':>10}")
+    for r in records:
+        print(f"{r['launcher']:<9} {r['workers']:>7} {r['requests_per_second']:>9.1f} {r['p99_ms']:>8.2f} "
+              f"{r['rss_per_worker_mb']:>9.1f}MB {r['pss_per_worker_mb']:>9.1f}MB {r['total_pss_mb']:>8.1f}MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": {"engine": args.engine, "cpu_count": os.cpu_count(),
+                                "concurrency": args.concurrency, "duration_seconds": args.duration},
+                       "results": records}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
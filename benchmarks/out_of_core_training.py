@@ -0,0 +1,118 @@
+"""
+Benchmark: out-of-core training against the in-memory path.
+
+Run from the project root:
+    python benchmarks/out_of_core_training.py
+    python benchmarks/out_of_core_training.py --rows 20000000 --output training.json
+
+Generates --rows rows of sharded mock data with app/ml/train.py, then trains
+the model on it twice, each in its own interpreter so peak memory is measured
+separately:
+    in_memory    - every training shard loaded into one DataFrame and fitted
+                   with XGBClassifier, as train_model does.
+    out_of_core  - train_from_shards: shards streamed through a DataIter into an
+                   ExtMemQuantileDMatrix.
+Both use MODEL_PARAMS, the "hist" tree method on every core, and the same
+validation shards. Reports wall-clock seconds, peak RSS and validation accuracy.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+MODES = ("in_memory", "out_of_core")
+
+
+def train_in_memory(data_dir: str) -> dict:
+    """
+    Loads every training shard into one DataFrame and trains as train_model does.
+    """
+    import pandas as pd
+    import xgboost as xgb
+
+    from app.ml.train import FEATURES, MODEL_PARAMS, TARGET, read_manifest, split_shards
+
+    start_time = time.perf_counter()
+    train_shards, validation_shards = split_shards(read_manifest(data_dir)["shards"])
+
+    def load(shards):
+        data = np.concatenate([np.load(os.path.join(data_dir, shard["file"])) for shard in shards])
+        df = pd.DataFrame(data[:, :-1], columns=FEATURES)
+        df[TARGET] = data[:, -1].astype(int)
+        return df
+
+    train_df, validation_df = load(train_shards), load(validation_shards)
+    classifier = xgb.XGBClassifier(**MODEL_PARAMS, tree_method="hist", n_jobs=os.cpu_count())
+    classifier.fit(train_df[FEATURES], train_df[TARGET])
+    accuracy = float((classifier.predict(validation_df[FEATURES]) == validation_df[TARGET]).mean())
+    return {
+        "validation_accuracy": round(accuracy, 4),
+        "seconds": round(time.perf_counter() - start_time, 2),
+    }
+
+
+def train_out_of_core(data_dir: str) -> dict:
+    from app.ml.train import train_from_shards
+
+    model_dir = tempfile.mkdtemp()
+    summary = train_from_shards(data_dir, model_path=os.path.join(model_dir, "model.bst"),
+                                compiled_model_path=os.path.join(model_dir, "model.json"), publish=False)
+    return {key: summary[key] for key in ("validation_accuracy", "seconds")}
+
+
+def run_child(mode: str, data_dir: str) -> dict:
+    from app.ml.train import peak_rss_mb
+
+    result = train_in_memory(data_dir) if mode == "in_memory" else train_out_of_core(data_dir)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare out-of-core and in-memory training.")
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Rows of mock data to train on.")
+    parser.add_argument("--shard-rows", type=int, default=500_000)
+    parser.add_argument("--data", help="Use the shards in this directory instead of generating new ones.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    from app.ml.train import generate_shards
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data or os.path.join(tmp, "data")
+        if not args.data:
+            generate_shards(data_dir, args.rows, args.shard_rows, workers=os.cpu_count() or 1)
+
+        results = {}
+        for mode in MODES:
+            print(f"\nTraining {mode}...")
+            output = subprocess.run([sys.executable, __file__, "--child", mode, data_dir], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"\n{'mode':<12} {'seconds':>8} {'peak RSS':>10} {'accuracy':>9}")
+    for mode, result in results.items():
+        peak = f"{result['peak_rss_mb']:>8.1f}MB" if result["peak_rss_mb"] is not None else f"{'-':>10}"
+        print(f"{mode:<12} {result['seconds']:>8.2f} {peak} {result['validation_accuracy']:>9.4f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": {"rows": args.rows, "cpu_count": os.cpu_count()}, "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        mode, data_dir = sys.argv[sys.argv.index("--child") + 1:][:2]
+        print(json.dumps(run_child(mode, data_dir)))
+    else:
+        main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: requests per second per core with and without response validation.
+
+Run from the project root:
+    python benchmarks/response_validation.py
+
+Sends POST /predict and POST /predict/batch (100 rows) requests one at a time,
+in-process through httpx's ASGI transport. The prediction cache and
+micro-batching are off, so every request runs the model. With one client and
+no network, the request rate is what a single core can serve.
+
+Each setting of CHIMERA_RESPONSE_VALIDATION runs in its own interpreter,
+because it is read at import time, and the two settings are alternated over
+several rounds. The best round of each is reported.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+REQUESTS = 2000
+BATCH_SIZE = 100
+ROUNDS = 3
+FEATURES = ["pitch_strength_score", "identity_model_score", "momentum_tracker_score"]
+
+
+def request_rates() -> dict:
+    """Requests per second for each endpoint, with the current environment."""
+    import asyncio
+
+    import httpx
+
+    from app.main import app
+    from app.model import load_model
+
+    load_model()
+    rng = np.random.default_rng(0)
+    rows = [dict(zip(FEATURES, map(float, r))) for r in rng.uniform(0, 10, (REQUESTS, 3))]
+    cases = {
+        "predict": ("/predict", rows),
+        "predict_no_explain": ("/predict?explain=none", rows),
+        "batch": ("/predict/batch", [rows[i:i + BATCH_SIZE] for i in range(0, REQUESTS, BATCH_SIZE)] * 5),
+    }
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        rates = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name, (path, payloads) in cases.items():
+                for payload in payloads[:50]:  # warm-up
+                    await client.post(path, json=payload)
+                start = time.perf_counter()
+                for payload in payloads:
+                    await client.post(path, json=payload)
+                rates[name] = len(payloads) / (time.perf_counter() - start)
+        return rates
+
+    return asyncio.run(run())
+
+
+def main():
+    # Alternate the two settings and keep the best run of each, so drift in
+    # machine load does not show up as a difference.
+    results = {"1": [], "0": []}
+    for _ in range(ROUNDS):
+        for validate in results:
+            env = {**os.environ, "CHIMERA_RESPONSE_VALIDATION": validate, "CHIMERA_CACHE_SIZE": "0",
+                   "CHIMERA_MICROBATCH_ENABLED": "0"}
+            output = subprocess.run([sys.executable, __file__, "--child"], env=env, cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout
+            results[validate].append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"\nRequests/sec on one core, in-process, best of {ROUNDS} runs:")
+    print(f"  {'endpoint':<20} {'validated':>10} {'skipped':>10} {'change':>8}")
+    for name in results["1"][0]:
+        validated = max(run[name] for run in results["1"])
+        skipped = max(run[name] for run in results["0"])
+        print(f"  {name:<20} {validated:>10.1f} {skipped:>10.1f} {(skipped - validated) / validated:>+8.1%}")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        print(json.dumps(request_rates()))
+    else:
+        main()
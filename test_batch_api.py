@@ -0,0 +1,55 @@
+"""
+Test script for the batch prediction endpoint and predict_and_explain_many
+"""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.model import predict_and_explain, predict_and_explain_many
+
+BATCH = [
+    {"pitch_strength_score": 8.5, "identity_model_score": 7.2, "momentum_tracker_score": 6.8},
+    {"pitch_strength_score": 4.5, "identity_model_score": 5.0, "momentum_tracker_score": 3.2},
+    {"pitch_strength_score": 9.0, "identity_model_score": 3.5, "momentum_tracker_score": 5.5},
+    {"pitch_strength_score": 3.0, "identity_model_score": 8.5, "momentum_tracker_score": 6.0},
+]
+
+
+def test_predict_and_explain_many_matches_single():
+    """The vectorized path must return the same results as the single-row path, in order"""
+    print("🧪 Testing predict_and_explain_many...")
+
+    batch_results = predict_and_explain_many(BATCH)
+    assert len(batch_results) == len(BATCH)
+
+    for row, batch_result in zip(BATCH, batch_results):
+        single_result = predict_and_explain(row)
+        assert abs(batch_result["prediction_score"] - single_result["prediction_score"]) < 1e-6
+        assert batch_result["prediction_label"] == single_result["prediction_label"]
+        assert batch_result["key_drivers"] == single_result["key_drivers"]
+
+    assert predict_and_explain_many([]) == []
+    print("✅ Batch results match single-row results")
+
+
+def test_batch_endpoint():
+    """The /predict/batch endpoint returns one prediction per input row"""
+    print("🧪 Testing /predict/batch endpoint...")
+    client = TestClient(app)
+
+    response = client.post("/predict/batch", json=BATCH)
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["prediction_score"] for r in results] == [
+        r["prediction_score"] for r in predict_and_explain_many(BATCH)
+    ]
+
+    # Out-of-range scores are rejected by the same validation as /predict.
+    bad_batch = BATCH + [{"pitch_strength_score": 11, "identity_model_score": 5, "momentum_tracker_score": 5}]
+    assert client.post("/predict/batch", json=bad_batch).status_code == 422
+    print("✅ Batch endpoint working")
+
+
+if __name__ == "__main__":
+    test_predict_and_explain_many_matches_single()
+    test_batch_endpoint()
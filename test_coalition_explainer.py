@@ -0,0 +1,44 @@
+"""
+Equivalence test: the coalition-table explainer against shap.TreeExplainer
+"""
+
+import numpy as np
+import shap
+
+from app.compiled_model import CompiledModel
+from app.model import CoalitionExplainer, explainer, model
+
+
+def test_coalition_explainer_matches_shap():
+    """SHAP values and expected value agree with shap.TreeExplainer"""
+    print("🧪 Testing CoalitionExplainer...")
+    reference = shap.TreeExplainer(model)
+
+    rng = np.random.default_rng(3)
+    X = rng.uniform(0, 10, (3000, 3)).astype(np.float32)
+    X[:1000] = np.round(X[:1000], 1)   # on-grid values, including exact split thresholds' neighbours
+    X[1000:1010, 0] = np.nan           # missing values follow each split's default branch
+    X[1010:1020, 2] = np.nan
+
+    np.testing.assert_allclose(explainer.shap_values(X), reference.shap_values(X), atol=1e-5)
+    assert abs(explainer.expected_value - float(reference.expected_value)) < 1e-5
+
+    # Explaining rows one at a time gives the same answer as one batch.
+    np.testing.assert_allclose(
+        np.vstack([explainer.shap_values(row[None, :]) for row in X[:20]]),
+        explainer.shap_values(X[:20]),
+        atol=1e-5
+    )
+    print("✅ Coalition tables match shap.TreeExplainer")
+
+
+def test_coalition_explainer_matches_compiled_treeshap():
+    """The tables agree with the traversal-based TreeSHAP in CompiledModel"""
+    compiled = CompiledModel.from_booster(model)
+    X = np.random.default_rng(4).uniform(0, 10, (500, 3))
+    np.testing.assert_allclose(CoalitionExplainer(compiled).shap_values(X), compiled.shap_values(X), atol=1e-5)
+
+
+if __name__ == "__main__":
+    test_coalition_explainer_matches_shap()
+    test_coalition_explainer_matches_compiled_treeshap()
@@ -0,0 +1,70 @@
+"""
+Equivalence test: the NumPy-only compiled model against the XGBoost booster and SHAP
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import shap
+import xgboost as xgb
+
+from app.compiled_model import CompiledModel
+from app.model import COMPILED_MODEL_PATH, MODEL_PATH
+
+
+def load_reference():
+    booster = xgb.Booster()
+    booster.load_model(MODEL_PATH)
+    return booster, shap.TreeExplainer(booster)
+
+
+def test_compiled_model_matches_booster():
+    """Predictions and SHAP values agree with XGBoost + shap.TreeExplainer"""
+    print("🧪 Testing CompiledModel equivalence...")
+    booster, explainer = load_reference()
+    compiled = CompiledModel.from_booster(booster)
+
+    rng = np.random.default_rng(7)
+    X = rng.uniform(0, 10, (2000, 3)).astype(np.float32)
+    X[:500] = np.round(X[:500], 1)   # on-grid values, as sent by the demo sliders
+    X[500:510, 1] = np.nan           # missing values follow each split's default branch
+
+    np.testing.assert_allclose(compiled.predict(X), booster.inplace_predict(X), atol=1e-6)
+    np.testing.assert_allclose(compiled.shap_values(X), explainer.shap_values(X), atol=1e-5)
+    assert abs(compiled.expected_value - float(explainer.expected_value)) < 1e-5
+    print("✅ Compiled model matches the booster")
+
+
+def test_compiled_model_loads_from_json():
+    """The JSON file written by train.py gives the same model as the booster"""
+    booster, _ = load_reference()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, os.path.basename(COMPILED_MODEL_PATH))
+        booster.save_model(json_path)
+        from_json = CompiledModel.from_json(json_path)
+
+    X = np.array([[8.5, 7.2, 6.8], [4.5, 5.0, 3.2]], dtype=np.float32)
+    np.testing.assert_allclose(from_json.predict(X), booster.inplace_predict(X), atol=1e-6)
+    assert from_json.feature_names == ["pitch_strength_score", "identity_model_score", "momentum_tracker_score"]
+
+
+def test_compiled_engine_skips_xgboost_and_shap():
+    """With CHIMERA_ENGINE=compiled, serving never imports xgboost or shap"""
+    code = (
+        "import sys; from app.model import predict_and_explain; "
+        "predict_and_explain({'pitch_strength_score': 8.5, 'identity_model_score': 7.2, 'momentum_tracker_score': 6.8}); "
+        "print('xgboost' in sys.modules, 'shap' in sys.modules)"
+    )
+    env = dict(os.environ, CHIMERA_ENGINE="compiled")
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert output.stdout.strip().splitlines()[-1] == "False False"
+    print("✅ Compiled engine runs without xgboost and shap")
+
+
+if __name__ == "__main__":
+    test_compiled_model_matches_booster()
+    test_compiled_model_loads_from_json()
+    test_compiled_engine_skips_xgboost_and_shap()
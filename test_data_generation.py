@@ -0,0 +1,80 @@
+"""
+Test script for the sharded mock data generator in app/ml/train.py
+"""
+
+import filecmp
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from app.ml.train import FEATURES, TARGET, generate_mock_data, generate_shards
+
+
+def test_shards_are_reproducible():
+    """The same seed gives the same shards, whatever the number of workers or the chunk size"""
+    print("🧪 Testing sharded data generation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = os.path.join(tmp, "first"), os.path.join(tmp, "second")
+        manifest = generate_shards(first, 25_000, shard_rows=10_000, chunk_rows=3_000, seed=7)
+        generate_shards(second, 25_000, shard_rows=10_000, chunk_rows=10_000, seed=7, workers=2)
+
+        assert [shard["rows"] for shard in manifest["shards"]] == [10_000, 10_000, 5_000]
+        with open(os.path.join(first, "manifest.json")) as f:
+            assert json.load(f) == manifest
+        for shard in manifest["shards"]:
+            assert filecmp.cmp(os.path.join(first, shard["file"]), os.path.join(second, shard["file"]),
+                               shallow=False)
+        assert not [name for name in os.listdir(first) if name.endswith(".tmp")]
+
+        data = np.concatenate([np.load(os.path.join(first, shard["file"])) for shard in manifest["shards"]])
+        assert data.shape == (25_000, len(FEATURES) + 1) and data.dtype == np.float32
+        assert 1 <= data[:, :-1].min() and data[:, :-1].max() <= 10
+        assert set(np.unique(data[:, -1])) == {0, 1}
+        assert 0.3 < data[:, -1].mean() < 0.7
+
+        # Shards are independent streams, and another seed gives other data.
+        assert not np.array_equal(data[:10_000], data[10_000:20_000])
+        generate_shards(second, 10_000, shard_rows=10_000, seed=8)
+        assert not np.array_equal(np.load(os.path.join(second, "shard-00000.npy")), data[:10_000])
+    print("✅ Sharded data generation working")
+
+
+def test_mock_data_matches_first_shard():
+    """generate_mock_data is seeded and returns the start of shard 0"""
+    df = generate_mock_data(500, seed=7)
+    assert df.equals(generate_mock_data(500, seed=7))
+    assert list(df.columns) == FEATURES + [TARGET]
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_shards(tmp, 1_000, seed=7)
+        shard = np.load(os.path.join(tmp, "shard-00000.npy"))
+    np.testing.assert_array_equal(df[FEATURES].to_numpy(np.float32), shard[:500, :-1])
+    np.testing.assert_array_equal(df[TARGET].to_numpy(), shard[:500, -1])
+
+
+def test_parquet_shards():
+    """Parquet shards hold the same rows as .npy shards"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("⚠️  pyarrow not installed, skipping Parquet test")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_shards(os.path.join(tmp, "npy"), 5_000, shard_rows=2_000, chunk_rows=700, seed=3)
+        manifest = generate_shards(os.path.join(tmp, "parquet"), 5_000, shard_rows=2_000, chunk_rows=700, seed=3,
+                                   file_format="parquet")
+        for shard in manifest["shards"]:
+            table = pd.read_parquet(os.path.join(tmp, "parquet", shard["file"]))
+            array = np.load(os.path.join(tmp, "npy", shard["file"].replace(".parquet", ".npy")))
+            assert list(table.columns) == FEATURES + [TARGET]
+            np.testing.assert_array_equal(table[FEATURES].to_numpy(), array[:, :-1])
+            np.testing.assert_array_equal(table[TARGET].to_numpy(), array[:, -1])
+
+
+if __name__ == "__main__":
+    test_shards_are_reproducible()
+    test_mock_data_matches_first_shard()
+    test_parquet_shards()
@@ -0,0 +1,117 @@
+"""
+Test script for running inference off the event loop with bounded concurrency
+"""
+
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app import metrics
+from app.executor import InferenceExecutor, Overloaded
+from app.model import predict_and_explain, predict_and_explain_many, predict_items
+
+TEST_INPUT = {"pitch_strength_score": 8.5, "identity_model_score": 7.2, "momentum_tracker_score": 6.8}
+
+
+def test_executor_runs_off_the_event_loop():
+    """Inference runs in a worker thread, not on the event loop thread"""
+    print("🧪 Testing InferenceExecutor...")
+    executor = InferenceExecutor(kind="thread", max_workers=2, max_pending=4)
+    loop_thread = []
+
+    async def run():
+        loop_thread.append(threading.get_ident())
+        return await executor.run(lambda: (threading.get_ident(), predict_and_explain(TEST_INPUT)))
+
+    worker_thread, result = asyncio.run(run())
+    assert worker_thread != loop_thread[0]
+    assert result == predict_and_explain(TEST_INPUT)
+    executor.shutdown()
+    print("✅ Inference runs in the worker pool")
+
+
+def test_executor_rejects_when_full():
+    """Calls beyond max_pending raise Overloaded instead of queueing"""
+    executor = InferenceExecutor(kind="thread", max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def run():
+        blocked = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0)
+        try:
+            await executor.run(predict_and_explain, TEST_INPUT)
+        except Overloaded:
+            rejected = True
+        else:
+            rejected = False
+        release.set()
+        await blocked
+        return rejected
+
+    assert asyncio.run(run())
+    assert executor.stats()["rejected_total"] == 1
+    executor.shutdown()
+
+
+def test_overloaded_requests_get_503():
+    """The API answers 503 with Retry-After while the pool is full"""
+    client = TestClient(main.app)
+    original = main.executor.max_pending
+    main.executor.max_pending = 0
+    try:
+        response = client.post("/predict/batch", json=[TEST_INPUT])
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        # The health check does not touch the inference pool.
+        assert client.get("/").status_code == 200
+    finally:
+        main.executor.max_pending = original
+
+    assert client.post("/predict/batch", json=[TEST_INPUT]).status_code == 200
+    print("✅ Backpressure returns 503")
+
+
+def test_process_pool_reports_stage_timings():
+    """Model stages timed in a worker process are added to this process's metrics"""
+    print("🧪 Testing stage timings from the process pool...")
+    executor = InferenceExecutor(kind="process", max_workers=1, max_pending=2)
+    before = [stage.snapshot() for stage in metrics.MODEL_STAGES]
+    rows = [{**TEST_INPUT, "pitch_strength_score": 1.23 + i / 7} for i in range(3)]  # off the cache grid
+
+    results = asyncio.run(executor.run(predict_and_explain_many, rows))
+    assert results == predict_and_explain_many(rows)
+    executor.shutdown()
+
+    if metrics.ENABLED:
+        # The in-process call above timed each stage once more.
+        for stage, (counts, total) in zip(metrics.MODEL_STAGES, before):
+            after_counts, after_total = stage.snapshot()
+            assert sum(after_counts) - sum(counts) == 2 and after_total > total
+    print("✅ Process pool stage timings reach /metrics")
+
+
+def test_process_pool_workers_do_not_import_the_api():
+    """Micro-batches sent to a worker process only pull in app.model, not the FastAPI app"""
+    print("🧪 Testing what process pool workers import...")
+    executor = InferenceExecutor(kind="process", max_workers=1, max_pending=2)
+    items = [({**TEST_INPUT, "pitch_strength_score": 2.34}, False), (TEST_INPUT, True)]
+
+    results = asyncio.run(executor.run(predict_items, items))
+    imported_api = asyncio.run(executor.run(eval, "'app.main' in __import__('sys').modules"))
+    executor.shutdown()
+
+    assert [result["prediction_score"] for result in results] == \
+        [result["prediction_score"] for result in predict_and_explain_many([row for row, _ in items])]
+    assert results[0]["key_drivers"] == [] and results[1]["key_drivers"]
+    assert not imported_api
+    print("✅ Process pool workers only import the model")
+
+
+if __name__ == "__main__":
+    test_executor_runs_off_the_event_loop()
+    test_executor_rejects_when_full()
+    test_overloaded_requests_get_503()
+    test_process_pool_reports_stage_timings()
+    test_process_pool_workers_do_not_import_the_api()
@@ -0,0 +1,65 @@
+"""
+Test script for skipping or deferring explanations on the prediction endpoints
+"""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.model import explain_many, predict_and_explain, predict_and_explain_many
+
+TEST_INPUT = {"pitch_strength_score": 8.5, "identity_model_score": 7.2, "momentum_tracker_score": 6.8}
+OTHER_INPUT = {"pitch_strength_score": 3.0, "identity_model_score": 8.5, "momentum_tracker_score": 6.0}
+
+
+def test_model_explain_flags():
+    """Scoring-only rows skip SHAP but keep the same score"""
+    full = predict_and_explain(TEST_INPUT)
+    assert predict_and_explain(TEST_INPUT, explain=False) == {**full, "key_drivers": []}
+
+    mixed = predict_and_explain_many([TEST_INPUT, OTHER_INPUT], explain=[False, True])
+    assert mixed[0]["key_drivers"] == []
+    assert mixed[1] == predict_and_explain(OTHER_INPUT)
+    assert explain_many([TEST_INPUT]) == [full["key_drivers"]]
+
+
+def test_explain_none():
+    """?explain=none returns the score with no key drivers"""
+    print("🧪 Testing explain options...")
+    client = TestClient(app)
+    expected = predict_and_explain(TEST_INPUT)
+
+    response = client.post("/predict?explain=none", json=TEST_INPUT)
+    assert response.status_code == 200
+    assert response.json() == {**expected, "key_drivers": []}
+
+    # The default response is unchanged: no explanation_id field.
+    assert client.post("/predict", json=TEST_INPUT).json() == expected
+    assert client.post("/predict?explain=sometimes", json=TEST_INPUT).status_code == 422
+    print("✅ explain=none working")
+
+
+def test_explain_deferred():
+    """?explain=deferred returns an id whose key drivers can be fetched later"""
+    expected = predict_and_explain(TEST_INPUT)
+    # Background tasks have finished once TestClient returns the response.
+    with TestClient(app) as client:
+        result = client.post("/predict?explain=deferred", json=TEST_INPUT).json()
+        assert result["prediction_score"] == expected["prediction_score"]
+        assert result["key_drivers"] == []
+
+        explanation = client.get(f"/explanations/{result['explanation_id']}").json()
+        assert explanation["status"] == "ready"
+        assert explanation["key_drivers"] == expected["key_drivers"]
+
+        batch = client.post("/predict/batch?explain=deferred", json=[TEST_INPUT, OTHER_INPUT]).json()
+        drivers = [client.get(f"/explanations/{r['explanation_id']}").json()["key_drivers"] for r in batch]
+        assert drivers == explain_many([TEST_INPUT, OTHER_INPUT])
+
+        assert client.get("/explanations/does-not-exist").status_code == 404
+    print("✅ explain=deferred working")
+
+
+if __name__ == "__main__":
+    test_model_explain_flags()
+    test_explain_none()
+    test_explain_deferred()
@@ -0,0 +1,48 @@
+"""
+Parity test: the pandas-free inplace_predict path against the original DataFrame + DMatrix path
+"""
+
+import numpy as np
+import pandas as pd
+import shap
+import xgboost as xgb
+
+from app.model import MODEL_VERSION, feature_names, model, predict_and_explain, predict_and_explain_many
+
+explainer = shap.TreeExplainer(model)
+
+
+def reference_predict_and_explain(input_data: dict) -> dict:
+    """The original implementation: one DataFrame, one DMatrix and shap.TreeExplainer per request"""
+    input_df = pd.DataFrame([input_data])[feature_names]
+    prediction_score = model.predict(xgb.DMatrix(input_df))[0]
+    shap_values = explainer.shap_values(input_df)
+    feature_impact = dict(zip(feature_names, shap_values[0]))
+    sorted_drivers = sorted(feature_impact.items(), key=lambda item: abs(item[1]), reverse=True)
+    return {
+        "prediction_score": float(prediction_score),
+        "prediction_label": "Likely to Fund" if prediction_score > 0.5 else "Unlikely to Fund",
+        "key_drivers": [f"Impact of {name.replace('_', ' ').title()}" for name, _ in sorted_drivers[:2]],
+        "model_version": MODEL_VERSION,
+    }
+
+
+def test_fast_path_matches_reference():
+    """Scores, labels and drivers are identical to the DataFrame/DMatrix path"""
+    print("🧪 Testing fast-path parity...")
+    rng = np.random.default_rng(42)
+    # Random off-grid inputs plus the 0.1-step values the demo sliders produce.
+    inputs = [dict(zip(feature_names, map(float, row))) for row in rng.uniform(0, 10, (200, 3))]
+    inputs += [dict(zip(feature_names, map(float, row))) for row in rng.integers(0, 101, (200, 3)) / 10]
+
+    batch_results = predict_and_explain_many(inputs)
+    for input_data, batch_result in zip(inputs, batch_results):
+        expected = reference_predict_and_explain(input_data)
+        assert predict_and_explain(input_data) == expected
+        assert batch_result == expected
+
+    print(f"✅ {len(inputs)} inputs match the reference path exactly")
+
+
+if __name__ == "__main__":
+    test_fast_path_matches_reference()
@@ -0,0 +1,79 @@
+"""
+Test script for FastJSONResponse and CHIMERA_RESPONSE_VALIDATION=0
+"""
+
+import json
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app import main as main_module
+from app import responses
+from app.main import app
+from app.responses import FastJSONResponse
+
+TEST_INPUT = {"pitch_strength_score": 8.5, "identity_model_score": 7.2, "momentum_tracker_score": 6.8}
+OTHER_INPUT = {"pitch_strength_score": 3.0, "identity_model_score": 8.5, "momentum_tracker_score": 6.0}
+
+REQUESTS = [
+    ("/predict", TEST_INPUT),
+    ("/predict?explain=none", TEST_INPUT),
+    ("/predict/batch", [TEST_INPUT, OTHER_INPUT]),
+    ("/predict/batch?explain=none", [TEST_INPUT, OTHER_INPUT]),
+    ("/predict", {"pitch_strength_score": 11}),
+]
+
+
+def _responses(validate: bool) -> list:
+    original = main_module.RESPONSE_VALIDATION
+    main_module.RESPONSE_VALIDATION = validate
+    try:
+        client = TestClient(app)
+        return [client.post(path, json=body) for path, body in REQUESTS]
+    finally:
+        main_module.RESPONSE_VALIDATION = original
+
+
+def test_contract_is_unchanged_without_validation():
+    """Skipping response validation gives the same status, headers, fields and field order"""
+    print("🧪 Testing fast JSON responses...")
+    for validated, fast in zip(_responses(True), _responses(False)):
+        assert validated.status_code == fast.status_code
+        assert validated.headers["content-type"] == fast.headers["content-type"]
+        # Byte for byte: same keys, same order, same number formatting, and
+        # no explanation_id unless one was asked for.
+        assert validated.content == fast.content
+    print("✅ Fast JSON responses match the validated ones")
+
+
+def test_deferred_explanations_without_validation():
+    """Background tasks still run when the endpoint returns its own response"""
+    main_module.RESPONSE_VALIDATION = False
+    try:
+        with TestClient(app) as client:
+            result = client.post("/predict?explain=deferred", json=TEST_INPUT).json()
+            explanation = client.get(f"/explanations/{result['explanation_id']}").json()
+            assert explanation["status"] == "ready"
+    finally:
+        main_module.RESPONSE_VALIDATION = True
+
+
+def test_numpy_values_and_json_fallback():
+    """NumPy scalars and arrays are encoded as JSON numbers, with or without orjson"""
+    content = {"score": np.float64(0.25), "count": np.int64(3), "values": np.array([1.5, 2.0]), "label": "é"}
+    expected = {"score": 0.25, "count": 3, "values": [1.5, 2.0], "label": "é"}
+    assert json.loads(FastJSONResponse(content).body) == expected
+
+    original = responses.orjson
+    responses.orjson = None
+    try:
+        body = FastJSONResponse(content).body
+    finally:
+        responses.orjson = original
+    assert body == '{"score":0.25,"count":3,"values":[1.5,2.0],"label":"é"}'.encode()
+
+
+if __name__ == "__main__":
+    test_contract_is_unchanged_without_validation()
+    test_deferred_explanations_without_validation()
+    test_numpy_values_and_json_fallback()
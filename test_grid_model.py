@@ -0,0 +1,69 @@
+"""
+Test script for the precomputed lookup grid serving engine
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from app.grid_model import GridModel
+from app.ml.build_grid import build_grid
+from app.model import MODEL_PATH
+
+
+def test_grid_lookup_and_interpolation():
+    """On-grid lookups match the booster; off-grid lookups interpolate between grid points"""
+    print("🧪 Testing GridModel...")
+    booster = xgb.Booster()
+    booster.load_model(MODEL_PATH)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        grid_path = os.path.join(tmp, "grid.npy")
+        # A coarse 11^3 grid keeps the test fast; serving uses step 0.1.
+        metadata = build_grid(MODEL_PATH, grid_path, step=1.0, error_samples=2000)
+        grid = GridModel.load(grid_path)
+        assert grid.points == 11
+        assert grid.max_interpolation_error == metadata["max_score_interpolation_error"]
+
+        # Every grid point returns exactly the booster's score and SHAP values.
+        on_grid = np.array([[2, 5, 9], [0, 0, 0], [10, 10, 10], [7, 3, 1]], dtype=np.float32)
+        contribs = booster.predict(xgb.DMatrix(on_grid, feature_names=booster.feature_names), pred_contribs=True)
+        np.testing.assert_allclose(grid.predict(on_grid), booster.inplace_predict(on_grid), atol=1e-6)
+        np.testing.assert_allclose(grid.shap_values(on_grid), contribs[:, :-1], atol=1e-5)
+
+        # Half-way between two grid points is the average of both.
+        midpoint = grid.predict([[2.5, 5, 9]])[0]
+        assert abs(midpoint - (grid.predict([[2, 5, 9]])[0] + grid.predict([[3, 5, 9]])[0]) / 2) < 1e-6
+
+        # Interpolated scores are still probabilities.
+        sample = np.random.default_rng(1).uniform(0, 10, (500, 3))
+        scores = grid.predict(sample)
+        assert ((scores >= 0) & (scores <= 1)).all()
+
+    print("✅ Grid lookups working")
+
+
+def test_grid_must_cover_the_input_range():
+    """Steps that do not divide 0-10 evenly are rejected, and so are grids that stop short of 10"""
+    with tempfile.TemporaryDirectory() as tmp:
+        grid_path = os.path.join(tmp, "grid.npy")
+        with pytest.raises(ValueError):
+            build_grid(MODEL_PATH, grid_path, step=0.3)
+        assert not os.path.exists(grid_path)
+
+        # A grid written with step 3 stops at 9 (points 0, 3, 6, 9).
+        np.save(grid_path, np.zeros((4, 4, 4, 4), dtype=np.float32))
+        metadata = {"low": 0.0, "high": 10.0, "step": 3.0, "feature_names": ["a", "b", "c"]}
+        with open(os.path.join(tmp, "grid.json"), "w") as f:
+            json.dump(metadata, f)
+        with pytest.raises(ValueError, match="ends at 9.0"):
+            GridModel.load(grid_path)
+
+
+if __name__ == "__main__":
+    test_grid_lookup_and_interpolation()
+    test_grid_must_cover_the_input_range()
@@ -0,0 +1,83 @@
+"""
+Test script for incremental model updates in app/ml/train.py
+"""
+
+import os
+import tempfile
+
+import pytest
+import xgboost as xgb
+
+from app.ml.train import (
+    FEATURES, MODEL_PARAMS, TARGET, generate_mock_data, generate_shards, load_shards, save_model, update_model
+)
+
+
+def _base_model(path: str):
+    df = generate_mock_data(5_000)
+    classifier = xgb.XGBClassifier(**MODEL_PARAMS)
+    classifier.fit(df[FEATURES], df[TARGET])
+    classifier.get_booster().save_model(path)
+
+
+@pytest.mark.parametrize("mode, trees", [("continue", MODEL_PARAMS["n_estimators"] + 10),
+                                         ("refresh", MODEL_PARAMS["n_estimators"])])
+def test_update_model(mode, trees):
+    """Continue adds trees, refresh keeps them, and both are measured on held-out new rows"""
+    print(f"🧪 Testing incremental update ({mode})...")
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path, model_path = os.path.join(tmp, "base.bst"), os.path.join(tmp, "model.bst")
+        _base_model(base_path)
+        summary = update_model(generate_mock_data(5_000, seed=7), mode, rounds=10, base_model_path=base_path,
+                               model_path=model_path, compiled_model_path=os.path.join(tmp, "model.json"),
+                               publish=False)
+
+        assert summary["mode"] == mode and summary["version"] is None
+        assert summary["update_rows"] == 4_000 and summary["holdout_rows"] == 1_000
+        assert summary["trees"] == trees == xgb.Booster(model_file=model_path).num_boosted_rounds()
+        assert summary["holdout_after"]["accuracy"] > 0.7
+        assert summary["holdout_after"]["logloss"] < summary["holdout_before"]["logloss"] + 0.05
+        assert os.path.exists(os.path.join(tmp, "model.json"))
+    print(f"✅ Incremental update ({mode}) working")
+
+
+def test_continue_keeps_the_base_parameters():
+    """New trees are grown with the parameters the base model was trained with, not the defaults"""
+    print("🧪 Testing incremental update with a shallow base model...")
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path, model_path = os.path.join(tmp, "base.bst"), os.path.join(tmp, "model.bst")
+        df = generate_mock_data(5_000)
+        classifier = xgb.XGBClassifier(**{**MODEL_PARAMS, "max_depth": 1, "learning_rate": 0.3})
+        classifier.fit(df[FEATURES], df[TARGET])
+        save_model(classifier, {}, base_path, os.path.join(tmp, "base.json"), publish=False)
+
+        update_model(generate_mock_data(5_000, seed=7), "continue", rounds=10, base_model_path=base_path,
+                     model_path=model_path, compiled_model_path=os.path.join(tmp, "model.json"), publish=False)
+
+        # Every tree, old and new, is a single split: depth-1 trees have no nested nodes.
+        dump = xgb.Booster(model_file=model_path).get_dump()
+        assert len(dump) == MODEL_PARAMS["n_estimators"] + 10
+        assert all("\t\t" not in tree for tree in dump)
+    print("✅ Incremental update keeps the base parameters")
+
+
+def test_load_shards():
+    """Shards written by generate_shards load back into one DataFrame"""
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_shards(tmp, 2_500, shard_rows=1_000)
+        df = load_shards(tmp)
+        assert list(df.columns) == FEATURES + [TARGET] and len(df) == 2_500
+        assert set(df[TARGET].unique()) <= {0, 1}
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        update_model(generate_mock_data(100), mode="retrain")
+
+
+if __name__ == "__main__":
+    test_update_model("continue", MODEL_PARAMS["n_estimators"] + 10)
+    test_update_model("refresh", MODEL_PARAMS["n_estimators"])
+    test_continue_keeps_the_base_parameters()
+    test_load_shards()
+    test_unknown_mode()
@@ -0,0 +1,47 @@
+"""
+Test script for the load-testing harness in benchmarks/load_test.py
+"""
+
+import asyncio
+import copy
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+from load_test import compare, make_rows, run_load_test  # noqa: E402
+
+
+def test_inputs_are_reproducible():
+    """The same seed gives the same inputs, and grid_fraction puts that share on the 0.1 grid"""
+    assert make_rows(100, seed=1) == make_rows(100, seed=1)
+    on_grid = [row for row in make_rows(1000, seed=1, grid_fraction=0.5)
+               if all(round(value, 1) == value for value in row.values())]
+    assert 400 < len(on_grid) < 600
+
+
+def test_in_process_run_and_baseline_comparison():
+    """A short in-process run reports throughput and percentiles, and slower runs are flagged"""
+    print("🧪 Testing load test harness...")
+    results = asyncio.run(run_load_test(["predict", "batch"], concurrency=2, duration=0.3, warmup=0.1,
+                                        batch_size=10))
+    for scenario in ("predict", "batch"):
+        summary = results["scenarios"][scenario]
+        assert summary["requests"] > 0 and summary["requests_per_second"] > 0
+        latency = summary["latency_ms"]
+        assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["p999"] <= latency["max"]
+    batch = results["scenarios"]["batch"]
+    assert abs(batch["rows_per_second"] - batch["requests_per_second"] * 10) < 1
+
+    assert compare(results, results, tolerance=0.1) == []
+    faster = copy.deepcopy(results)
+    faster["scenarios"]["predict"]["requests_per_second"] *= 2
+    faster["scenarios"]["predict"]["latency_ms"]["p99"] /= 2
+    regressions = compare(results, faster, tolerance=0.1)
+    assert [r.split()[:2] for r in regressions] == [["predict", "requests_per_second"], ["predict", "p99"]]
+    print("✅ Load test harness working")
+
+
+if __name__ == "__main__":
+    test_inputs_are_reproducible()
+    test_in_process_run_and_baseline_comparison()
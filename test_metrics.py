@@ -0,0 +1,73 @@
+"""
+Test script for the Prometheus metrics endpoint
+"""
+
+import re
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.metrics import Counter, Histogram
+
+TEST_INPUT = {"pitch_strength_score": 8.1, "identity_model_score": 3.3, "momentum_tracker_score": 5.55}
+
+
+def test_histogram_buckets_are_cumulative():
+    """Observations land in the right bucket and render as cumulative Prometheus buckets"""
+    histogram = Histogram("test_duration_seconds", "Test histogram.", ["stage"], buckets=(0.1, 1.0))
+    child = histogram.labels("a")
+    for value in (0.05, 0.1, 0.5, 5.0):
+        child.observe(value)
+    assert child.counts == [2, 1, 1]
+    assert histogram.render()[2:] == [
+        'test_duration_seconds_bucket{stage="a",le="0.1"} 2',
+        'test_duration_seconds_bucket{stage="a",le="1"} 3',
+        'test_duration_seconds_bucket{stage="a",le="+Inf"} 4',
+        'test_duration_seconds_sum{stage="a"} 5.65',
+        'test_duration_seconds_count{stage="a"} 4',
+    ]
+    counter = Counter("test_total", "Test counter.", ["path"])
+    counter.labels('say "hi"').inc(2)
+    assert counter.render()[2] == 'test_total{path="say \\"hi\\""} 2'
+
+
+def sample(text: str, name: str, **labels) -> float:
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{name}\{{{re.escape(label_text)}\}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_metrics_endpoint_counts_requests_and_stages():
+    """/metrics counts requests and errors and times every stage of the prediction path"""
+    print("🧪 Testing GET /metrics...")
+    client = TestClient(app)
+    before = client.get("/metrics").text
+
+    # Off-grid inputs are never cached, so every request runs the model stages.
+    for _ in range(3):
+        assert client.post("/predict", json=TEST_INPUT).status_code == 200
+    assert client.post("/predict", json={}).status_code == 422
+    assert client.get("/explanations/missing").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = response.text
+
+    def delta(name, **labels):
+        return sample(after, name, **labels) - sample(before, name, **labels)
+
+    assert delta("chimera_requests_total", path="/predict", status="200") == 3
+    assert delta("chimera_request_errors_total", path="/predict", status="422") == 1
+    assert delta("chimera_request_errors_total", path="/explanations/{explanation_id}", status="404") == 1
+    assert delta("chimera_request_duration_seconds_count", path="/predict") == 4
+    # Validation and serialization are timed for every endpoint that returns, /metrics included.
+    for stage in ("validation", "feature_matrix", "predict", "explain", "key_drivers", "serialization"):
+        assert delta("chimera_stage_duration_seconds_count", stage=stage) >= 3
+    assert "chimera_executor_pending 0" in after
+    print("✅ Metrics endpoint working")
+
+
+if __name__ == "__main__":
+    test_histogram_buckets_are_cumulative()
+    test_metrics_endpoint_counts_requests_and_stages()
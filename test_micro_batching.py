@@ -0,0 +1,108 @@
+"""
+Test script for the micro-batching scheduler in front of the model
+"""
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.batching import MicroBatcher
+from app.main import app
+from app.model import predict_and_explain, predict_and_explain_many
+
+ROWS = [
+    {"pitch_strength_score": p, "identity_model_score": 10 - p, "momentum_tracker_score": 5.0}
+    for p in (1.0, 2.5, 4.0, 5.5, 7.0, 8.5, 9.5)
+]
+
+
+def test_concurrent_requests_share_a_batch():
+    """Concurrent submissions are scored together and fanned back out in order"""
+    print("🧪 Testing MicroBatcher...")
+    batch_sizes = []
+
+    def score_batch(rows):
+        batch_sizes.append(len(rows))
+        return predict_and_explain_many(rows)
+
+    batcher = MicroBatcher(score_batch, max_wait_ms=50, max_batch_size=4)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(row) for row in ROWS))
+
+    results = asyncio.run(run())
+
+    # Seven concurrent rows with a batch limit of four make two batches.
+    assert batch_sizes == [4, 3]
+    for row, result in zip(ROWS, results):
+        assert result == predict_and_explain(row)
+
+    stats = batcher.stats()
+    assert stats["batches_total"] == 2
+    assert stats["rows_total"] == len(ROWS)
+    assert stats["batch_size_histogram"] == {"1": 0, "2": 0, "4": 2}
+    print("✅ Micro-batching working")
+
+
+def test_idle_batcher_dispatches_at_once():
+    """A lone request skips the window; requests arriving during a batch wait for the next one"""
+    print("🧪 Testing MicroBatcher dispatch when idle...")
+    batch_sizes = []
+
+    async def score_batch(rows):
+        batch_sizes.append(len(rows))
+        await asyncio.sleep(0.2)
+        return predict_and_explain_many(rows)
+
+    batcher = MicroBatcher(score_batch, max_wait_ms=300, max_batch_size=8)
+
+    async def run():
+        start = time.perf_counter()
+        first = asyncio.ensure_future(batcher.submit(ROWS[0]))
+        first.add_done_callback(lambda _: finished.append(time.perf_counter() - start))
+        await asyncio.sleep(0.05)  # the first row is being scored now
+        rest = await asyncio.gather(*(batcher.submit(row) for row in ROWS[1:4]))
+        return await first, rest
+
+    finished = []
+    first, rest = asyncio.run(run())
+
+    # The first row did not wait out the 300 ms window; the other three were
+    # collected while it was scored and went out together.
+    assert batch_sizes == [1, 3]
+    assert finished[0] < 0.3
+    assert [first, *rest] == [predict_and_explain(row) for row in ROWS[:4]]
+    print("✅ Idle batcher dispatches at once")
+
+
+def test_batch_errors_reach_every_caller():
+    """A failing batch raises the same error in every waiting request"""
+    def broken(rows):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(broken, max_wait_ms=10)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(row) for row in ROWS[:3]), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert all(isinstance(e, RuntimeError) for e in errors)
+
+
+def test_predict_endpoint_uses_batcher():
+    """The /predict endpoint still returns the usual response and reports stats"""
+    client = TestClient(app)
+    response = client.post("/predict", json=ROWS[0])
+    assert response.status_code == 200
+    assert response.json() == predict_and_explain(ROWS[0])
+
+    stats = client.get("/stats/batching").json()
+    assert "queue_depth" in stats and "batch_size_histogram" in stats
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_a_batch()
+    test_idle_batcher_dispatches_at_once()
+    test_batch_errors_reach_every_caller()
+    test_predict_endpoint_uses_batcher()
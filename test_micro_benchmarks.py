@@ -0,0 +1,53 @@
+"""
+Test script for the micro-benchmarks in benchmarks/micro_benchmarks.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import micro_benchmarks  # noqa: E402
+from app.registry import fingerprint  # noqa: E402
+
+
+def test_micro_benchmarks_write_results():
+    """A short run times every requested component at every size and writes JSON results"""
+    print("🧪 Testing micro-benchmarks...")
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "micro.json")
+        # Run in its own interpreter: the benchmark points app.model at its own model.
+        subprocess.run([sys.executable, "benchmarks/micro_benchmarks.py", "--sizes", "1,10",
+                        "--components", "feature_matrix,inplace_predict,key_drivers,predict_and_explain",
+                        "--min-time", "0", "--min-repeats", "2", "--output", output],
+                       cwd=ROOT, check=True, capture_output=True)
+
+        with open(output) as f:
+            results = json.load(f)
+    assert results["meta"]["seed"] == 42 and len(results["meta"]["model_version"]) == 12
+    cases = [(r["component"], r["batch_size"]) for r in results["results"]]
+    assert cases == [(name, size) for name in ("feature_matrix", "inplace_predict", "key_drivers",
+                                               "predict_and_explain") for size in (1, 10)]
+    for record in results["results"]:
+        assert record["repeats"] >= 2
+        assert 0 < record["min_seconds"] <= record["median_seconds"]
+        assert record["rows_per_second"] > 0
+    print("✅ Micro-benchmarks working")
+
+
+def test_model_is_reproducible():
+    """Two runs with the same seed benchmark the same model"""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"{i}.bst") for i in range(2)]
+        for path in paths:
+            micro_benchmarks.train_benchmark_model(path)
+        assert fingerprint(paths[0]) == fingerprint(paths[1])
+
+
+if __name__ == "__main__":
+    test_micro_benchmarks_write_results()
+    test_model_is_reproducible()
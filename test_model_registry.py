@@ -0,0 +1,190 @@
+"""
+Test script for the model registry and zero-downtime model reloads
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import xgboost as xgb
+from fastapi.testclient import TestClient
+
+from app import main as main_module
+from app import model as model_module
+from app.main import app
+from app.model import MODEL_PATH, feature_names, predict_and_explain, predict_and_explain_many, reload_model
+from app.registry import ModelRegistry, fingerprint, watch
+
+TEST_INPUT = {"pitch_strength_score": 8.5, "identity_model_score": 7.2, "momentum_tracker_score": 6.8}
+
+
+def train_other_model(path: str):
+    """A small booster that scores differently from the bundled one"""
+    rng = np.random.default_rng(7)
+    X = rng.uniform(0, 10, (500, 3)).astype(np.float32)
+    y = (X[:, 2] > 5).astype(int)
+    booster = xgb.train({"objective": "binary:logistic", "max_depth": 2},
+                        xgb.DMatrix(X, y, feature_names=feature_names), num_boost_round=5)
+    booster.save_model(path)
+
+
+def test_publish_and_activate():
+    """Versions are named by fingerprint, immutable, and CURRENT only moves on activate"""
+    print("🧪 Testing ModelRegistry...")
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(os.path.join(root, "registry"))
+        assert registry.current() is None and registry.versions() == []
+
+        version = registry.publish(MODEL_PATH, metadata={"note": "first"})
+        assert version == fingerprint(MODEL_PATH)
+        assert registry.current() is None
+        assert registry.publish(MODEL_PATH) == version          # idempotent
+        assert [v["version"] for v in registry.versions()] == [version]
+        assert registry.metadata(version)["note"] == "first"
+        assert os.path.isfile(registry.path(version))
+
+        registry.activate(version)
+        assert registry.current() == version
+        try:
+            registry.activate("nope")
+            assert False, "activating an unknown version should fail"
+        except KeyError:
+            pass
+        assert registry.current() == version
+    print("✅ Registry working")
+
+
+def test_watch_sees_activation():
+    """The watcher calls back when CURRENT moves to another version"""
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        first = registry.publish(MODEL_PATH, activate=True)
+        other_path = os.path.join(root, "other.bst")
+        train_other_model(other_path)
+        second = registry.publish(other_path)
+
+        seen = []
+        watch(registry, seen.append, interval=0.01)
+        time.sleep(0.05)
+        registry.activate(second)
+        deadline = time.monotonic() + 2
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert seen == [second] and first != second
+
+
+def test_hot_reload_keeps_serving():
+    """Swapping versions under load never fails a request or mixes versions"""
+    print("🧪 Testing hot reload...")
+    original = predict_and_explain(TEST_INPUT)
+    original_root = model_module.registry.root
+
+    with tempfile.TemporaryDirectory() as root:
+        model_module.registry.root = root
+        try:
+            other_path = os.path.join(root, "other.bst")
+            train_other_model(other_path)
+            first = model_module.registry.publish(MODEL_PATH)
+            second = model_module.registry.publish(other_path)
+
+            reload_model(second)
+            swapped = predict_and_explain(TEST_INPUT)
+            assert swapped["model_version"] == second
+            assert swapped["prediction_score"] != original["prediction_score"]
+            expected = {first: original["prediction_score"], second: swapped["prediction_score"]}
+
+            # Predict continuously while the model flips back and forth.
+            errors, stop = [], threading.Event()
+
+            def keep_predicting():
+                while not stop.is_set():
+                    try:
+                        for result in predict_and_explain_many([TEST_INPUT] * 20):
+                            assert result["prediction_score"] == expected[result["model_version"]]
+                    except Exception as e:
+                        errors.append(e)
+
+            worker = threading.Thread(target=keep_predicting)
+            worker.start()
+            for version in [first, second] * 3:
+                assert reload_model(version)["model_version"] == version
+            stop.set()
+            worker.join()
+            assert not errors, errors
+
+            # The admin endpoint needs the token, and switches the registry's active version.
+            client = TestClient(app)
+            main_module.ADMIN_TOKEN = "secret"
+            assert client.post("/admin/model/reload", json={"version": first}).status_code == 401
+            response = client.post("/admin/model/reload", json={"version": first},
+                                   headers={"X-Admin-Token": "secret"})
+            assert response.status_code == 200
+            assert response.json()["model_version"] == first
+            assert model_module.registry.current() == first
+            assert client.post("/admin/model/reload", json={"version": "nope"},
+                               headers={"X-Admin-Token": "secret"}).status_code == 404
+            listing = client.get("/admin/model", headers={"X-Admin-Token": "secret"}).json()
+            assert listing["model_version"] == first and len(listing["versions"]) == 2
+            assert client.post("/predict", json=TEST_INPUT).json()["model_version"] == first
+        finally:
+            main_module.ADMIN_TOKEN = None
+            model_module.registry.root = original_root
+            reload_model()
+
+    assert predict_and_explain(TEST_INPUT) == original
+    print("✅ Hot reload working")
+
+
+def test_startup_load_never_overwrites_a_reload():
+    """A reload that starts while the first load is still running wins"""
+    original_build, original_current = model_module._build, model_module._current
+
+    def slow_build(version, phases):
+        if version is None:
+            time.sleep(0.3)  # the startup load, still building when the reload arrives
+        return model_module.LoadedModel(version or "startup", None, None, None)
+
+    model_module._build, model_module._current = slow_build, None
+    try:
+        startup = threading.Thread(target=model_module.load_model)
+        startup.start()
+        time.sleep(0.05)
+        assert reload_model("newer")["model_version"] == "newer"
+        startup.join()
+        assert model_module._current.version == "newer"
+    finally:
+        model_module._build, model_module._current = original_build, original_current
+
+
+def test_every_engine_reports_the_booster_version():
+    """The same model has the same version under the xgboost, compiled and grid engines"""
+    from app.ml.build_grid import build_grid
+
+    original = (model_module.ENGINE, model_module.MODEL_PATH, model_module.COMPILED_MODEL_PATH,
+                model_module.GRID_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        booster = xgb.Booster(model_file=MODEL_PATH)
+        compiled_path, grid_path = os.path.join(tmp, "model.json"), os.path.join(tmp, "grid.npy")
+        booster.save_model(compiled_path)
+        build_grid(MODEL_PATH, grid_path, step=2.0, error_samples=100)
+        model_module.MODEL_PATH, model_module.COMPILED_MODEL_PATH, model_module.GRID_PATH = (
+            MODEL_PATH, compiled_path, grid_path)
+        try:
+            versions = set()
+            for engine in ("xgboost", "compiled", "grid"):
+                model_module.ENGINE = engine
+                versions.add(model_module.load_version().version)
+        finally:
+            (model_module.ENGINE, model_module.MODEL_PATH, model_module.COMPILED_MODEL_PATH,
+             model_module.GRID_PATH) = original
+    assert versions == {fingerprint(MODEL_PATH)}
+
+
+if __name__ == "__main__":
+    test_publish_and_activate()
+    test_watch_sees_activation()
+    test_hot_reload_keeps_serving()
+    test_startup_load_never_overwrites_a_reload()
+    test_every_engine_reports_the_booster_version()
@@ -0,0 +1,79 @@
+"""
+Test script for out-of-core training from shards in app/ml/train.py
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import xgboost as xgb
+
+from app.compiled_model import CompiledModel
+from app.ml.train import FEATURES, ShardIterator, generate_shards, peak_rss_mb, split_shards, train_from_shards
+
+
+def test_split_is_by_whole_shard():
+    """Validation shards are a seeded choice of whole shards, never all of them"""
+    shards = [{"file": f"shard-{i:05d}.npy", "rows": 10} for i in range(20)]
+    train, validation = split_shards(shards, 0.1, seed=1)
+    assert len(validation) == 2 and len(train) == 18
+    assert sorted(train + validation, key=lambda s: s["file"]) == shards
+    assert split_shards(shards, 0.1, seed=1) == (train, validation)
+    assert len(split_shards(shards[:2], 0.9)[1]) == 1
+
+
+def test_iterator_reads_every_row_once():
+    """ShardIterator hands over every row of the chosen shards, in chunks"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = generate_shards(tmp, 2_500, shard_rows=1_000, seed=5)
+        iterator = ShardIterator(tmp, manifest["shards"], chunk_rows=300)
+        batches = []
+        while iterator.next(lambda data, label, feature_names: batches.append((data, label, feature_names))):
+            pass
+        assert [len(label) for _, label, _ in batches] == [300, 300, 300, 100] * 2 + [300, 200]
+        assert batches[0][2] == FEATURES
+        expected = np.concatenate([np.load(os.path.join(tmp, s["file"])) for s in manifest["shards"]])
+        np.testing.assert_array_equal(np.concatenate([data for data, _, _ in batches]), expected[:, :-1])
+
+
+def test_train_from_shards():
+    """Out-of-core training produces a usable model with the in-memory path's accuracy"""
+    print("🧪 Testing out-of-core training...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "data")
+        generate_shards(data_dir, 60_000, shard_rows=10_000, seed=9)
+        model_path, compiled_model_path = os.path.join(tmp, "model.bst"), os.path.join(tmp, "model.json")
+        summary = train_from_shards(data_dir, validation_fraction=0.2, chunk_rows=4_000,
+                                    model_path=model_path, compiled_model_path=compiled_model_path, publish=False)
+
+        assert summary["train_rows"] == 50_000 and summary["validation_rows"] == 10_000
+        assert summary["validation_accuracy"] > 0.8 and summary["version"] is None
+        assert summary["peak_rss_mb"] > 0
+
+        # Both saved formats load and agree, with the training feature names.
+        booster = xgb.Booster()
+        booster.load_model(model_path)
+        assert booster.feature_names == FEATURES
+        X = np.random.default_rng(0).uniform(0, 10, (100, 3)).astype(np.float32)
+        np.testing.assert_allclose(booster.inplace_predict(X), CompiledModel.from_json(compiled_model_path).predict(X),
+                                   atol=1e-6)
+    print("✅ Out-of-core training working")
+
+
+def test_peak_rss_without_the_resource_module():
+    """Where `resource` does not exist (Windows), peak memory is reported as None"""
+    assert peak_rss_mb() > 0
+    original = sys.modules.get("resource")
+    sys.modules["resource"] = None  # makes `import resource` raise ImportError
+    try:
+        assert peak_rss_mb() is None
+    finally:
+        sys.modules["resource"] = original
+
+
+if __name__ == "__main__":
+    test_split_is_by_whole_shard()
+    test_iterator_reads_every_row_once()
+    test_train_from_shards()
+    test_peak_rss_without_the_resource_module()
@@ -0,0 +1,84 @@
+"""
+Test script for the quantized-input prediction cache
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app.cache import PredictionCache
+from app.main import app
+from app.model import MODEL_VERSION, predict_and_explain, predict_and_explain_many, prediction_cache
+
+
+def test_only_grid_inputs_are_cached():
+    """Inputs on the 0.1 grid get a key; anything else bypasses the cache"""
+    cache = PredictionCache(step=0.1)
+    assert cache.key("v1", [8.5, 7.2, 6.8]) == ("v1", 85, 72, 68)
+    assert cache.key("v1", [0.7000000000000001, 0, 10]) == ("v1", 7, 0, 100)
+    assert cache.key("v1", [8.55, 7.2, 6.8]) is None
+    assert cache.key("v1", [8.5, 7.2, 6.8]) != cache.key("v2", [8.5, 7.2, 6.8])
+    assert cache.key("v1", [float("nan"), 7.2, 6.8]) is None
+    assert cache.key("v1", [8.5, float("inf"), -float("inf")]) is None
+
+
+def test_lru_ttl_and_counters():
+    """The cache evicts least-recently-used entries, expires old ones and counts lookups"""
+    print("🧪 Testing PredictionCache...")
+    cache = PredictionCache(max_entries=2, ttl_seconds=0.05)
+    a, b, c = (cache.key("v", [x, 1, 1]) for x in (1, 2, 3))
+
+    cache.put(a, 0.1, None)                   # scored without an explanation
+    cache.put(b, 0.2, ["B"])
+    assert cache.get(a) is None               # drivers needed but not stored
+    assert cache.get(a, need_drivers=False) == (0.1, None)
+    assert cache.get(b) == (0.2, ["B"])
+
+    cache.put(c, 0.3, ["C"])                  # evicts a, the least recently used
+    assert cache.get(a, need_drivers=False) is None
+    time.sleep(0.06)
+    assert cache.get(b) is None               # expired
+    cache.get(None)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bypassed"]) == (2, 3, 1)
+    assert stats["entries"] == 1
+    assert (stats["evictions"], stats["expirations"]) == (1, 1)
+    print("✅ LRU, TTL and counters working")
+
+
+def test_cached_predictions_match_the_model():
+    """Repeated grid inputs are served from the cache with identical results"""
+    row = {"pitch_strength_score": 6.1, "identity_model_score": 2.3, "momentum_tracker_score": 9.9}
+    off_grid = {"pitch_strength_score": 6.15, "identity_model_score": 2.3, "momentum_tracker_score": 9.9}
+    prediction_cache.clear()
+
+    first = predict_and_explain(row)
+    hits = prediction_cache.hits
+    assert predict_and_explain(row) == first
+    assert predict_and_explain_many([row, off_grid])[0] == first
+    assert prediction_cache.hits == hits + 2
+
+    bypassed = prediction_cache.bypassed
+    predict_and_explain(off_grid)
+    assert prediction_cache.bypassed == bypassed + 1
+
+    stats = TestClient(app).get("/stats/cache").json()
+    assert stats["enabled"] and stats["model_version"] == MODEL_VERSION
+
+
+def test_non_finite_inputs_bypass_the_cache():
+    """Rows with missing values are scored by the model, as they were before the cache"""
+    row = {"pitch_strength_score": float("nan"), "identity_model_score": 2.3, "momentum_tracker_score": 9.9}
+    bypassed = prediction_cache.bypassed
+    results = predict_and_explain_many([row, {**row, "identity_model_score": float("inf")}], explain=False)
+    assert all(0 <= result["prediction_score"] <= 1 for result in results)
+    assert predict_and_explain(row, explain=False)["prediction_score"] == results[0]["prediction_score"]
+    assert prediction_cache.bypassed == bypassed + 3
+
+
+if __name__ == "__main__":
+    test_only_grid_inputs_are_cached()
+    test_lru_ttl_and_counters()
+    test_cached_predictions_match_the_model()
+    test_non_finite_inputs_bypass_the_cache()
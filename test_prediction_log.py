@@ -0,0 +1,113 @@
+"""
+Test script for the prediction and outcome log and POST /outcomes
+"""
+
+import os
+import tempfile
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main as main_module
+from app.main import app
+from app.ml.train import FEATURES, TARGET, load_feedback
+from app.prediction_log import PredictionLog, read_log
+
+TEST_INPUT = {"pitch_strength_score": 8.5, "identity_model_score": 7.2, "momentum_tracker_score": 6.8}
+OTHER_INPUT = {"pitch_strength_score": 3.0, "identity_model_score": 8.5, "momentum_tracker_score": 6.0}
+RESULT = {"prediction_score": 0.9, "model_version": "abc123"}
+
+
+def wait_for_flush(log: PredictionLog, predictions: int, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while log.stats()["predictions_logged"] < predictions:
+        assert time.monotonic() < deadline, "the writer thread did not flush"
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("file_format", ["npz", "parquet"])
+def test_prediction_log_rotates_files(file_format):
+    """Rows are buffered, written by the background thread in batches, and read back as columns"""
+    print(f"🧪 Testing PredictionLog ({file_format})...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = PredictionLog(tmp, file_format, flush_rows=3, flush_seconds=60)
+        for i in range(7):
+            log.record_predictions([f"r{i}"], [TEST_INPUT], [RESULT])
+            if i == 2:
+                # The third row fills the buffer and wakes the writer.
+                wait_for_flush(log, 3)
+        log.record_outcomes(["r0", "r1"], [1, 0])
+        log.close()
+
+        stats = log.stats()
+        assert stats["predictions_logged"] == 7 and stats["outcomes_logged"] == 2
+        assert stats["pending_predictions"] == 0 and stats["write_errors"] == 0
+        files = os.listdir(tmp)
+        assert all(name.endswith(f".{file_format}") for name in files)
+        assert sum(name.startswith("predictions-") for name in files) >= 2
+
+        predictions = read_log(tmp, "predictions")
+        assert sorted(predictions["request_id"]) == [f"r{i}" for i in range(7)]
+        assert predictions["pitch_strength_score"].iloc[0] == pytest.approx(8.5)
+        assert set(predictions["model_version"]) == {"abc123"}
+        assert list(read_log(tmp, "outcomes").sort_values("request_id")["outcome"]) == [1, 0]
+    print(f"✅ PredictionLog ({file_format}) working")
+
+
+def test_prediction_log_drops_rows_when_full():
+    with tempfile.TemporaryDirectory() as tmp:
+        log = PredictionLog(tmp, flush_rows=100, max_pending_rows=2)
+        log.record_predictions(["a", "b", "c"], [TEST_INPUT] * 3, [RESULT] * 3)
+        log.record_predictions(["d"], [TEST_INPUT], [RESULT])
+        assert log.stats()["rows_dropped"] == 3 and log.stats()["pending_predictions"] == 1
+        log.close()
+        assert read_log(tmp, "outcomes") is None
+
+
+def test_outcomes_endpoint_and_feedback():
+    """Predictions get request ids, outcomes are posted for them, and train.py joins the two"""
+    print("🧪 Testing POST /outcomes and load_feedback...")
+    client = TestClient(app)
+    original = main_module.prediction_log
+    with tempfile.TemporaryDirectory() as tmp:
+        main_module.prediction_log = PredictionLog(tmp)
+        try:
+            first = client.post("/predict", json=TEST_INPUT, headers={"X-Request-ID": "req-1"}).json()
+            second = client.post("/predict?explain=none", json=OTHER_INPUT).json()
+            batch = client.post("/predict/batch", json=[TEST_INPUT, OTHER_INPUT],
+                                headers={"X-Request-ID": "batch"}).json()
+            assert first["request_id"] == "req-1" and len(second["request_id"]) == 32
+            assert [row["request_id"] for row in batch] == ["batch-0", "batch-1"]
+
+            response = client.post("/outcomes", json=[{"request_id": "req-1", "outcome": 1},
+                                                      {"request_id": "batch-1", "outcome": 0},
+                                                      {"request_id": "unknown", "outcome": 1}])
+            assert response.status_code == 202 and response.json() == {"recorded": 3}
+            assert client.post("/outcomes", json=[{"request_id": "req-1", "outcome": 2}]).status_code == 422
+            # A corrected outcome replaces the first one.
+            client.post("/outcomes", json=[{"request_id": "batch-1", "outcome": 1}])
+
+            assert client.get("/stats/prediction-log").json()["pending_predictions"] == 4
+            main_module.prediction_log.close()
+        finally:
+            main_module.prediction_log = original
+
+        df = load_feedback(tmp).sort_values("request_id")
+        assert list(df["request_id"]) == ["batch-1", "req-1"]
+        assert list(df[TARGET]) == [1, 1]
+        assert df[FEATURES].iloc[1].tolist() == pytest.approx(list(TEST_INPUT.values()))
+        assert df["prediction_score"].iloc[1] == pytest.approx(first["prediction_score"])
+        assert set(df["model_version"]) == {first["model_version"]}
+
+    if original is None:
+        assert client.post("/outcomes", json=[{"request_id": "req-1", "outcome": 1}]).status_code == 404
+        assert "request_id" not in client.post("/predict", json=TEST_INPUT).json()
+    print("✅ POST /outcomes and load_feedback working")
+
+
+if __name__ == "__main__":
+    test_prediction_log_rotates_files("npz")
+    test_prediction_log_rotates_files("parquet")
+    test_prediction_log_drops_rows_when_full()
+    test_outcomes_endpoint_and_feedback()
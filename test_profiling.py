@@ -0,0 +1,115 @@
+"""
+Test script for on-demand profiling through /admin/profile
+"""
+
+import asyncio
+import cProfile
+import os
+import pstats
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+
+from app import main as main_module
+from app import profiling
+from app.main import app
+
+ADMIN = {"X-Admin-Token": "secret"}
+# Off the cache grid, so every request runs the model.
+ROWS = [{"pitch_strength_score": 1.05 + i / 7, "identity_model_score": 4.33, "momentum_tracker_score": 8.01}
+        for i in range(40)]
+
+
+def run_session(client, settings: dict, rows) -> dict:
+    response = client.post("/admin/profile", json=settings, headers=ADMIN)
+    assert response.status_code == 200, response.text
+    assert response.json()["active"]
+    for row in rows:
+        assert client.post("/predict", json=row).status_code == 200
+    return client.get("/admin/profile", headers=ADMIN).json()
+
+
+def test_profiling_sessions():
+    """Sampling and cProfile sessions stop on their own and write their files"""
+    print("🧪 Testing /admin/profile...")
+    original_dir = profiling.PROFILE_DIR
+    with tempfile.TemporaryDirectory() as output_dir, TestClient(app) as client:
+        profiling.PROFILE_DIR = output_dir
+        main_module.ADMIN_TOKEN = "secret"
+        try:
+            # Deterministic profiling of the next 3 requests.
+            status = run_session(client, {"mode": "cprofile", "requests": 3}, ROWS[:5])
+            assert not status["active"] and status["requests_seen"] == 3
+            prof_path, text_path = status["files"]
+            functions = {name for _, _, name in pstats.Stats(prof_path).stats}
+            assert "shap_values" in functions      # model work in the inference pool
+            assert "predict" in functions          # the endpoint, on the event loop
+            assert "cumulative" in open(text_path).read()
+
+            # Sampling for a fixed time; requests do not stop it.
+            status = run_session(client, {"mode": "sampling", "seconds": 0.5, "interval_ms": 1}, ROWS)
+            if status["active"]:
+                assert client.post("/admin/profile", json={"requests": 1}, headers=ADMIN).status_code == 409
+                time.sleep(0.8)
+                status = client.get("/admin/profile", headers=ADMIN).json()
+            assert not status["active"] and status["samples"] > 0
+            collapsed_path, text_path = status["files"]
+            lines = open(collapsed_path).read().splitlines()
+            assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+            assert "samples every 1 ms" in open(text_path).read()
+
+            # Stopping early writes whatever was collected.
+            client.post("/admin/profile", json={"seconds": 60}, headers=ADMIN)
+            status = client.delete("/admin/profile", headers=ADMIN).json()
+            assert not status["active"] and all(os.path.exists(path) for path in status["files"])
+
+            assert client.post("/admin/profile", json={"mode": "perf"}, headers=ADMIN).status_code == 422
+            assert client.post("/admin/profile", json={}).status_code == 401
+        finally:
+            main_module.ADMIN_TOKEN = None
+            profiling.PROFILE_DIR = original_dir
+    print("✅ Profiling sessions working")
+
+
+class BusyProfile(cProfile.Profile):
+    # Behaves like cProfile on Python 3.12+ while another profiler is active.
+    def enable(self, *args, **kwargs):
+        raise ValueError("Another profiling tool is already active")
+
+
+def test_cprofile_falls_back_when_another_profiler_is_active():
+    """A cprofile session switches to sampling, and pool calls run unprofiled, instead of failing"""
+    original = profiling.cProfile.Profile
+    profiling.cProfile.Profile = BusyProfile
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            async def run():
+                session = profiling.ProfilingSession("cprofile", output_dir, max_seconds=60, interval_ms=1)
+                session.start()
+                assert session.call(sum, [1, 2, 3]) == 6
+                await asyncio.sleep(0.05)
+                return session, session.stop()
+
+            session, files = asyncio.run(run())
+            assert session.mode == "sampling" and "already active" in session.status()["fallback"]
+            assert files[0].endswith("-sampling.collapsed") and all(os.path.exists(path) for path in files)
+
+            # The event loop's profile started, but a pool thread cannot start its own.
+            async def run_calls():
+                profiling.cProfile.Profile = original
+                session = profiling.ProfilingSession("cprofile", output_dir, max_seconds=60)
+                session.start()
+                profiling.cProfile.Profile = BusyProfile
+                assert session.call(sum, [1, 2, 3]) == 6
+                return session, session.stop()
+
+            session, files = asyncio.run(run_calls())
+            assert session.mode == "cprofile" and session.fallback is None and files[0].endswith(".prof")
+    finally:
+        profiling.cProfile.Profile = original
+
+
+if __name__ == "__main__":
+    test_profiling_sessions()
+    test_cprofile_falls_back_when_another_profiler_is_active()
@@ -0,0 +1,73 @@
+"""
+Test script for the pre-fork multi-worker launcher in app/serve.py
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.serve import descendants, memory_usage
+
+TEST_INPUT = {"pitch_strength_score": 8.5, "identity_model_score": 7.2, "momentum_tracker_score": 6.8}
+
+
+def test_prefork_workers_serve_and_restart():
+    """Forked workers answer requests, a killed worker is replaced, and SIGTERM stops them all"""
+    print("🧪 Testing pre-fork launcher...")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--workers", "2", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env={**os.environ, "CHIMERA_ENGINE": "compiled", "CHIMERA_ADMIN_TOKEN": "secret"}
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(url + "/ready", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            assert time.monotonic() < deadline, "server did not become ready"
+            time.sleep(0.2)
+
+        # The model was loaded once, in the parent, before the workers were forked.
+        assert httpx.get(url + "/ready").json()["engine"] == "compiled"
+        response = httpx.post(url + "/predict", json=TEST_INPUT)
+        assert response.status_code == 200 and 0 <= response.json()["prediction_score"] <= 1
+
+        # State kept in one worker cannot be relied on; those features are refused.
+        assert httpx.post(url + "/predict?explain=deferred", json=TEST_INPUT).status_code == 409
+        assert httpx.post(url + "/predict/batch?explain=deferred", json=[TEST_INPUT]).status_code == 409
+        admin = {"X-Admin-Token": "secret"}
+        assert httpx.post(url + "/admin/model/reload", json={}, headers=admin).status_code == 409
+        assert httpx.post(url + "/admin/shadow", json={"version": "x"}, headers=admin).status_code == 409
+        assert httpx.post(url + "/admin/profile", json={}, headers=admin).status_code == 409
+        assert httpx.get(url + "/admin/model", headers=admin).status_code == 200
+
+        workers = descendants(server.pid)
+        assert len(workers) == 2
+        memory = memory_usage(workers[0])
+        assert 0 < memory["pss_mb"] <= memory["rss_mb"] and memory["shared_mb"] > 0
+
+        os.kill(workers[0], signal.SIGKILL)
+        deadline = time.monotonic() + 15
+        while len(set(descendants(server.pid)) - {workers[0]}) < 2:
+            assert time.monotonic() < deadline, "worker was not restarted"
+            time.sleep(0.2)
+        assert httpx.post(url + "/predict", json=TEST_INPUT).status_code == 200
+    finally:
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=20) == 0
+    print("✅ Pre-fork launcher working")
+
+
+if __name__ == "__main__":
+    test_prefork_workers_serve_and_restart()
@@ -0,0 +1,91 @@
+"""
+Test script for shadow scoring of a candidate model
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import xgboost as xgb
+from fastapi.testclient import TestClient
+
+from app import main as main_module
+from app import model as model_module
+from app.main import app
+from app.model import feature_names, load_version, predict_and_explain_many
+from app.shadow import ShadowScorer
+
+ADMIN = {"X-Admin-Token": "secret"}
+ROWS = [{"pitch_strength_score": float(a), "identity_model_score": float(b), "momentum_tracker_score": float(c)}
+        for a, b, c in np.random.default_rng(3).uniform(0, 10, (50, 3))]
+
+
+def wait_for(scorer: ShadowScorer):
+    # The shadow pool has one thread, so this runs after everything queued before it.
+    scorer.pool.submit(lambda: None).result()
+
+
+def test_identical_candidate_agrees():
+    """Shadowing the live model against itself shows no deltas or disagreements"""
+    print("🧪 Testing ShadowScorer...")
+    scorer = ShadowScorer(load_version(), fraction=1.0)
+    assert scorer.sample()
+    scorer.submit(ROWS, predict_and_explain_many(ROWS, explain=False))
+    wait_for(scorer)
+
+    summary = scorer.summary()
+    assert summary["requests_sampled"] == 1 and summary["rows_compared"] == len(ROWS)
+    assert summary["label_disagreement_rate"] == 0
+    assert summary["max_abs_score_delta"] < 1e-6
+    assert summary["candidate_latency_ms"]["p50"] > 0
+    assert not ShadowScorer(load_version(), fraction=0).sample()
+    scorer.shutdown()
+    print("✅ Identical candidate agrees")
+
+
+def test_shadow_endpoints():
+    """A candidate started over the admin API is compared on live traffic without changing responses"""
+    print("🧪 Testing /admin/shadow...")
+    original_root = model_module.registry.root
+    with tempfile.TemporaryDirectory() as root:
+        model_module.registry.root = root
+        main_module.ADMIN_TOKEN = "secret"
+        try:
+            rng = np.random.default_rng(7)
+            X = rng.uniform(0, 10, (500, 3)).astype(np.float32)
+            booster = xgb.train({"objective": "binary:logistic", "max_depth": 2},
+                                xgb.DMatrix(X, (X[:, 2] > 5).astype(int), feature_names=feature_names), 5)
+            booster.save_model(os.path.join(root, "candidate.bst"))
+            candidate = model_module.registry.publish(os.path.join(root, "candidate.bst"))
+
+            client = TestClient(app)
+            assert client.get("/admin/shadow", headers=ADMIN).json() == {"enabled": False}
+            assert client.post("/admin/shadow", json={"version": "nope"}, headers=ADMIN).status_code == 404
+            response = client.post("/admin/shadow", json={"version": candidate, "fraction": 1.0}, headers=ADMIN)
+            assert response.status_code == 200 and response.json()["candidate_version"] == candidate
+
+            expected = predict_and_explain_many(ROWS)
+            for row, result in zip(ROWS[:10], expected[:10]):
+                assert client.post("/predict", json=row).json() == result
+            assert client.post("/predict/batch", json=ROWS).json() == expected
+            wait_for(main_module.shadow)
+
+            summary = client.get("/admin/shadow", headers=ADMIN).json()
+            assert summary["enabled"] and summary["requests_sampled"] == 11
+            assert summary["rows_compared"] == 10 + len(ROWS)
+            assert 0 < summary["label_disagreement_rate"] < 1
+            assert summary["mean_abs_score_delta"] > 0
+            assert summary["primary_versions"] == [expected[0]["model_version"]]
+
+            final = client.delete("/admin/shadow", headers=ADMIN).json()
+            assert not final["enabled"] and final["rows_compared"] == summary["rows_compared"]
+            assert main_module.shadow is None
+        finally:
+            main_module.ADMIN_TOKEN = None
+            model_module.registry.root = original_root
+    print("✅ Shadow endpoints working")
+
+
+if __name__ == "__main__":
+    test_identical_candidate_agrees()
+    test_shadow_endpoints()
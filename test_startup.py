@@ -0,0 +1,54 @@
+"""
+Test script for lazy model loading and the readiness endpoint
+"""
+
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.model import load_status
+
+
+def test_importing_the_api_does_not_load_the_model():
+    """Importing app.main is cheap: XGBoost is only imported when the model loads"""
+    print("🧪 Testing import cost...")
+    code = (
+        "import sys, app.main, app.model\n"
+        "assert 'xgboost' not in sys.modules, 'xgboost imported at startup'\n"
+        "assert not app.model.is_loaded()\n"
+        "print(app.model.load_status()['status'])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "loading"
+    print("✅ The model is not loaded at import time")
+
+
+def test_ready_reports_phases_after_startup():
+    """/ready turns 200 once the background load finishes and reports each phase"""
+    print("🧪 Testing GET /ready...")
+    with TestClient(app) as client:
+        assert client.get("/").status_code == 200
+
+        # A prediction waits for the load instead of failing.
+        response = client.post("/predict", json={
+            "pitch_strength_score": 8.5, "identity_model_score": 7.2, "momentum_tracker_score": 6.8
+        })
+        assert response.status_code == 200
+
+        response = client.get("/ready")
+        assert response.status_code == 200
+        status = response.json()
+        assert status["status"] == "ready"
+        assert status["error"] is None
+        assert status["model_version"] == load_status()["model_version"]
+        assert {"import_app", "load_model", "warmup"} <= set(status["startup_phases"])
+        assert status["startup_seconds"] >= 0
+    print("✅ Readiness endpoint working")
+
+
+if __name__ == "__main__":
+    test_importing_the_api_does_not_load_the_model()
+    test_ready_reports_phases_after_startup()
@@ -0,0 +1,101 @@
+"""
+Test script for the streaming NDJSON bulk scoring endpoint
+"""
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.model import predict_and_explain
+
+ROWS = [
+    {"pitch_strength_score": 8.5, "identity_model_score": 7.2, "momentum_tracker_score": 6.8},
+    {"pitch_strength_score": 4.5, "identity_model_score": 5.0, "momentum_tracker_score": 3.2},
+    {"pitch_strength_score": 9.0, "identity_model_score": 3.5, "momentum_tracker_score": 5.5},
+]
+
+
+def test_stream_scores_rows_and_reports_bad_lines():
+    """Valid lines are scored in order; bad lines get an error and the stream continues"""
+    print("🧪 Testing /predict/stream...")
+    body_lines = [
+        json.dumps(ROWS[0]),
+        "{not json",
+        "",
+        json.dumps({**ROWS[1], "pitch_strength_score": 12}),
+        json.dumps(ROWS[1]),
+        "[1, 2, 3]",
+        json.dumps(ROWS[2]),
+    ]
+
+    def body():
+        # Send the upload in small pieces that split lines, as a real network would.
+        data = "\n".join(body_lines).encode()
+        for i in range(0, len(data), 7):
+            yield data[i:i + 7]
+
+    original_chunk_size = main.STREAM_CHUNK_SIZE
+    main.STREAM_CHUNK_SIZE = 2
+    try:
+        response = TestClient(main.app).post("/predict/stream", content=body())
+    finally:
+        main.STREAM_CHUNK_SIZE = original_chunk_size
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    output = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [item["line"] for item in output] == [1, 2, 4, 5, 6, 7]
+    assert output[0] == {"line": 1, **predict_and_explain(ROWS[0])}
+    assert output[1]["error"].startswith("Malformed JSON")
+    assert output[2]["error"].startswith("Invalid input: pitch_strength_score")
+    assert output[3] == {"line": 5, **predict_and_explain(ROWS[1])}
+    assert "error" in output[4]
+    assert output[5] == {"line": 7, **predict_and_explain(ROWS[2])}
+    print("✅ Streaming endpoint working")
+
+
+def test_stream_without_explanations():
+    """?explain=none streams scores only"""
+    body = "\n".join(json.dumps(row) for row in ROWS) + "\n"
+    response = TestClient(main.app).post("/predict/stream?explain=none", content=body)
+    output = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["key_drivers"] for item in output] == [[], [], []]
+    assert [item["prediction_score"] for item in output] == [predict_and_explain(r)["prediction_score"] for r in ROWS]
+
+
+def test_invalid_lines_stream_before_the_upload_ends():
+    """A chunk of error lines is written out without waiting for valid rows or the end of the input"""
+    print("🧪 Testing /predict/stream with bad lines...")
+    events = []
+
+    class Upload:
+        async def stream(self):
+            for i in range(5):
+                events.append(f"sent {i}")
+                yield b"{not json\n" * 3
+
+    async def consume():
+        async for data in main._stream_predictions(Upload(), explain=False):
+            events.append(f"output {len(data.splitlines())}")
+
+    original_chunk_size = main.STREAM_CHUNK_SIZE
+    main.STREAM_CHUNK_SIZE = 4
+    try:
+        asyncio.run(consume())
+    finally:
+        main.STREAM_CHUNK_SIZE = original_chunk_size
+
+    # 15 bad lines in chunks of 4: output follows the second piece of input, not the last.
+    assert events[:3] == ["sent 0", "sent 1", "output 4"]
+    assert sum(int(e.split()[1]) for e in events if e.startswith("output")) == 15
+    assert events[-1] == "output 3"
+    print("✅ Bad lines stream as they arrive")
+
+
+if __name__ == "__main__":
+    test_stream_scores_rows_and_reports_bad_lines()
+    test_stream_without_explanations()
+    test_invalid_lines_stream_before_the_upload_ends()
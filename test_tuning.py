@@ -0,0 +1,69 @@
+"""
+Test script for the hyperparameter search in app/ml/train.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+import xgboost as xgb
+
+from app.ml.train import LEARNING_RATE_RANGE, MAX_DEPTH_RANGE, MODEL_PARAMS, sample_trials, tune_model
+
+
+def test_trials_are_seeded_and_start_from_the_defaults():
+    """The first trial is MODEL_PARAMS; the rest are reproducible draws from the search space"""
+    trials = sample_trials(10, seed=3)
+    assert trials == sample_trials(10, seed=3) and trials != sample_trials(10, seed=4)
+    assert trials[0] == {"learning_rate": MODEL_PARAMS["learning_rate"], "max_depth": MODEL_PARAMS["max_depth"]}
+    for trial in trials[1:]:
+        assert LEARNING_RATE_RANGE[0] <= trial["learning_rate"] <= LEARNING_RATE_RANGE[1]
+        assert MAX_DEPTH_RANGE[0] <= trial["max_depth"] <= MAX_DEPTH_RANGE[1]
+
+
+def test_tune_model():
+    """Trials run in a process pool with early stopping, and the best one is saved with a leaderboard"""
+    print("🧪 Testing hyperparameter search...")
+    with tempfile.TemporaryDirectory() as tmp:
+        leaderboard_path = os.path.join(tmp, "leaderboard.json")
+        model_path = os.path.join(tmp, "model.bst")
+        leaderboard = tune_model(num_rows=5_000, num_trials=3, workers=2, leaderboard_path=leaderboard_path,
+                                 model_path=model_path, compiled_model_path=os.path.join(tmp, "model.json"),
+                                 publish=False)
+
+        assert sorted(result["trial"] for result in leaderboard) == [0, 1, 2]
+        losses = [result["validation_logloss"] for result in leaderboard]
+        assert losses == sorted(losses)
+        for result in leaderboard:
+            assert 0 < result["rounds"] < 1000 and result["validation_accuracy"] > 0.7
+            assert "model" not in result
+        with open(leaderboard_path) as f:
+            assert json.load(f) == [{k: v for k, v in r.items() if k != "version"} for r in leaderboard]
+
+        # The saved model is the best trial, cut at its best round.
+        booster = xgb.Booster()
+        booster.load_model(model_path)
+        assert booster.num_boosted_rounds() == leaderboard[0]["rounds"]
+        scores = booster.inplace_predict(np.array([[9.0, 9.0, 9.0], [1.0, 1.0, 1.0]], dtype=np.float32))
+        assert scores[0] > 0.5 > scores[1]
+    print("✅ Hyperparameter search working")
+
+
+def test_workers_are_capped_at_the_trials():
+    """Asking for more workers than trials starts only one worker per trial"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            tune_model(num_rows=2_000, num_trials=1, workers=8, leaderboard_path=os.path.join(tmp, "leaderboard.json"),
+                       model_path=os.path.join(tmp, "model.bst"), compiled_model_path=os.path.join(tmp, "model.json"),
+                       publish=False)
+        assert "1 trials, 1 at a time" in output.getvalue()
+
+
+if __name__ == "__main__":
+    test_trials_are_seeded_and_start_from_the_defaults()
+    test_tune_model()
+    test_workers_are_capped_at_the_trials()